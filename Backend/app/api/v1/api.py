@@ -4,7 +4,8 @@ from app.api.v1.endpoints import (
     user,
     summary,
     translation,
-    feedback
+    feedback,
+    metrics
 )
 
 api_router = APIRouter()
@@ -13,4 +14,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(user.router, prefix="/users", tags=["Users"])
 api_router.include_router(summary.router, prefix="/summaries", tags=["Summaries"])
 api_router.include_router(translation.router, prefix="/translations", tags=["Translations"])
-api_router.include_router(feedback.router, prefix="/feedback", tags=["Feedback"]) 
\ No newline at end of file
+api_router.include_router(feedback.router, prefix="/feedback", tags=["Feedback"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"]) 
\ No newline at end of file
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Body, Response
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.core.security import create_access_token, get_password_hash, verify_password, oauth2_scheme
+from app.core.security import create_access_token, access_token_claims, oauth2_scheme
+from app.core.password_hasher import password_hasher
+from app.core.exceptions import HashingUnavailableError
 from app.core.config import settings
 from app.api.v1.schemas.auth_schemas import (
     UserCreate, UserLogin, Token,
@@ -12,48 +14,62 @@ from sqlalchemy.exc import IntegrityError
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from app.database import get_db
+from app.repositories.user_repository import UserRepository
 
 router = APIRouter()
 
-def get_db():
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
-    engine = create_engine(settings.DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db = SessionLocal()
+def get_busy_response(error: HashingUnavailableError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status_code": 503,
+            "error_code": "AUTH_BUSY",
+            "message": error.message
+        },
+        headers={"Retry-After": "1"}
+    )
+
+def _create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
+    db_user = User(
+        email=user.email,
+        full_name=user.full_name,
+        birth_date=user.birth_date,
+        identity_type=user.identity_type.upper(),  # Convert to uppercase
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
     try:
-        yield db
-    finally:
-        db.close()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(db_user)
+    return db_user
 
 @router.post("/signup", response_model=Token, responses={
     400: {"model": ErrorResponse, "description": "Registration error"},
-    422: {"model": ErrorResponse, "description": "Validation error"}
+    422: {"model": ErrorResponse, "description": "Validation error"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def signup(user: UserCreate, db: Session = Depends(get_db)):
     try:
-        db_user = User(
-            email=user.email,
-            full_name=user.full_name,
-            birth_date=user.birth_date,
-            identity_type=user.identity_type.upper(),  # Convert to uppercase
-            hashed_password=get_password_hash(user.password)
-        )
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        hashed_password = await password_hasher.hash(user.password)
+    except HashingUnavailableError as e:
+        return get_busy_response(e)
+
+    try:
+        # Handlers stay async for the hasher, so DB work goes to the threadpool
+        db_user = await run_in_threadpool(_create_user, db, user, hashed_password)
 
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={
-                "sub": db_user.email,
-                "role": "user"  # New users are regular users by default
-            },
+            data=access_token_claims(db_user, role="user"),  # New users are regular users by default
             expires_delta=access_token_expires
         )
         return {"access_token": access_token, "token_type": "bearer"}
     except IntegrityError:
-        db.rollback()
         return JSONResponse(
             status_code=400,
             content={
@@ -65,11 +81,16 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=Token, responses={
-    401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"}
+    401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def login_with_json(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == credentials.email).first()
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    user = await run_in_threadpool(UserRepository(db).get_user_by_email, credentials.email)
+    try:
+        valid = user is not None and await password_hasher.verify(credentials.password, user.hashed_password)
+    except HashingUnavailableError as e:
+        return get_busy_response(e)
+    if not valid:
         return JSONResponse(
             status_code=401,
             content={
@@ -82,20 +103,22 @@ async def login_with_json(credentials: UserLogin, db: Session = Depends(get_db))
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "role": "admin" if user.identity_type == "ADMIN" else "user"  # Set role based on identity_type
-        },
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login/token", response_model=Token, responses={
-    401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"}
+    401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def login_with_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(UserRepository(db).get_user_by_email, form_data.username)
+    try:
+        valid = user is not None and await password_hasher.verify(form_data.password, user.hashed_password)
+    except HashingUnavailableError as e:
+        return get_busy_response(e)
+    if not valid:
         return JSONResponse(
             status_code=401,
             content={
@@ -108,10 +131,7 @@ async def login_with_form(form_data: OAuth2PasswordRequestForm = Depends(), db:
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "role": "admin" if user.identity_type == "ADMIN" else "user"  # Set role based on identity_type
-        },
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
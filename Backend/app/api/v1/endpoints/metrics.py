@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.dependencies import Principal, get_current_principal
+from app.core.metrics import collect_metrics
+
+router = APIRouter()
+
+@router.get("")
+def get_metrics(current_user: Principal = Depends(get_current_principal)):
+    """
+    Get in-process performance metrics (connection pool, caches, executors).
+    Only admin can access this endpoint.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin can view metrics"
+        )
+    return collect_metrics()
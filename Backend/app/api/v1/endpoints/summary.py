@@ -1,122 +1,367 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.api.v1.endpoints.auth import get_db
-from app.api.v1.endpoints.user import get_current_user
-from app.models.user_model import User
-from app.repositories.summary_repository import SummaryRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Awaitable, Callable, List, Literal, Optional, Tuple
+from app.core.config import settings
+from app.core.dependencies import Principal, get_current_principal
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.http_cache import make_etag, conditional_response, has_validators
+from app.core.ndjson import dumps_lines, iter_lines
+from app.core.responses import trusted_json
+from app.database import SessionLocal
+from app.repositories.summary_repository import SummaryRepository, feed_page_version
+from app.repositories.async_repository import repository_dependency
 from app.api.v1.schemas.summary_schemas import (
     SummaryCreate,
     SummaryUpdate,
     SummaryPublish,
     SummaryResponse,
     CommentCreate,
-    CommentResponse
+    CommentResponse,
+    SummarySearchResult,
+    TopicResponse,
+    SummaryImportRow,
+    SummaryImportError,
+    SummaryImportResult
 )
 
 router = APIRouter()
 
-def get_summary_repository(db: Session = Depends(get_db)) -> SummaryRepository:
-    return SummaryRepository(db)
+get_summary_repository = repository_dependency("summaries", SummaryRepository)
+
+def feed_etag(feed: str, version: tuple, *params) -> str:
+    # Content edits bump updated_at, interactions bump the counters
+    return make_etag(feed, params, version)
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    # The body stays a plain list for existing clients; the next page is advertised in a header
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+async def feed_response(
+    request: Request,
+    response: Response,
+    feed: str,
+    params: tuple,
+    load_version: Callable[[], Awaitable[tuple]],
+    load_page: Callable[[], Awaitable[Tuple[list, Optional[str]]]]
+):
+    """
+    Serve a feed page with an ETag built from the page actually served. The narrow
+    version query only runs when the client sent a validator it could match.
+    """
+    if has_validators(request):
+        not_modified = conditional_response(request, response, feed_etag(feed, await load_version(), *params))
+        if not_modified:
+            return not_modified
+    summaries, next_cursor = await load_page()
+    not_modified = conditional_response(
+        request, response, feed_etag(feed, feed_page_version(summaries, next_cursor), *params)
+    )
+    if not_modified:
+        return not_modified
+    set_next_cursor(response, next_cursor)
+    return trusted_json(summaries, response)
 
 @router.post("", response_model=SummaryResponse)
 async def create_summary(
     summary: SummaryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Create a new summary with only content"""
-    return summary_repository.create_summary(summary, current_user.id)
+    return await summary_repository.create_summary(summary, current_user.id)
 
 @router.get("", response_model=List[SummaryResponse])
 async def get_summaries(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    topic: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
-    """Get all summaries that are either published or owned by the current user"""
-    return summary_repository.get_summaries(current_user.id)
+    """Get all summaries that are either published or owned by the current user, newest first; pass the X-Next-Cursor header back as `cursor` for the next page"""
+    return await feed_response(
+        request, response, "all", (limit, cursor, topic),
+        lambda: summary_repository.get_summaries_version(
+            current_user.id, limit=limit, cursor=cursor, topic=topic
+        ),
+        lambda: summary_repository.get_summaries(
+            current_user.id, limit=limit, cursor=cursor, topic=topic
+        )
+    )
 
 @router.get("/published", response_model=List[SummaryResponse])
 async def get_published_summaries(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    topic: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
-    """Get all published summaries"""
-    return summary_repository.get_summaries(current_user.id, published_only=True)
+    """Get all published summaries, newest first; pass the X-Next-Cursor header back as `cursor` for the next page"""
+    return await feed_response(
+        request, response, "published", (limit, cursor, topic),
+        lambda: summary_repository.get_summaries_version(
+            current_user.id, published_only=True, limit=limit, cursor=cursor, topic=topic
+        ),
+        lambda: summary_repository.get_summaries(
+            current_user.id, published_only=True, limit=limit, cursor=cursor, topic=topic
+        )
+    )
 
 @router.get("/private", response_model=List[SummaryResponse])
 async def get_private_summaries(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    topic: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """Get only the current user's private summaries, newest first; pass the X-Next-Cursor header back as `cursor` for the next page"""
+    return await feed_response(
+        request, response, "private", (limit, cursor, topic),
+        lambda: summary_repository.get_summaries_version(
+            current_user.id, private_only=True, limit=limit, cursor=cursor, topic=topic
+        ),
+        lambda: summary_repository.get_summaries(
+            current_user.id, private_only=True, limit=limit, cursor=cursor, topic=topic
+        )
+    )
+
+@router.get("/trending", response_model=List[SummaryResponse])
+async def get_trending_summaries(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """Published summaries ranked by recent likes, comments and bookmarks with time decay"""
+    return await feed_response(
+        request, response, "trending", (limit, cursor),
+        lambda: summary_repository.get_trending_version(current_user.id, limit=limit, cursor=cursor),
+        lambda: summary_repository.get_trending(current_user.id, limit=limit, cursor=cursor)
+    )
+
+@router.get("/search", response_model=List[SummarySearchResult])
+async def search_summaries(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    lang: Literal["indonesian", "simple"] = "indonesian",
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """Full-text search over published summaries, best match first, with highlighted snippets; pass the X-Next-Cursor header back as `cursor` for the next page"""
+    items, next_cursor = await summary_repository.search_summaries(
+        current_user.id, q, config=lang, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return trusted_json(items, response)
+
+@router.get("/topics", response_model=List[TopicResponse])
+async def get_topics(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """Topic catalogue ordered by number of published summaries"""
+    return await summary_repository.get_topics(limit)
+
+@router.get("/topics/suggest", response_model=List[TopicResponse])
+async def suggest_topics(
+    prefix: str = Query("", max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
-    """Get only the current user's private summaries"""
-    return summary_repository.get_summaries(current_user.id, private_only=True)
+    """Autocomplete published topics by prefix"""
+    return await summary_repository.suggest_topics(prefix, limit)
+
+def _export_chunks(batch_size: int):
+    # Own session: the stream outlives the request's dependencies and is consumed on the threadpool
+    db = SessionLocal()
+    try:
+        for batch in SummaryRepository(db).iter_export(batch_size):
+            yield dumps_lines(batch)
+    finally:
+        db.close()
+
+def _describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'line'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+@router.get("/export")
+async def export_summaries(
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Stream every summary as NDJSON, one object per line, in id order (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin can export summaries"
+        )
+    return StreamingResponse(
+        _export_chunks(settings.SUMMARY_EXPORT_BATCH_SIZE),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="summaries.ndjson"'}
+    )
+
+@router.post("/import", response_model=SummaryImportResult)
+async def import_summaries(
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """
+    Bulk-create summaries from a streamed NDJSON body (admin only). Each line is a
+    SummaryImportRow; the export format is accepted as is (ids and counters are ignored).
+    Lines are inserted in batches as they arrive and failures are reported per line
+    without stopping the import.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin can import summaries"
+        )
+
+    imported = failed = 0
+    errors: List[SummaryImportError] = []
+    batch = []
+
+    def report(line_no: int, error: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.SUMMARY_IMPORT_MAX_ERRORS:
+            errors.append(SummaryImportError(line=line_no, error=error))
+
+    async def flush():
+        nonlocal imported
+        rejected = await summary_repository.import_summaries(batch)
+        for line_no, error in rejected:
+            report(line_no, error)
+        imported += len(batch) - len(rejected)
+        batch.clear()
+
+    async for line_no, line in iter_lines(request.stream(), settings.SUMMARY_IMPORT_MAX_LINE_BYTES):
+        if line is None:
+            report(line_no, f"Line exceeds {settings.SUMMARY_IMPORT_MAX_LINE_BYTES} bytes")
+            continue
+        try:
+            row = SummaryImportRow.model_validate_json(line)
+        except ValidationError as e:
+            report(line_no, _describe_validation_error(e))
+            continue
+        batch.append((line_no, row.model_dump()))
+        if len(batch) >= settings.SUMMARY_IMPORT_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    return SummaryImportResult(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors)
+    )
 
 @router.get("/{summary_id}", response_model=SummaryResponse)
 async def get_summary(
     summary_id: int,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
-    """Get a specific summary"""
-    return summary_repository.get_summary(summary_id, current_user.id)
+    """Get a specific summary; honours If-None-Match using a cheap version lookup"""
+    version = await summary_repository.get_summary_version(summary_id, current_user.id)
+    etag = make_etag("summary", summary_id, current_user.id, version)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    return trusted_json(await summary_repository.get_summary(summary_id, current_user.id), response)
 
 @router.put("/{summary_id}", response_model=SummaryResponse)
 async def update_summary(
     summary_id: int,
     summary_update: SummaryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Update a summary's content and image_url (only by the creator)"""
-    return summary_repository.update_summary(summary_id, summary_update, current_user.id)
+    return await summary_repository.update_summary(summary_id, summary_update, current_user.id)
 
 @router.post("/{summary_id}/publish", response_model=SummaryResponse)
 async def publish_summary(
     summary_id: int,
     publish_data: SummaryPublish,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Publish a summary with title, subtitle, topic, and content (only by the creator)"""
-    return summary_repository.publish_summary(summary_id, publish_data, current_user.id)
+    return await summary_repository.publish_summary(summary_id, publish_data, current_user.id)
 
 @router.delete("/{summary_id}")
 async def delete_summary(
     summary_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Delete a summary (only by the creator)"""
-    summary_repository.delete_summary(summary_id, current_user.id)
+    await summary_repository.delete_summary(summary_id, current_user.id)
     return {"message": "Summary successfully deleted"}
 
+@router.get("/{summary_id}/comments", response_model=List[CommentResponse])
+async def get_comments(
+    summary_id: int,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    summary_repository: SummaryRepository = Depends(get_summary_repository)
+):
+    """Comments on a summary, oldest first; start from the detail response's comments_next_cursor"""
+    comments, next_cursor = await summary_repository.get_comments(summary_id, current_user.id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return trusted_json(comments, response)
+
 @router.post("/{summary_id}/comments", response_model=CommentResponse)
 async def create_comment(
     summary_id: int,
     comment: CommentCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Create a comment on a published summary"""
-    return summary_repository.create_comment(summary_id, comment, current_user.id)
+    return await summary_repository.create_comment(summary_id, comment, current_user.id)
 
 @router.post("/{summary_id}/like")
 async def toggle_like(
     summary_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Toggle like status for a published summary"""
-    is_liked = summary_repository.toggle_like(summary_id, current_user.id)
+    is_liked = await summary_repository.toggle_like(summary_id, current_user.id)
     return {"message": "Summary liked" if is_liked else "Summary unliked"}
 
 @router.post("/{summary_id}/bookmark")
 async def toggle_bookmark(
     summary_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     summary_repository: SummaryRepository = Depends(get_summary_repository)
 ):
     """Toggle bookmark status for a published summary"""
-    is_bookmarked = summary_repository.toggle_bookmark(summary_id, current_user.id)
+    is_bookmarked = await summary_repository.toggle_bookmark(summary_id, current_user.id)
     return {"message": "Summary bookmarked" if is_bookmarked else "Summary unbookmarked"} 
\ No newline at end of file
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Path, HTTPException, Request, Response, status
+from typing import List, Literal, Union
+from datetime import date
 from app.api.v1.schemas.translation_schemas import (
     TranslatorCreate,
     TranslatorUpdate,
@@ -9,122 +10,176 @@ from app.api.v1.schemas.translation_schemas import (
     TranslationOrder,
     PaginatedTranslatorResponse,
     PaginatedOrderResponse,
+    PaginatedCompactOrderResponse,
     TranslationUpdate,
     TranslationReviewCreate,
     TranslationReviewUpdate,
     TranslationReview,
-    PaginatedReviewResponse
+    PaginatedReviewResponse,
+    NearbyTranslator
 )
-from app.api.v1.endpoints.user import get_current_user
+from app.core.config import settings
+from app.core.page_counts import CountMode, COUNT_MODE_DESCRIPTION
+from app.core.dependencies import Principal, get_current_principal
+from app.core.http_cache import make_etag, conditional_response, has_validators
+from app.core.responses import trusted_json
 from app.services.translation_service import TranslationService
 from app.repositories.translation_repository import TranslationRepository
-from app.models.user_model import User
-from app.database import get_db
+from app.repositories.async_repository import repository_dependency
 
 router = APIRouter()
 
+# view=full pages nest translator, user and review; view=compact pages leave them out
+OrderPage = Union[PaginatedOrderResponse, PaginatedCompactOrderResponse]
+
+def translator_version(translator) -> tuple:
+    return (
+        translator.id, translator.name, translator.alamat, translator.availability,
+        translator.profile_pic, translator.user_id, translator.updated_at,
+        # Review aggregates change without touching updated_at
+        translator.review_count, translator.rating_sum
+    )
+
+get_translation_service = repository_dependency(
+    "translations",
+    lambda db: TranslationService(TranslationRepository(db))
+)
+
 @router.post("", response_model=Translation)
 async def create_translator(
     translator: TranslatorCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.create_translator(translator, current_user.id, current_user.identity_type)
+    return await translation_service.create_translator(translator, current_user.id, current_user.identity_type)
 
 @router.get("", response_model=PaginatedTranslatorResponse)
 async def get_translators(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    sort: Literal["default", "rating"] = Query("default", description="'rating' lists the best-rated translators first"),
+    count: CountMode = Query("exact", description=COUNT_MODE_DESCRIPTION),
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    if has_validators(request):
+        # Revalidation reads only the narrow version columns before loading profiles
+        version = await translation_service.get_translators_version(skip, limit, sort, count)
+        not_modified = conditional_response(request, response, make_etag("translators", sort, skip, limit, version))
+        if not_modified:
+            return not_modified
+    page, version = await translation_service.get_translators(skip, limit, sort, count)
+    not_modified = conditional_response(request, response, make_etag("translators", sort, skip, limit, version))
+    if not_modified:
+        return not_modified
+    return page
+
+@router.get("/available", response_model=List[Translation])
+async def get_available_translators(
+    day: date = Query(..., alias="date", description="Booking date, YYYY-MM-DD"),
+    slot: str = Query(..., description="Time slot in format '08.00 - 10.00'"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Translators that are available and have no booking overlapping the slot on that date"""
+    return await translation_service.get_available_translators(day, slot, skip, limit)
+
+@router.get("/nearby", response_model=List[NearbyTranslator])
+async def get_nearby_translators(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(settings.NEARBY_DEFAULT_RADIUS_KM, gt=0, le=settings.NEARBY_MAX_RADIUS_KM, description="Search radius in km"),
+    limit: int = Query(20, ge=1, le=100),
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_translators(skip, limit)
+    """Available translators within radius km of (lat, lon), nearest first"""
+    return await translation_service.get_nearby_translators(lat, lon, radius, limit)
 
 @router.get("/{translator_id}", response_model=Translation)
 async def get_translator(
     translator_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_translator(translator_id)
+    translator = await translation_service.get_translator(translator_id)
+    # No Last-Modified: updated_at does not move when reviews change the aggregates
+    not_modified = conditional_response(request, response, make_etag("translator", translator_version(translator)))
+    return not_modified or translator
 
 @router.put("/{translator_id}", response_model=Translation)
 async def update_translator(
     translator_id: int,
     translator: TranslatorUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.update_translator(translator_id, translator, current_user.id)
+    return await translation_service.update_translator(translator_id, translator, current_user.id)
 
 @router.post("/{translator_id}/orders", response_model=TranslationOrder)
 async def create_order(
     translator_id: int = Path(..., description="ID of the translator"),
     order: TranslationOrderCreate = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.create_order(order, translator_id, current_user.id, current_user.identity_type)
+    return await translation_service.create_order(order, translator_id, current_user.id, current_user.identity_type)
 
-@router.get("/orders/my-orders", response_model=PaginatedOrderResponse)
+@router.get("/orders/my-orders", response_model=OrderPage)
 async def get_my_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    view: Literal["full", "compact"] = Query("full", description="compact leaves out the nested translator, user and review"),
+    count: CountMode = Query("exact", description=COUNT_MODE_DESCRIPTION),
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_user_orders(current_user.id, skip, limit)
+    page = await translation_service.get_user_orders(current_user.id, skip, limit, compact=view == "compact", count_mode=count)
+    # The compact page was built through PaginatedCompactOrderResponse already
+    return trusted_json(page.model_dump()) if view == "compact" else page
 
-@router.get("/orders/my-translation-orders", response_model=PaginatedOrderResponse)
+@router.get("/orders/my-translation-orders", response_model=OrderPage)
 async def get_my_translation_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    view: Literal["full", "compact"] = Query("full", description="compact leaves out the nested translator, user and review"),
+    count: CountMode = Query("exact", description=COUNT_MODE_DESCRIPTION),
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_translator_orders(current_user.id, skip, limit)
+    page = await translation_service.get_translator_orders(current_user.id, skip, limit, compact=view == "compact", count_mode=count)
+    # The compact page was built through PaginatedCompactOrderResponse already
+    return trusted_json(page.model_dump()) if view == "compact" else page
 
 @router.patch("/orders/{order_id}/status", response_model=TranslationOrder)
 async def update_order_status(
     order_id: int,
     status_update: TranslationOrderUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.update_order_status(order_id, status_update, current_user.id, current_user.identity_type)
+    return await translation_service.update_order_status(order_id, status_update, current_user.id, current_user.identity_type)
 
 @router.patch("/orders/{order_id}/complete", response_model=TranslationOrder)
 async def complete_order(
     order_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.complete_order(order_id, current_user.id)
+    return await translation_service.complete_order(order_id, current_user.id)
 
 @router.put("/admin/translations/{translation_id}", response_model=Translation)
 async def admin_update_translation(
     translation_id: int,
     translation: TranslationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Update a translation. Only admin can perform this action.
@@ -134,15 +189,13 @@ async def admin_update_translation(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin can update translations"
         )
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.admin_update_translation(translation_id, translation)
+    return await translation_service.admin_update_translation(translation_id, translation)
 
 @router.delete("/admin/translations/{translation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def admin_delete_translation(
     translation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Delete a translation. Only admin can perform this action.
@@ -152,75 +205,63 @@ async def admin_delete_translation(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin can delete translations"
         )
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    translation_service.admin_delete_translation(translation_id)
+    await translation_service.admin_delete_translation(translation_id)
 
 @router.post("/orders/{order_id}/reviews", response_model=TranslationReview)
 async def create_review(
     order_id: int,
     review: TranslationReviewCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Create a review for a completed order. Only the order owner can create a review.
     """
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.create_review(order_id, review, current_user.id)
+    return await translation_service.create_review(order_id, review, current_user.id)
 
 @router.put("/orders/{order_id}/reviews", response_model=TranslationReview)
 async def update_review(
     order_id: int,
     review: TranslationReviewUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Update a review. Only the review owner can update it.
     """
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.update_review(order_id, review, current_user.id)
+    return await translation_service.update_review(order_id, review, current_user.id)
 
 @router.get("/orders/{order_id}/reviews", response_model=TranslationReview)
 async def get_review(
     order_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get a review for an order.
     """
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_review(order_id)
+    return await translation_service.get_review(order_id)
 
 @router.get("/translators/{translator_id}/reviews", response_model=PaginatedReviewResponse)
 async def get_translator_reviews(
     translator_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get all reviews for a translator.
     """
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    return translation_service.get_translator_reviews(translator_id, skip, limit)
+    return await translation_service.get_translator_reviews(translator_id, skip, limit)
 
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_review(
     review_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    translation_service: TranslationService = Depends(get_translation_service),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Delete a review. Only admin or review owner can delete.
     """
-    translation_repository = TranslationRepository(db)
-    translation_service = TranslationService(translation_repository)
-    translation_service.delete_review(review_id, current_user.id, current_user.identity_type)
+    await translation_service.delete_review(review_id, current_user.id, current_user.identity_type)
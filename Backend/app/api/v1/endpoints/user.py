@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app.core.security import oauth2_scheme
 from app.models.user_model import User
@@ -8,18 +8,26 @@ from app.api.v1.schemas.user_schemas import (
     ErrorResponse, ErrorResponseWithHeaders
 )
 from typing import Optional
-from app.api.v1.endpoints.auth import get_db
+from app.database import get_db
 from jose import jwt, JWTError, ExpiredSignatureError
 from app.core.config import settings
-from app.repositories.user_repository import UserRepository
+from app.core.http_cache import make_etag, conditional_response
+from app.core.password_hasher import password_hasher
+from app.core.exceptions import HashingUnavailableError, InvalidPasswordError
+from app.api.v1.endpoints.auth import get_busy_response
+from app.core.responses import trusted_json
+from app.repositories.token_repository import recently_consumed
+from app.repositories.user_repository import UserRepository, TOKEN_USED_DETAIL
+from app.repositories.async_repository import repository_dependency
 from app.services.user_service import UserService
 from app.usecases.user_usecases import UserUseCases
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import uuid
 from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -40,15 +48,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         raise credentials_exception
 
     user_repository = UserRepository(db)
-    user = user_repository.get_user_by_email(email)
+    user = user_repository.get_principal(email)
     if user is None:
         raise credentials_exception
     return user
 
-def get_user_usecases(db: Session = Depends(get_db)) -> UserUseCases:
-    user_repository = UserRepository(db)
-    user_service = UserService(user_repository)
-    return UserUseCases(user_service)
+get_user_usecases = repository_dependency(
+    "users",
+    lambda db: UserUseCases(UserService(UserRepository(db)))
+)
+
+get_user_repository = repository_dependency("users", UserRepository)
 
 def get_error_response(status_code: int, error_code: str, message: str, headers: dict = None) -> JSONResponse:
     content = {
@@ -65,14 +75,22 @@ def get_error_response(status_code: int, error_code: str, message: str, headers:
     404: {"model": ErrorResponse, "description": "User not found"}
 })
 async def get_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     user_usecases: UserUseCases = Depends(get_user_usecases)
 ):
     """
     Get the profile of the currently logged-in user.
     """
+    # The authenticated user (usually from the principal cache) already holds every
+    # profile field, so a matching ETag is answered without another query
+    etag = make_etag("profile", *(getattr(current_user, field) for field in UserProfile.model_fields))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     try:
-        return user_usecases.get_user_profile(current_user.id)
+        return trusted_json(await user_usecases.get_user_profile(current_user.id), response)
     except HTTPException as e:
         return get_error_response(
             e.status_code,
@@ -94,7 +112,7 @@ async def update_profile(
     Update the profile of the currently logged-in user.
     """
     try:
-        return user_usecases.update_user_profile(current_user.id, profile_update)
+        return await user_usecases.update_user_profile(current_user.id, profile_update)
     except HTTPException as e:
         return get_error_response(
             e.status_code,
@@ -104,24 +122,30 @@ async def update_profile(
 
 @router.post("/verify-password", response_model=VerifyPasswordResponse, responses={
     401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"},
-    400: {"model": ErrorResponse, "description": "Invalid password"}
+    400: {"model": ErrorResponse, "description": "Invalid password"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def verify_current_password(
     verify_request: VerifyPasswordRequest,
-    current_user: User = Depends(get_current_user),
-    user_repository: UserRepository = Depends(lambda db=Depends(get_db): UserRepository(db))
+    current_user: User = Depends(get_current_user)
 ):
     """
     Verify the current password before allowing password change.
     Returns a verification token valid for 5 minutes.
     """
     try:
-        user_repository.verify_password(current_user, verify_request.current_password)
-        
+        valid = await password_hasher.verify(verify_request.current_password, current_user.hashed_password)
+    except HashingUnavailableError as e:
+        return get_busy_response(e)
+    try:
+        if not valid:
+            raise InvalidPasswordError()
+
         verification_token = jwt.encode(
             {
                 "sub": current_user.email,
                 "type": "password_change",
+                "jti": uuid.uuid4().hex,
                 "exp": datetime.utcnow() + timedelta(minutes=5)
             },
             settings.SECRET_KEY,
@@ -139,12 +163,13 @@ async def verify_current_password(
 @router.post("/change-password", responses={
     401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"},
     400: {"model": ErrorResponse, "description": "Password change error"},
-    422: {"model": ErrorResponse, "description": "Validation error"}
+    422: {"model": ErrorResponse, "description": "Validation error"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def change_password(
     change_request: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
-    user_repository: UserRepository = Depends(lambda db=Depends(get_db): UserRepository(db))
+    user_repository: UserRepository = Depends(get_user_repository)
 ):
     """
     Change the user's password after verifying the token from the previous step.
@@ -165,11 +190,20 @@ async def change_password(
                 "Invalid verification token"
             )
             
-        user_repository.change_password(
-            current_user, 
-            change_request.new_password,
-            change_request.verification_token
-        )
+        # Tokens issued before jti was added are identified by their full value
+        token_id = payload.get("jti") or change_request.verification_token
+        token_expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+        # Replays this worker has seen are rejected without a bcrypt round. The hash is
+        # computed before touching the database, so no connection is held while it runs;
+        # the redemption then commits together with the new hash
+        if recently_consumed(token_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=TOKEN_USED_DETAIL)
+        try:
+            hashed_password = await password_hasher.hash(change_request.new_password)
+        except HashingUnavailableError as e:
+            return get_busy_response(e)
+        await user_repository.change_password(current_user.id, hashed_password, token_id, token_expires_at)
         return {"message": "Password successfully changed"}
         
     except ExpiredSignatureError:
@@ -188,7 +222,8 @@ async def change_password(
 @router.delete("/account", status_code=status.HTTP_200_OK, responses={
     401: {"model": ErrorResponseWithHeaders, "description": "Authentication failed"},
     400: {"model": ErrorResponse, "description": "Account deletion error"},
-    422: {"model": ErrorResponse, "description": "Validation error"}
+    422: {"model": ErrorResponse, "description": "Validation error"},
+    503: {"model": ErrorResponse, "description": "Authentication temporarily saturated"}
 })
 async def delete_account(
     delete_request: DeleteUserRequest,
@@ -200,7 +235,18 @@ async def delete_account(
     The confirmation text must be exactly "DELETE MY ACCOUNT".
     """
     try:
-        user_usecases.delete_user(current_user.id, delete_request.password)
+        valid = await password_hasher.verify(delete_request.password, current_user.hashed_password)
+    except HashingUnavailableError as e:
+        return get_busy_response(e)
+    if not valid:
+        return get_error_response(
+            status.HTTP_400_BAD_REQUEST,
+            "ACCOUNT_DELETION_FAILED",
+            "Invalid password",
+            {"reason": "400: Invalid password"}
+        )
+    try:
+        await user_usecases.delete_user(current_user.id)
         return {"message": "Account successfully deleted"}
     except HTTPException as e:
         return get_error_response(
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -52,6 +52,44 @@ class SummaryResponse(BaseModel):
     has_liked: bool = False
     has_bookmarked: bool = False
     comments: List[CommentResponse] = []
+    comments_next_cursor: Optional[str] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class SummarySearchResult(SummaryResponse):
+    rank: float
+    snippet: str
+
+class TopicResponse(BaseModel):
+    topic: str
+    label: str
+    count: int
+
+class SummaryImportRow(BaseModel):
+    """One NDJSON line of POST /summaries/import; the export format, minus ids and counters"""
+    user_id: int
+    content: str = Field(..., min_length=1)
+    title: Optional[str] = Field(None, max_length=200)
+    subtitle: Optional[str] = Field(None, max_length=255)
+    topic: Optional[str] = Field(None, max_length=100)
+    image_url: Optional[str] = Field(None, max_length=500)
+    is_published: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_published_fields(self):
+        if self.is_published and not (self.title and self.topic):
+            raise ValueError("Published summaries need a title and a topic")
+        return self
+
+class SummaryImportError(BaseModel):
+    line: int
+    error: str
+
+class SummaryImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[SummaryImportError]
+    errors_truncated: bool = False
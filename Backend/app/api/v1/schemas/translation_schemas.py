@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl, conint
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
 from app.api.v1.schemas.user_schemas import UserProfile
 
@@ -40,10 +40,19 @@ class TranslatorUpdate(TranslatorBase):
 class Translation(TranslatorBase):
     id: int
     user_id: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    review_count: int = 0
+    rating_sum: int = 0
+    rating_average: Optional[float] = None
+    rating_histogram: Dict[int, int] = Field(default_factory=dict)
 
     class Config:
         from_attributes = True
 
+class NearbyTranslator(Translation):
+    distance_km: float
+
 class TranslationOrderBase(BaseModel):
     tanggal: date
     time_slot: str = Field(..., description="Time slot in format '08.00 - 09.00'")
@@ -94,6 +103,15 @@ class TranslationOrder(TranslationOrderBase):
     class Config:
         from_attributes = True
 
+class TranslationOrderCompact(TranslationOrderBase):
+    """Order without the nested translator, user and review"""
+    id: int
+    status: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    user_id: int
+    translator_id: int
+
 class PaginatedTranslatorResponse(BaseModel):
     items: List[Translation]
     total: int
@@ -102,6 +120,10 @@ class PaginatedOrderResponse(BaseModel):
     items: List[TranslationOrder]
     total: int
 
+class PaginatedCompactOrderResponse(BaseModel):
+    items: List[TranslationOrderCompact]
+    total: int
+
 class PaginatedReviewResponse(BaseModel):
     items: List[TranslationReview]
     total: int
@@ -0,0 +1,30 @@
+"""
+Geocode translators whose alamat was never geocoded (translations.geocoded_at IS NULL).
+
+TranslationRepository geocodes alamat whenever it is written, so this only backfills rows
+created before geocoding existed or written by other tools. Addresses the gazetteer does
+not match are marked too and not retried. Run once after deploying, or after bulk loads:
+
+    python -m app.commands.geocode_translators [--batch-size 500]
+"""
+import argparse
+import logging
+from app.database import SessionLocal
+from app.repositories.translation_repository import TranslationRepository
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill translator coordinates from their alamat")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        located = TranslationRepository(db).geocode_pending(batch_size=args.batch_size)
+        logger.info(f"Geocoded {located} translators")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
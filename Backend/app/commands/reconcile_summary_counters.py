@@ -0,0 +1,30 @@
+"""
+Recompute summaries.like_count / comment_count / bookmark_count from the child tables.
+
+Counters are maintained transactionally by SummaryRepository, but rows removed outside
+it (e.g. likes cascaded away when a user is deleted) leave them high. Run periodically
+or after bulk data changes:
+
+    python -m app.commands.reconcile_summary_counters [--batch-size 1000]
+"""
+import argparse
+import logging
+from app.database import SessionLocal
+from app.repositories.summary_repository import SummaryRepository
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile denormalized summary counters")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixed = SummaryRepository(db).reconcile_counters(batch_size=args.batch_size)
+        logger.info(f"Reconciled counters on {fixed} summaries")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
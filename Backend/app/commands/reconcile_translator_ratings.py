@@ -0,0 +1,30 @@
+"""
+Recompute translations.review_count / rating_sum / rating_count_1..5 from the reviews.
+
+Aggregates are maintained transactionally by TranslationRepository, but reviews removed
+outside it (e.g. cascaded away when a user or order is deleted) leave them stale. Run
+periodically or after bulk data changes:
+
+    python -m app.commands.reconcile_translator_ratings [--batch-size 1000]
+"""
+import argparse
+import logging
+from app.database import SessionLocal
+from app.repositories.translation_repository import TranslationRepository
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile denormalized translator rating aggregates")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixed = TranslationRepository(db).reconcile_rating_aggregates(batch_size=args.batch_size)
+        logger.info(f"Reconciled rating aggregates on {fixed} translators")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from typing import Dict, Optional, Protocol
+from app.core.config import settings
+from app.core.feed_cache import feed_cache, INVALIDATION_CHANNEL as FEED_CHANNEL
+from app.core.principal_cache import principal_cache, INVALIDATION_CHANNEL as PRINCIPAL_CHANNEL
+import logging
+import select
+import threading
+
+logger = logging.getLogger(__name__)
+
+class RemoteInvalidated(Protocol):
+    def apply_remote(self, payload: str): ...
+    def clear(self): ...
+
+class InvalidationListener(threading.Thread):
+    """Background LISTEN loop that applies cache invalidations published by other workers"""
+
+    def __init__(self, caches: Dict[str, RemoteInvalidated], dsn: str):
+        super().__init__(name="cache-invalidation-listener", daemon=True)
+        self.caches = caches  # channel -> cache
+        self.dsn = dsn
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        import psycopg2
+
+        backoff = 1
+        while not self._stopped.is_set():
+            try:
+                connection = psycopg2.connect(self.dsn, sslmode="require")
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    for channel in self.caches:
+                        cursor.execute(f"LISTEN {channel}")
+                # Entries cached while we were disconnected may have missed an invalidation
+                for cache in self.caches.values():
+                    cache.clear()
+                backoff = 1
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], 5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self.caches[notify.channel].apply_remote(notify.payload)
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected: {str(e)}")
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+_listener: Optional[InvalidationListener] = None
+
+def start_invalidation_listener(dsn: str):
+    global _listener
+    if _listener is not None:
+        return
+    caches: Dict[str, RemoteInvalidated] = {}
+    if settings.PRINCIPAL_CACHE_NOTIFY:
+        caches[PRINCIPAL_CHANNEL] = principal_cache
+    if settings.FEED_CACHE_NOTIFY:
+        caches[FEED_CHANNEL] = feed_cache
+    if not caches:
+        return
+    _listener = InvalidationListener(caches, dsn)
+    _listener.start()
+
+def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -18,12 +18,108 @@ class Settings(BaseSettings):
     host: str
     port: str
     dbname: str
+
+    # Connection pool settings
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # What to do when a sync query runs on the event loop thread ("off", "warn" or "raise")
+    DB_LOOP_GUARD: str = "warn"
+
+    # SQL instrumentation (replaces echo=True); DB_ECHO logs every statement and is for local debugging only
+    DB_ECHO: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_LOG_SAMPLE_RATE: float = 1.0
+    SLOW_QUERY_MAX_FINGERPRINTS: int = 500
+    REQUEST_QUERY_COUNT_WARN: int = 50
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Async (asyncpg) engine; ASYNC_DB_ROUTERS is a comma-separated list of routers
+    # ("summaries", "translations", "feedback", "users") that should use it instead of
+    # the sync engine. Repositories run through AsyncSession.run_sync, see async_repository
+    ASYNC_DB_ROUTERS: str = ""
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 5
+    ASYNC_DB_STATEMENT_CACHE_SIZE: int = 100
     
     # Auth settings
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_NOTIFY: bool = True
+
+    # Password hashing executor ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Single-use verification token registry
+    CONSUMED_TOKEN_RECENT_SIZE: int = 10000
+    CONSUMED_TOKEN_PURGE_BATCH: int = 1000
+    CONSUMED_TOKEN_PURGE_INTERVAL_SECONDS: int = 600
+
+    # Comments embedded in a summary detail response; the rest are paged via /comments
+    SUMMARY_DETAIL_COMMENT_LIMIT: int = 10
+
+    # NDJSON bulk export/import of summaries (admin only)
+    SUMMARY_EXPORT_BATCH_SIZE: int = 1000
+    SUMMARY_IMPORT_BATCH_SIZE: int = 1000
+    SUMMARY_IMPORT_MAX_LINE_BYTES: int = 1048576
+    SUMMARY_IMPORT_MAX_ERRORS: int = 1000
+
+    # Topic autocomplete trie; reloaded from summary_topics at this interval
+    TOPIC_TRIE_REFRESH_SECONDS: int = 300
+
+    # Shared published-feed page cache; per-user flags are overlaid per request.
+    # Invalidations reach other workers via pg_notify; the TTL bounds staleness
+    # when FEED_CACHE_NOTIFY is off or a notification is missed.
+    FEED_CACHE_ENABLED: bool = True
+    FEED_CACHE_TTL_SECONDS: int = 30
+    FEED_CACHE_MAX_PAGES: int = 1000
+    FEED_CACHE_NOTIFY: bool = True
+
+    # Write-behind like/bookmark toggles: acknowledged from an in-process buffer and
+    # flushed in batches; toggles write through when the buffer is full
+    TOGGLE_WRITE_BEHIND_ENABLED: bool = False
+    TOGGLE_FLUSH_INTERVAL_MS: int = 250
+    TOGGLE_BUFFER_MAX_PENDING: int = 50000
+
+    # Translator booking slots (local time): on the hour, within the service day
+    SLOT_DAY_START_HOUR: int = 8
+    SLOT_DAY_END_HOUR: int = 19
+    SLOT_MAX_HOURS: int = 2
+
+    # Nearby-translator search: grid index over gazetteer coordinates, reloaded
+    # from the database at this interval
+    GEO_INDEX_CELL_DEGREES: float = 0.1
+    GEO_INDEX_REFRESH_SECONDS: int = 300
+    NEARBY_DEFAULT_RADIUS_KM: float = 25.0
+    NEARBY_MAX_RADIUS_KM: float = 200.0
+
+    # Paginated totals (?count=cached|estimated, app.core.page_counts); estimates below
+    # COUNT_ESTIMATE_EXACT_BELOW rows are replaced by an exact count
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_CACHE_MAX_ENTRIES: int = 10000
+    COUNT_ESTIMATE_EXACT_BELOW: int = 10000
+
+    # Background jobs (app.core.scheduler)
+    SCHEDULER_ENABLED: bool = True
+
+    # Trending ranking job: time-decayed interaction score with the given half-life
+    TRENDING_REFRESH_SECONDS: int = 300
+    TRENDING_WINDOW_HOURS: int = 72
+    TRENDING_HALF_LIFE_HOURS: float = 12.0
+    TRENDING_LIKE_WEIGHT: float = 1.0
+    TRENDING_COMMENT_WEIGHT: float = 2.0
+    TRENDING_BOOKMARK_WEIGHT: float = 1.5
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.dbname}"
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, status
+from jose import jwt, JWTError, ExpiredSignatureError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.security import oauth2_scheme, ACCESS_TOKEN_VERSION
+from app.database import get_db
+from app.repositories.user_repository import UserRepository
+
+@dataclass(frozen=True)
+class Principal:
+    """Caller identity taken from verified token claims, without a users table lookup"""
+    id: int
+    email: str
+    identity_type: str
+    role: str
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """
+    Authenticate from claims only. Use this for endpoints that just need the caller's
+    id and identity type; endpoints that need fresh user data should depend on
+    get_current_user instead. Tokens issued before uid/idt claims existed fall back
+    to a (cached) users lookup.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except JWTError:
+        raise credentials_exception
+
+    email = payload.get("sub")
+    if email is None:
+        raise credentials_exception
+    role = payload.get("role", "user")
+
+    if payload.get("ver", 1) >= ACCESS_TOKEN_VERSION and payload.get("uid") is not None and payload.get("idt"):
+        return Principal(id=payload["uid"], email=email, identity_type=payload["idt"], role=role)
+
+    # Legacy token without identity claims
+    user = UserRepository(db).get_principal(email)
+    if user is None:
+        raise credentials_exception
+    return Principal(
+        id=user.id,
+        email=user.email,
+        identity_type=getattr(user.identity_type, "value", user.identity_type),
+        role=role
+    )
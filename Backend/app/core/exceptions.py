@@ -3,3 +3,16 @@ class InvalidPasswordError(Exception):
     def __init__(self, message="Invalid password provided"):
         self.message = message
         super().__init__(self.message)
+
+class HashingUnavailableError(Exception):
+    """Raised when the password hashing executor is saturated"""
+    def __init__(self, message="Too many concurrent authentication requests, please retry shortly"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class EventLoopBlockedError(Exception):
+    """Raised when a blocking database call runs on the event loop thread"""
+    def __init__(self, message="Blocking database call made on the event loop thread"):
+        self.message = message
+        super().__init__(self.message)
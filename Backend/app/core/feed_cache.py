@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import register_collector
+import json
+import threading
+import time
+
+INVALIDATION_CHANNEL = "feed_cache_invalidate"
+# pg_notify payloads must stay under 8000 bytes; bigger batches clear the feed instead
+MAX_NOTIFY_PAYLOAD = 7900
+CLEAR_PAYLOAD = "*"
+
+PageKey = Tuple[Optional[str], Optional[str], int]  # (topic_key, cursor, limit)
+Position = Tuple[datetime, int]  # (created_at, id) in the feed's DESC keyset order
+SummaryPosition = Tuple[datetime, int, Optional[str]]  # (created_at, id, topic_key)
+
+class _Page:
+    __slots__ = ("expires_at", "items", "next_cursor", "topic_key", "upper", "lower")
+
+    def __init__(self, expires_at: float, items: List[Dict[str, Any]], next_cursor: Optional[str],
+                 topic_key: Optional[str], upper: Optional[Position], lower: Optional[Position]):
+        self.expires_at = expires_at
+        self.items = items
+        self.next_cursor = next_cursor
+        self.topic_key = topic_key
+        self.upper = upper  # exclusive; None for the first page
+        self.lower = lower  # inclusive; None for the last page
+
+    def covers(self, position: Position) -> bool:
+        return (self.upper is None or position < self.upper) and (self.lower is None or position >= self.lower)
+
+class FeedCache:
+    """Shared cache of published-feed pages, without per-user flags.
+
+    Pages are keyset ranges, so a change to one summary only affects the cached
+    page(s) whose (created_at, id) range contains it; invalidate_summary() drops
+    exactly those. publish_invalidation() broadcasts the same drop to other workers.
+    """
+
+    def __init__(self, ttl_seconds: int, max_pages: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[PageKey, _Page]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self.remote_invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: PageKey) -> Tuple[Optional[_Page], int]:
+        """Return (page or None, token); pass the token back to put()"""
+        now = time.monotonic()
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None and page.expires_at > now:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return page, self._invalidations
+            if page is not None:
+                del self._pages[key]
+            self.misses += 1
+            return None, self._invalidations
+
+    def put(self, key: PageKey, items: List[Dict[str, Any]], next_cursor: Optional[str],
+            upper: Optional[Position], lower: Optional[Position], token: int):
+        """Store a page unless an invalidation happened while it was being loaded"""
+        with self._lock:
+            if token != self._invalidations:
+                return
+            self._pages[key] = _Page(time.monotonic() + self.ttl_seconds, items, next_cursor, key[0], upper, lower)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def invalidate_summary(self, created_at: datetime, summary_id: int, topic_key: Optional[str]):
+        """Drop pages of the unfiltered feed and the summary's topic feed that contain its position"""
+        position = (created_at, summary_id)
+        with self._lock:
+            self._invalidations += 1
+            stale = [
+                key for key, page in self._pages.items()
+                if page.topic_key in (None, topic_key) and page.covers(position)
+            ]
+            for key in stale:
+                del self._pages[key]
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._pages.clear()
+
+    def publish_invalidation(self, db: Session, positions: Optional[Iterable[SummaryPosition]] = None):
+        """
+        Queue a drop of the pages containing positions (all pages when None) for other
+        workers; delivered when the transaction commits
+        """
+        if positions is not None:
+            positions = list(positions)
+        if not settings.FEED_CACHE_NOTIFY or positions == []:
+            return
+        payload = CLEAR_PAYLOAD
+        if positions is not None:
+            payload = json.dumps([
+                [created_at.isoformat(), summary_id, topic_key]
+                for created_at, summary_id, topic_key in positions
+            ])
+            if len(payload) > MAX_NOTIFY_PAYLOAD:
+                payload = CLEAR_PAYLOAD
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": INVALIDATION_CHANNEL, "payload": payload}
+        )
+
+    def apply_remote(self, payload: str):
+        """Apply an invalidation published by another worker"""
+        if payload == CLEAR_PAYLOAD:
+            self.clear()
+        else:
+            for created_at, summary_id, topic_key in json.loads(payload):
+                self.invalidate_summary(datetime.fromisoformat(created_at), summary_id, topic_key)
+        with self._lock:
+            self.remote_invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "pages": len(self._pages),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "remote_invalidations": self.remote_invalidations,
+            }
+
+feed_cache = FeedCache(
+    ttl_seconds=settings.FEED_CACHE_TTL_SECONDS,
+    max_pages=settings.FEED_CACHE_MAX_PAGES
+)
+
+register_collector("feed_cache", feed_cache.snapshot)
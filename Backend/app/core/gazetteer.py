@@ -0,0 +1,204 @@
+from typing import Dict, Optional, Tuple
+import re
+
+# Offline gazetteer of Indonesian provinces and major cities/regencies: (name, kind, lat, lon).
+# Where a province shares its name with its capital, the city's coordinates are used.
+REGIONS = (
+    # Provinces
+    ("aceh", "province", 4.695, 96.749),
+    ("sumatera utara", "province", 2.115, 99.545),
+    ("sumatera barat", "province", -0.740, 100.800),
+    ("riau", "province", 0.293, 101.707),
+    ("kepulauan riau", "province", 3.946, 108.142),
+    ("sumatera selatan", "province", -3.319, 103.914),
+    ("bangka belitung", "province", -2.741, 106.441),
+    ("lampung", "province", -4.558, 105.406),
+    ("dki jakarta", "province", -6.208, 106.846),
+    ("jawa barat", "province", -7.090, 107.668),
+    ("banten", "province", -6.406, 106.064),
+    ("jawa tengah", "province", -7.150, 110.140),
+    ("jawa timur", "province", -7.536, 112.238),
+    ("bali", "province", -8.409, 115.189),
+    ("nusa tenggara barat", "province", -8.653, 117.362),
+    ("nusa tenggara timur", "province", -8.657, 121.079),
+    ("kalimantan barat", "province", -0.279, 111.476),
+    ("kalimantan tengah", "province", -1.681, 113.382),
+    ("kalimantan selatan", "province", -3.093, 115.284),
+    ("kalimantan timur", "province", 0.539, 116.419),
+    ("kalimantan utara", "province", 3.073, 116.041),
+    ("sulawesi utara", "province", 0.624, 123.975),
+    ("sulawesi tengah", "province", -1.430, 121.446),
+    ("sulawesi barat", "province", -2.844, 119.232),
+    ("sulawesi selatan", "province", -3.669, 119.974),
+    ("sulawesi tenggara", "province", -4.145, 122.175),
+    ("maluku", "province", -3.238, 130.145),
+    ("maluku utara", "province", 1.571, 127.809),
+    ("papua", "province", -4.270, 138.080),
+    ("papua barat", "province", -1.336, 133.174),
+    # Cities and regencies
+    ("jakarta pusat", "city", -6.1865, 106.8341),
+    ("jakarta utara", "city", -6.1384, 106.8650),
+    ("jakarta barat", "city", -6.1674, 106.7637),
+    ("jakarta selatan", "city", -6.2615, 106.8106),
+    ("jakarta timur", "city", -6.2250, 106.9004),
+    ("bogor", "city", -6.5971, 106.8060),
+    ("depok", "city", -6.4025, 106.7942),
+    ("tangerang", "city", -6.1781, 106.6300),
+    ("tangerang selatan", "city", -6.2886, 106.7179),
+    ("bekasi", "city", -6.2383, 106.9756),
+    ("bandung", "city", -6.9175, 107.6191),
+    ("cimahi", "city", -6.8722, 107.5425),
+    ("cirebon", "city", -6.7320, 108.5523),
+    ("sukabumi", "city", -6.9277, 106.9300),
+    ("tasikmalaya", "city", -7.3274, 108.2207),
+    ("karawang", "city", -6.3227, 107.3376),
+    ("serang", "city", -6.1200, 106.1503),
+    ("cilegon", "city", -6.0025, 106.0111),
+    ("semarang", "city", -6.9667, 110.4167),
+    ("surakarta", "city", -7.5755, 110.8243),
+    ("magelang", "city", -7.4797, 110.2177),
+    ("pekalongan", "city", -6.8886, 109.6753),
+    ("tegal", "city", -6.8694, 109.1402),
+    ("purwokerto", "city", -7.4243, 109.2396),
+    ("salatiga", "city", -7.3305, 110.5084),
+    ("kudus", "city", -6.8048, 110.8405),
+    ("yogyakarta", "city", -7.7956, 110.3695),
+    ("sleman", "city", -7.7161, 110.3554),
+    ("bantul", "city", -7.8881, 110.3289),
+    ("surabaya", "city", -7.2575, 112.7521),
+    ("malang", "city", -7.9666, 112.6326),
+    ("sidoarjo", "city", -7.4478, 112.7183),
+    ("gresik", "city", -7.1550, 112.6556),
+    ("kediri", "city", -7.8480, 112.0178),
+    ("madiun", "city", -7.6298, 111.5239),
+    ("jember", "city", -8.1845, 113.6681),
+    ("banyuwangi", "city", -8.2192, 114.3691),
+    ("probolinggo", "city", -7.7543, 113.2159),
+    ("pasuruan", "city", -7.6453, 112.9075),
+    ("mojokerto", "city", -7.4705, 112.4401),
+    ("blitar", "city", -8.0955, 112.1609),
+    ("denpasar", "city", -8.6705, 115.2126),
+    ("badung", "city", -8.5819, 115.1771),
+    ("gianyar", "city", -8.5425, 115.3250),
+    ("mataram", "city", -8.5833, 116.1167),
+    ("bima", "city", -8.4606, 118.7270),
+    ("kupang", "city", -10.1772, 123.6070),
+    ("labuan bajo", "city", -8.4964, 119.8877),
+    ("ende", "city", -8.8432, 121.6623),
+    ("maumere", "city", -8.6199, 122.2111),
+    ("banda aceh", "city", 5.5483, 95.3238),
+    ("lhokseumawe", "city", 5.1801, 97.1507),
+    ("medan", "city", 3.5952, 98.6722),
+    ("binjai", "city", 3.6001, 98.4854),
+    ("pematangsiantar", "city", 2.9595, 99.0687),
+    ("padang", "city", -0.9471, 100.4172),
+    ("bukittinggi", "city", -0.3039, 100.3835),
+    ("pekanbaru", "city", 0.5071, 101.4478),
+    ("dumai", "city", 1.6667, 101.4500),
+    ("batam", "city", 1.0456, 104.0305),
+    ("tanjung pinang", "city", 0.9186, 104.4665),
+    ("jambi", "city", -1.6101, 103.6131),
+    ("palembang", "city", -2.9761, 104.7754),
+    ("pangkal pinang", "city", -2.1291, 106.1090),
+    ("bengkulu", "city", -3.8004, 102.2655),
+    ("bandar lampung", "city", -5.3971, 105.2668),
+    ("pontianak", "city", -0.0263, 109.3425),
+    ("singkawang", "city", 0.9060, 108.9847),
+    ("palangka raya", "city", -2.2161, 113.9135),
+    ("banjarmasin", "city", -3.3186, 114.5944),
+    ("banjarbaru", "city", -3.4572, 114.8103),
+    ("samarinda", "city", -0.5022, 117.1536),
+    ("balikpapan", "city", -1.2379, 116.8529),
+    ("bontang", "city", 0.1333, 117.5000),
+    ("tarakan", "city", 3.3000, 117.6333),
+    ("manado", "city", 1.4748, 124.8421),
+    ("bitung", "city", 1.4404, 125.1217),
+    ("gorontalo", "city", 0.5435, 123.0568),
+    ("palu", "city", -0.8917, 119.8707),
+    ("mamuju", "city", -2.6748, 118.8885),
+    ("makassar", "city", -5.1477, 119.4327),
+    ("parepare", "city", -4.0135, 119.6255),
+    ("kendari", "city", -3.9985, 122.5130),
+    ("baubau", "city", -5.4720, 122.6163),
+    ("ambon", "city", -3.6954, 128.1814),
+    ("ternate", "city", 0.7893, 127.3667),
+    ("jayapura", "city", -2.5337, 140.7181),
+    ("merauke", "city", -8.4932, 140.4018),
+    ("timika", "city", -4.5467, 136.8883),
+    ("manokwari", "city", -0.8615, 134.0620),
+    ("sorong", "city", -0.8762, 131.2558),
+)
+
+# Common short forms and spellings, mapped to a REGIONS name
+ALIASES = {
+    "jakarta": "dki jakarta",
+    "jakpus": "jakarta pusat",
+    "jakut": "jakarta utara",
+    "jakbar": "jakarta barat",
+    "jaksel": "jakarta selatan",
+    "jaktim": "jakarta timur",
+    "tangsel": "tangerang selatan",
+    "solo": "surakarta",
+    "jogja": "yogyakarta",
+    "jogjakarta": "yogyakarta",
+    "yogya": "yogyakarta",
+    "diy": "yogyakarta",
+    "ujung pandang": "makassar",
+    "palangkaraya": "palangka raya",
+    "pangkalpinang": "pangkal pinang",
+    "tanjungpinang": "tanjung pinang",
+    "sumut": "sumatera utara",
+    "sumbar": "sumatera barat",
+    "sumsel": "sumatera selatan",
+    "kepri": "kepulauan riau",
+    "babel": "bangka belitung",
+    "jabar": "jawa barat",
+    "jateng": "jawa tengah",
+    "jatim": "jawa timur",
+    "ntb": "nusa tenggara barat",
+    "ntt": "nusa tenggara timur",
+    "kalbar": "kalimantan barat",
+    "kalteng": "kalimantan tengah",
+    "kalsel": "kalimantan selatan",
+    "kaltim": "kalimantan timur",
+    "kaltara": "kalimantan utara",
+    "sulut": "sulawesi utara",
+    "sulteng": "sulawesi tengah",
+    "sulbar": "sulawesi barat",
+    "sulsel": "sulawesi selatan",
+    "sultra": "sulawesi tenggara",
+}
+
+_KIND_RANK = {"province": 0, "city": 1}
+_WORD = re.compile(r"[a-z0-9]+")
+
+def _build_lookup() -> Dict[str, Tuple[int, float, float]]:
+    lookup = {name: (_KIND_RANK[kind], lat, lon) for name, kind, lat, lon in REGIONS}
+    for alias, name in ALIASES.items():
+        lookup[alias] = lookup[name]
+    return lookup
+
+_LOOKUP = _build_lookup()
+_MAX_WORDS = max(len(name.split()) for name in _LOOKUP)
+
+def geocode(address: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    (lat, lon) of the most specific region named in a free-text address, or None.
+    Cities beat provinces and longer names beat shorter ones ("tangerang selatan"
+    over "tangerang"); among equals the last mention wins, since Indonesian
+    addresses end with the city and province while streets are often named
+    after other cities ("Jl. Bandung No. 5, Surabaya").
+    """
+    if not address:
+        return None
+    words = _WORD.findall(address.lower())
+    best = None
+    for start in range(len(words)):
+        for size in range(1, min(_MAX_WORDS, len(words) - start) + 1):
+            region = _LOOKUP.get(" ".join(words[start:start + size]))
+            if region is None:
+                continue
+            rank = (region[0], size, start)
+            if best is None or rank > best[0]:
+                best = (rank, region[1], region[2])
+    return None if best is None else (best[1], best[2])
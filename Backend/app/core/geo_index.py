@@ -0,0 +1,152 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import register_collector
+import heapq
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class GeoIndex:
+    """In-memory grid of points bucketed into cell_degrees x cell_degrees cells.
+
+    A radius query visits only the cells overlapping the circle's bounding box
+    (or every occupied cell, when that is fewer). Updated incrementally as this
+    worker creates, edits and deletes translators, and reloaded from the database
+    every refresh_seconds so changes made by other workers converge. Changes made
+    while a reload runs are journaled and replayed over the loaded rows, since the
+    load may have read them before they committed.
+    """
+
+    def __init__(self, cell_degrees: float, refresh_seconds: int):
+        self.cell_degrees = cell_degrees
+        self.refresh_seconds = refresh_seconds
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        # Serializes reloads; held outside _lock while the database is read
+        self._reload_lock = threading.Lock()
+        self._journal: Optional[Dict[int, Optional[Tuple[float, float]]]] = None
+        self._loaded_at: Optional[float] = None
+        self.queries = 0
+        self.cells_visited = 0
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _discard(self, cells: dict, points: dict, point_id: int):
+        old = points.pop(point_id, None)
+        if old is None:
+            return
+        cell = self._cell(*old)
+        bucket = cells[cell]
+        del bucket[point_id]
+        if not bucket:
+            del cells[cell]
+
+    def _place(self, cells: dict, points: dict, point_id: int, point: Optional[Tuple[float, float]]):
+        self._discard(cells, points, point_id)
+        if point is not None:
+            points[point_id] = point
+            cells.setdefault(self._cell(*point), {})[point_id] = point
+
+    def _apply(self, point_id: int, point: Optional[Tuple[float, float]]):
+        with self._lock:
+            self._place(self._cells, self._points, point_id, point)
+            if self._journal is not None:
+                self._journal[point_id] = point
+
+    def upsert(self, point_id: int, lat: float, lon: float):
+        self._apply(point_id, (lat, lon))
+
+    def remove(self, point_id: int):
+        self._apply(point_id, None)
+
+    def _fresh(self) -> bool:
+        with self._lock:
+            return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds
+
+    def ensure_loaded(self, load: Callable[[], Iterable[Tuple[int, float, float]]]):
+        """
+        (Re)build from (id, lat, lon) rows when empty or older than the refresh interval.
+        Only the first load makes callers wait; later ones keep serving the current grid.
+        """
+        if self._fresh():
+            return
+        if not self._reload_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._fresh():
+                return
+            with self._lock:
+                self._journal = {}
+            try:
+                cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+                points: Dict[int, Tuple[float, float]] = {}
+                for point_id, lat, lon in load():
+                    self._place(cells, points, point_id, (lat, lon))
+            except BaseException:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                for point_id, point in self._journal.items():
+                    self._place(cells, points, point_id, point)
+                self._cells = cells
+                self._points = points
+                self._journal = None
+                self._loaded_at = time.monotonic()
+        finally:
+            self._reload_lock.release()
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int) -> List[Tuple[int, float]]:
+        """Up to limit (id, distance_km) pairs within radius_km, nearest first"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        dlon = min(radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01)), 180.0)
+        low_row, low_col = self._cell(lat - dlat, lon - dlon)
+        high_row, high_col = self._cell(lat + dlat, lon + dlon)
+        hits = []
+        with self._lock:
+            span = (high_row - low_row + 1) * (high_col - low_col + 1)
+            if span <= len(self._cells):
+                keys = [(row, col) for row in range(low_row, high_row + 1) for col in range(low_col, high_col + 1)]
+            else:
+                keys = [
+                    key for key in self._cells
+                    if low_row <= key[0] <= high_row and low_col <= key[1] <= high_col
+                ]
+            for key in keys:
+                bucket = self._cells.get(key)
+                if not bucket:
+                    continue
+                for point_id, (plat, plon) in bucket.items():
+                    distance = haversine_km(lat, lon, plat, plon)
+                    if distance <= radius_km:
+                        hits.append((distance, point_id))
+            self.queries += 1
+            self.cells_visited += len(keys)
+        return [(point_id, distance) for distance, point_id in heapq.nsmallest(limit, hits)]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "points": len(self._points),
+                "cells": len(self._cells),
+                "queries": self.queries,
+                "cells_visited": self.cells_visited,
+            }
+
+# Available, geocoded translators
+translator_index = GeoIndex(settings.GEO_INDEX_CELL_DEGREES, settings.GEO_INDEX_REFRESH_SECONDS)
+
+register_collector("translator_geo_index", translator_index.snapshot)
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+import hashlib
+
+def make_etag(*parts, weak: bool = True) -> str:
+    """ETag over the values that determine a representation (ids, timestamps, counters)"""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def has_validators(request: Request, last_modified: bool = False) -> bool:
+    """
+    Whether a conditional GET could be answered with 304: the request carries
+    If-None-Match, or If-Modified-Since for handlers that serve Last-Modified
+    """
+    if "if-none-match" in request.headers:
+        return True
+    return last_modified and "if-modified-since" in request.headers
+
+def is_not_modified(request: Request, etag: Optional[str] = None, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no If-None-Match was sent (RFC 9110 13.2.2)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Attach validators to the response. Returns a 304 response to send instead when
+    the client's cached copy is still current, otherwise None.
+    """
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,16 @@
+from typing import Callable, Dict, Any
+import threading
+
+_collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+def register_collector(name: str, collector: Callable[[], Dict[str, Any]]):
+    """Register a callable that returns a snapshot of a subsystem's metrics"""
+    with _lock:
+        _collectors[name] = collector
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return the current snapshot of every registered collector"""
+    with _lock:
+        collectors = dict(_collectors)
+    return {name: collector() for name, collector in collectors.items()}
@@ -0,0 +1,46 @@
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Optional, Tuple
+import json
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_lines(records: Iterable[dict]) -> str:
+    """Serialize records as newline-terminated JSON lines"""
+    return "".join(json.dumps(record, default=_default, ensure_ascii=False) + "\n" for record in records)
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a streamed body into (line number, line) pairs without buffering more than
+    one line. Blank lines are skipped; lines longer than max_line_bytes are yielded
+    as None and their remainder discarded.
+    """
+    buffer = b""
+    line_no = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_no += 1
+            if oversized:
+                oversized = False
+                yield line_no, None
+            elif len(line) > max_line_bytes:
+                yield line_no, None
+            elif line.strip():
+                yield line_no, line
+        if len(buffer) > max_line_bytes:
+            # Keep skipping until the newline that ends this line
+            oversized = True
+            buffer = b""
+    line_no += 1
+    if oversized:
+        yield line_no, None
+    elif buffer.strip():
+        yield line_no, buffer
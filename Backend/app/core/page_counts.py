@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Any, Hashable, List, Literal, Optional, Tuple
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Query
+from app.core.config import settings
+from app.core.metrics import register_collector
+import json
+import threading
+import time
+
+# How exact a page's total needs to be, chosen per request with ?count=
+#   exact:     count(*) OVER () on the page query itself, so one round trip
+#   cached:    the exact total for the same filter, reused for COUNT_CACHE_TTL_SECONDS
+#   estimated: the planner's row estimate (Postgres only), exact when it is small
+CountMode = Literal["exact", "cached", "estimated"]
+COUNT_MODE_DESCRIPTION = "How exact `total` must be: exact, cached (may lag by a TTL) or estimated"
+
+_TOTAL_LABEL = "_page_total"
+
+class CountCache:
+    """Per-filter totals with a TTL; scopes (table names) are dropped on local writes"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._totals: "OrderedDict[Tuple[str, Hashable], Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope: str, key: Hashable) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._totals.get((scope, key))
+            if entry is not None and entry[0] > now:
+                self._totals.move_to_end((scope, key))
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._totals[(scope, key)]
+            self.misses += 1
+            return None
+
+    def put(self, scope: str, key: Hashable, total: int):
+        with self._lock:
+            self._totals[(scope, key)] = (time.monotonic() + self.ttl_seconds, total)
+            self._totals.move_to_end((scope, key))
+            while len(self._totals) > self.max_entries:
+                self._totals.popitem(last=False)
+
+    def invalidate(self, scope: str):
+        """Forget every total counted over a table this worker just wrote to"""
+        with self._lock:
+            for cached in [cached for cached in self._totals if cached[0] == scope]:
+                del self._totals[cached]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._totals),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL_SECONDS, settings.COUNT_CACHE_MAX_ENTRIES)
+
+register_collector("count_cache", count_cache.snapshot)
+
+def _items(rows: list, single_entity: bool) -> list:
+    if single_entity:
+        return [row[0] for row in rows]
+    return [{key: value for key, value in row._asdict().items() if key != _TOTAL_LABEL} for row in rows]
+
+def _page(query: Query, skip: int, limit: int, single_entity: bool) -> list:
+    return _items(query.offset(skip).limit(limit).all(), single_entity)
+
+def _page_with_total(query: Query, skip: int, limit: int, single_entity: bool) -> Tuple[list, int]:
+    """The page and the exact total from one statement"""
+    rows = query.add_columns(func.count().over().label(_TOTAL_LABEL)).offset(skip).limit(limit).all()
+    if rows:
+        return _items(rows, single_entity), rows[0][-1]
+    # Past the end (or no matches): the window has no row to report the total on
+    total = query.order_by(None).with_entities(func.count()).scalar() if skip else 0
+    return [], total
+
+def _planner_estimate(query: Query) -> Optional[int]:
+    """Row estimate from EXPLAIN for the query's filter, or None off Postgres"""
+    session = query.session
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return None
+    compiled = query.order_by(None).with_entities(literal_column("1")).statement.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def paginate(
+    query: Query,
+    skip: int,
+    limit: int,
+    count_mode: CountMode = "exact",
+    scope: Optional[str] = None,
+    key: Hashable = None
+) -> Tuple[List[Any], int]:
+    """
+    (items, total) for one page of query. Items are the entities for a single-entity
+    query, otherwise dicts of the selected columns. `scope` (the counted table) and
+    `key` (the filter values) identify the total for cached mode.
+    """
+    descriptions = query.column_descriptions
+    single_entity = len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+    if count_mode == "cached" and scope is not None:
+        total = count_cache.get(scope, key)
+        if total is not None:
+            items = _page(query, skip, limit, single_entity)
+            return items, max(total, skip + len(items))
+        items, total = _page_with_total(query, skip, limit, single_entity)
+        count_cache.put(scope, key, total)
+        return items, total
+
+    if count_mode == "estimated":
+        estimate = _planner_estimate(query)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_EXACT_BELOW:
+            items = _page(query, skip, limit, single_entity)
+            # Never report fewer rows than the client has already paged through
+            return items, max(estimate, skip + len(items))
+
+    return _page_with_total(query, skip, limit, single_entity)
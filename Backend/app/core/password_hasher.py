@@ -0,0 +1,104 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Tuple, Any
+from app.core.config import settings
+from app.core.exceptions import HashingUnavailableError
+from app.core.metrics import register_collector
+from app.core.security import pwd_context
+import asyncio
+import threading
+import time
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    start = time.perf_counter()
+    hashed = pwd_context.hash(password)
+    return hashed, time.perf_counter() - start
+
+def _timed_verify(plain_password: str, hashed_password: str) -> Tuple[bool, float]:
+    start = time.perf_counter()
+    valid = pwd_context.verify(plain_password, hashed_password)
+    return valid, time.perf_counter() - start
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited executor so it never blocks the event loop.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more may wait;
+    beyond that callers get HashingUnavailableError instead of an unbounded backlog.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    async def _submit(self, fn: Callable[..., Tuple[Any, float]], *args) -> Any:
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingUnavailableError()
+            self.in_flight += 1
+            executor = self._get_executor()
+        submitted = time.perf_counter()
+        try:
+            result, hash_seconds = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        elapsed = time.perf_counter() - submitted
+        with self._lock:
+            self.completed += 1
+            self.hash_seconds_total += hash_seconds
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+            self.wait_seconds_total += max(elapsed - hash_seconds, 0.0)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_timed_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_timed_verify, plain_password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            completed = self.completed
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": max(self.in_flight - self.workers, 0),
+                "completed": completed,
+                "rejected": self.rejected,
+                "hash_ms_avg": round(self.hash_seconds_total * 1000 / completed, 3) if completed else 0.0,
+                "hash_ms_max": round(self.hash_seconds_max * 1000, 3),
+                "queue_wait_ms_avg": round(self.wait_seconds_total * 1000 / completed, 3) if completed else 0.0,
+            }
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+register_collector("password_hasher", password_hasher.snapshot)
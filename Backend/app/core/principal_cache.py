@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import register_collector
+import threading
+import time
+
+INVALIDATION_CHANNEL = "principal_cache_invalidate"
+
+class PrincipalCache:
+    """In-process TTL + LRU cache of authenticated users keyed by token subject.
+
+    Values are plain column snapshots, never ORM instances, so entries can be
+    shared between requests and sessions safely.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+        self.stale_puts = 0
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Return (snapshot or None, version); pass the version back to put()"""
+        now = time.monotonic()
+        with self._lock:
+            version = self._versions.get(key, 0)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, version
+                del self._entries[key]
+            self.misses += 1
+            return None, version
+
+    def put(self, key: str, value: Dict[str, Any], version: int):
+        """Store a snapshot unless the key was invalidated since it was read"""
+        with self._lock:
+            if self._versions.get(key, 0) != version:
+                self.stale_puts += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str, remote: bool = False):
+        """Drop a key locally and bump its version so in-flight loads are discarded"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
+            if remote:
+                self.remote_invalidations += 1
+            else:
+                self.invalidations += 1
+
+    def apply_remote(self, payload: str):
+        """Apply an invalidation published by another worker"""
+        self.invalidate(payload, remote=True)
+
+    def clear(self):
+        with self._lock:
+            for key in self._entries:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries.clear()
+
+    def publish_invalidation(self, db: Session, key: str):
+        """Queue a version bump for other workers; delivered when the transaction commits"""
+        if not settings.PRINCIPAL_CACHE_NOTIFY:
+            return
+        db.execute(
+            text("SELECT pg_notify(:channel, :key)"),
+            {"channel": INVALIDATION_CHANNEL, "key": key}
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "remote_invalidations": self.remote_invalidations,
+                "stale_puts": self.stale_puts,
+            }
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
+
+register_collector("principal_cache", principal_cache.snapshot)
@@ -0,0 +1,150 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.metrics import register_collector
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(statement: str) -> str:
+    """Replace literals and bind parameters with ? so equivalent statements compare equal"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.blake2b(normalized_sql.encode("utf-8"), digest_size=8).hexdigest()
+
+class RequestQueryStats:
+    """Statement count and DB time accumulated by one request"""
+
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+class SlowQueryRegistry:
+    """Aggregates slow statements by fingerprint so repeat offenders surface in /metrics"""
+
+    def __init__(self, max_fingerprints: int):
+        self.max_fingerprints = max_fingerprints
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.untracked = 0
+
+    def record(self, key: str, normalized_sql: str, seconds: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self.untracked += 1
+                    return
+                entry = self._entries[key] = {
+                    "fingerprint": key,
+                    "sql": normalized_sql[:500],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += seconds * 1000
+            entry["max_ms"] = max(entry["max_ms"], seconds * 1000)
+
+    def snapshot(self, limit: int = 20) -> dict:
+        with self._lock:
+            top = sorted(self._entries.values(), key=lambda entry: entry["total_ms"], reverse=True)[:limit]
+            return {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "fingerprints": len(self._entries),
+                "untracked": self.untracked,
+                "top": [
+                    dict(entry, total_ms=round(entry["total_ms"], 3), max_ms=round(entry["max_ms"], 3))
+                    for entry in top
+                ],
+            }
+
+slow_queries = SlowQueryRegistry(settings.SLOW_QUERY_MAX_FINGERPRINTS)
+
+register_collector("slow_queries", slow_queries.snapshot)
+
+def install_query_instrumentation(target_engine):
+    """Time every statement on an engine; feeds per-request stats and the slow-query log"""
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start_time = time.perf_counter()
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start_time", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+        if elapsed * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+        normalized = normalize_sql(statement)
+        key = fingerprint(normalized)
+        slow_queries.record(key, normalized, elapsed)
+        if random.random() < settings.SLOW_QUERY_LOG_SAMPLE_RATE:
+            # Normalized text only; parameters may hold personal data
+            logger.warning(f"Slow query {elapsed * 1000:.1f} ms [{key}]: {normalized[:1000]}")
+
+class QueryStatsMiddleware:
+    """ASGI middleware that scopes query stats to each request and reports them via Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                db_ms = stats.db_seconds * 1000
+                if settings.SERVER_TIMING_ENABLED:
+                    server_timing = f'db;dur={db_ms:.1f};desc="{stats.statements} queries", app;dur={total_ms:.1f}'
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing.encode("latin-1"))]
+                if stats.statements >= settings.REQUEST_QUERY_COUNT_WARN:
+                    logger.warning(
+                        f"{scope['method']} {scope['path']} ran {stats.statements} queries "
+                        f"({db_ms:.1f} ms in DB, {total_ms:.1f} ms total)"
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
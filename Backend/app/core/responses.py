@@ -0,0 +1,23 @@
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+import orjson
+
+class TrustedJSONResponse(ORJSONResponse):
+    """orjson encoding that writes UTC datetimes with a Z suffix, as pydantic does"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+def trusted_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> TrustedJSONResponse:
+    """
+    Encode data the server assembled itself (dicts and lists already in the
+    response_model's shape) straight to JSON. Returning a Response makes FastAPI
+    skip response_model validation and jsonable_encoder, so do not use this for
+    anything that has not been through a schema. Headers set on the endpoint's
+    injected response (X-Next-Cursor, ETag) are carried over.
+    """
+    fast = TrustedJSONResponse(content, status_code=status_code)
+    if response is not None:
+        fast.headers.update(response.headers)
+    return fast
@@ -0,0 +1,71 @@
+from typing import Callable, Dict
+from app.core.metrics import register_collector
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class PeriodicJob(threading.Thread):
+    """Runs a sync function every interval_seconds on its own daemon thread"""
+
+    def __init__(self, name: str, interval_seconds: float, fn: Callable[[], None]):
+        super().__init__(name=f"job-{name}", daemon=True)
+        self.job_name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+        self._stopped = threading.Event()
+        self.runs = 0
+        self.failures = 0
+        self.last_duration_ms = 0.0
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            start = time.perf_counter()
+            try:
+                self.fn()
+                self.runs += 1
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Job {self.job_name} failed: {str(e)}")
+            self.last_duration_ms = (time.perf_counter() - start) * 1000
+            self._stopped.wait(self.interval_seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_duration_ms": round(self.last_duration_ms, 3),
+        }
+
+class Scheduler:
+    """Registry of in-process periodic jobs started and stopped with the app"""
+
+    def __init__(self):
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._lock = threading.Lock()
+
+    def add_job(self, name: str, interval_seconds: float, fn: Callable[[], None]):
+        with self._lock:
+            if name in self._jobs:
+                return
+            job = self._jobs[name] = PeriodicJob(name, interval_seconds, fn)
+        job.start()
+
+    def stop(self):
+        with self._lock:
+            jobs, self._jobs = list(self._jobs.values()), {}
+        for job in jobs:
+            job.stop()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: job.snapshot() for name, job in self._jobs.items()}
+
+scheduler = Scheduler()
+
+register_collector("scheduler", scheduler.snapshot)
@@ -8,6 +8,9 @@ from fastapi.security import OAuth2PasswordBearer
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Version 2 tokens carry uid and idt (identity type) so requests can be authorized from claims alone
+ACCESS_TOKEN_VERSION = 2
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -24,6 +27,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def access_token_claims(user, role: Optional[str] = None) -> dict:
+    """Build the claims embedded in a user's access token"""
+    identity_type = getattr(user.identity_type, "value", user.identity_type).upper()
+    return {
+        "sub": user.email,
+        "role": role or ("admin" if identity_type == "ADMIN" else "user"),
+        "ver": ACCESS_TOKEN_VERSION,
+        "uid": user.id,
+        "idt": identity_type
+    }
+
 def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,29 @@
+from datetime import date, datetime, time
+from typing import Tuple
+from app.core.config import settings
+import re
+
+_SLOT_PATTERN = re.compile(r"^(\d{2})\.00 - (\d{2})\.00$")
+
+def parse_time_slot(slot: str) -> Tuple[time, time]:
+    """
+    Parse a booking slot such as "08.00 - 10.00" into (start, end). Slots start and
+    end on the hour inside the service day and last 1..SLOT_MAX_HOURS hours.
+    Raises ValueError otherwise.
+    """
+    match = _SLOT_PATTERN.match(slot.strip())
+    if not match:
+        raise ValueError("Time slot must look like '08.00 - 09.00'")
+    start_hour, end_hour = int(match.group(1)), int(match.group(2))
+    if start_hour < settings.SLOT_DAY_START_HOUR or end_hour > settings.SLOT_DAY_END_HOUR:
+        raise ValueError(
+            f"Time slots must fall between {settings.SLOT_DAY_START_HOUR:02d}.00 and {settings.SLOT_DAY_END_HOUR:02d}.00"
+        )
+    if not 1 <= end_hour - start_hour <= settings.SLOT_MAX_HOURS:
+        raise ValueError(f"Time slots last between 1 and {settings.SLOT_MAX_HOURS} hours")
+    return time(start_hour), time(end_hour)
+
+def slot_range(day: date, slot: str) -> Tuple[datetime, datetime]:
+    """Local wall-clock [start, end) of a slot on a day"""
+    start, end = parse_time_slot(slot)
+    return datetime.combine(day, start), datetime.combine(day, end)
@@ -0,0 +1,141 @@
+from typing import Dict, List, Tuple
+from app.core.config import settings
+from app.core.metrics import register_collector
+import threading
+
+TOGGLE_KINDS = ("like", "bookmark")
+
+# (kind, user_id, summary_id)
+ToggleKey = Tuple[str, int, int]
+
+# Response fields each kind of toggle affects
+_FIELDS = {
+    "like": ("like_count", "has_liked"),
+    "bookmark": ("bookmark_count", "has_bookmarked"),
+}
+
+class ToggleBuffer:
+    """Last-write-wins buffer of like/bookmark toggles for write-behind mode.
+
+    Each entry maps (kind, user_id, summary_id) to [base, desired]: the persisted
+    state when the entry was created and the latest requested state. drain() hands
+    the pending entries to the flusher; they stay visible as in-flight until
+    complete(), so reads never fall back to rows that are about to change.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._pending: Dict[ToggleKey, list] = {}
+        self._inflight: Dict[ToggleKey, list] = {}
+        # Net counter change not yet persisted, per (kind, summary_id)
+        self._deltas: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self.buffered = 0
+        self.flushes = 0
+        self.flushed_entries = 0
+        self.failed_flushes = 0
+
+    def _move_delta(self, kind: str, summary_id: int, change: int):
+        if not change:
+            return
+        key = (kind, summary_id)
+        delta = self._deltas.get(key, 0) + change
+        if delta:
+            self._deltas[key] = delta
+        else:
+            self._deltas.pop(key, None)
+
+    def accepting(self, kind: str, user_id: int, summary_id: int) -> bool:
+        """
+        False once the pending set is full and the toggle has no unflushed entry;
+        callers then write through instead. A key that is pending or in flight always
+        goes through the buffer, or the flush would overwrite the write-through.
+        """
+        key = (kind, user_id, summary_id)
+        with self._lock:
+            return (
+                len(self._pending) < self.max_pending
+                or key in self._pending
+                or key in self._inflight
+            )
+
+    def record(self, kind: str, user_id: int, summary_id: int, persisted: bool) -> bool:
+        """Buffer one toggle; persisted is the row's state in the database. Returns the new state."""
+        key = (kind, user_id, summary_id)
+        with self._lock:
+            self.buffered += 1
+            entry = self._pending.get(key)
+            if entry is None:
+                inflight = self._inflight.get(key)
+                base = inflight[1] if inflight is not None else persisted
+                entry = self._pending[key] = [base, base]
+            entry[1] = not entry[1]
+            self._move_delta(kind, summary_id, 1 if entry[1] else -1)
+            if entry[1] == entry[0]:
+                del self._pending[key]
+            return entry[1]
+
+    def drain(self) -> Dict[str, List[Tuple[int, int, bool]]]:
+        """Move pending entries in flight; returns {kind: [(user_id, summary_id, desired)]}"""
+        with self._lock:
+            self._inflight, self._pending = self._pending, {}
+            batch: Dict[str, List[Tuple[int, int, bool]]] = {}
+            for (kind, user_id, summary_id), (_, desired) in self._inflight.items():
+                batch.setdefault(kind, []).append((user_id, summary_id, desired))
+            return batch
+
+    def complete(self, success: bool):
+        """Finish the in-flight batch; on failure its entries are merged back for the next flush"""
+        with self._lock:
+            inflight, self._inflight = self._inflight, {}
+            if success:
+                self.flushes += 1
+                self.flushed_entries += len(inflight)
+                for (kind, _, summary_id), (base, desired) in inflight.items():
+                    self._move_delta(kind, summary_id, int(base) - int(desired))
+                return
+            self.failed_flushes += 1
+            for key, (base, desired) in inflight.items():
+                newer = self._pending.get(key)
+                if newer is None:
+                    self._pending[key] = [base, desired]
+                elif newer[1] == base:
+                    del self._pending[key]
+                else:
+                    newer[0] = base
+
+    def overlay(self, item: dict, user_id: int) -> dict:
+        """Apply unflushed toggles to a formatted summary response in place"""
+        with self._lock:
+            for kind, (count_field, flag_field) in _FIELDS.items():
+                item[count_field] += self._deltas.get((kind, item["id"]), 0)
+                key = (kind, user_id, item["id"])
+                entry = self._pending.get(key) or self._inflight.get(key)
+                if entry is not None:
+                    item[flag_field] = entry[1]
+        return item
+
+    def version(self, summary_id: int, user_id: int) -> tuple:
+        """Unflushed state of one summary for a user, for conditional-GET validators"""
+        with self._lock:
+            parts = []
+            for kind in TOGGLE_KINDS:
+                key = (kind, user_id, summary_id)
+                entry = self._pending.get(key) or self._inflight.get(key)
+                parts.append((self._deltas.get((kind, summary_id), 0), entry[1] if entry else None))
+            return tuple(parts)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "inflight": len(self._inflight),
+                "buffered": self.buffered,
+                "flushes": self.flushes,
+                "flushed_entries": self.flushed_entries,
+                "failed_flushes": self.failed_flushes,
+            }
+
+toggle_buffer = ToggleBuffer(settings.TOGGLE_BUFFER_MAX_PENDING)
+
+register_collector("toggle_buffer", toggle_buffer.snapshot)
@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+import heapq
+import threading
+import time
+
+def normalize_topic(topic: Optional[str]) -> Optional[str]:
+    """Canonical topic key: lowercase with whitespace collapsed; None for blank topics"""
+    if topic is None:
+        return None
+    key = " ".join(topic.lower().split())
+    return key or None
+
+class _TrieNode:
+    __slots__ = ("children", "label", "count")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.label: Optional[str] = None
+        self.count = 0
+
+class TopicTrie:
+    """In-memory prefix trie of published topics for autocomplete.
+
+    Updated incrementally as this worker publishes or deletes summaries, and
+    reloaded from summary_topics every TOPIC_TRIE_REFRESH_SECONDS so changes
+    made by other workers converge.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._root = _TrieNode()
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+
+    def _find(self, key: str, create: bool = False) -> Optional[_TrieNode]:
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _TrieNode()
+            node = child
+        return node
+
+    def _prune(self, key: str):
+        """Drop nodes left without topics or children along a removed key"""
+        path = [self._root]
+        for char in key:
+            path.append(path[-1].children[char])
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.count > 0 or node.children:
+                return
+            del path[depth - 1].children[key[depth - 1]]
+
+    def adjust(self, key: str, label: str, delta: int):
+        """Apply a published-count change for one topic"""
+        with self._lock:
+            node = self._find(key, create=delta > 0)
+            if node is None:
+                return
+            node.count = max(node.count + delta, 0)
+            if node.label is None:
+                node.label = label
+            if node.count == 0:
+                node.label = None
+                self._prune(key)
+
+    def ensure_loaded(self, load: Callable[[], Iterable[Tuple[str, str, int]]]):
+        """(Re)build from (key, label, count) rows when empty or older than the refresh interval"""
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+        root = _TrieNode()
+        for key, label, count in load():
+            if count <= 0:
+                continue
+            node = root
+            for char in key:
+                node = node.children.setdefault(char, _TrieNode())
+            node.label = label
+            node.count = count
+        with self._lock:
+            self._root = root
+            self._loaded_at = time.monotonic()
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Most-published topics starting with prefix"""
+        with self._lock:
+            start = self._find(prefix)
+            if start is None:
+                return []
+            matches = []
+            stack = [(start, prefix)]
+            while stack:
+                node, key = stack.pop()
+                if node.count > 0:
+                    matches.append((node.count, key, node.label))
+                for char, child in node.children.items():
+                    stack.append((child, key + char))
+        top = heapq.nlargest(limit, matches, key=lambda match: (match[0], match[1]))
+        return [{"topic": key, "label": label, "count": count} for count, key, label in top]
+
+topic_trie = TopicTrie(settings.TOPIC_TRIE_REFRESH_SECONDS)
@@ -1,37 +1,180 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.exceptions import EventLoopBlockedError
+from app.core.metrics import register_collector
+from app.core.query_stats import install_query_instrumentation
+import asyncio
 import logging
+import threading
+import time
 import urllib.parse
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class PoolMetrics:
+    """Thread-safe counters for connection pool checkouts and wait time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.loop_blocking_queries = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = self.waits
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "loop_blocking_queries": self.loop_blocking_queries,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / waits, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
 # Create database URL with encoded password
 password = urllib.parse.quote_plus(settings.password)
 database_url = f"postgresql://{settings.user}:{password}@{settings.host}:{settings.port}/{settings.dbname}"
 logger.info(f"Connecting to database at: {settings.host}:{settings.port}")
 
-# Create engine with proper connection pooling settings for Supabase
+# Create the single process-wide engine; every router shares its pool
 engine = create_engine(
     database_url,
-    pool_size=20,  # Maximum number of connections in the pool
-    max_overflow=10,  # Maximum number of connections that can be created beyond pool_size
-    pool_timeout=30,  # Timeout for getting a connection from the pool
-    pool_recycle=1800,  # Recycle connections after 30 minutes
-    pool_pre_ping=True,  # Enable connection health checks
-    echo=True,  # Enable SQL query logging
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,  # Maximum number of connections in the pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Maximum number of connections that can be created beyond pool_size
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Timeout for getting a connection from the pool
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections after 30 minutes
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Enable connection health checks
+    echo=settings.DB_ECHO,  # Statement timing comes from install_query_instrumentation instead
     connect_args={
         "sslmode": "require",
         "options": "-c timezone=utc"
     }
 )
 
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_metrics.incr("connects")
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics.incr("checkouts")
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    pool_metrics.incr("checkins")
+
+def install_loop_guard(target_engine):
+    """Flag sync queries issued from the event loop thread, where they stall every request"""
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if settings.DB_LOOP_GUARD == "off":
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Worker thread, nothing is blocked
+        pool_metrics.incr("loop_blocking_queries")
+        message = f"Blocking query on the event loop thread: {statement.split(None, 1)[0]}"
+        if settings.DB_LOOP_GUARD == "raise":
+            raise EventLoopBlockedError(message)
+        logger.warning(message)
+
+install_loop_guard(engine)
+install_query_instrumentation(engine)
+
+def _pool_snapshot() -> dict:
+    snapshot = pool_metrics.snapshot()
+    snapshot.update({
+        "size": engine.pool.size(),
+        "checked_out": engine.pool.checkedout(),
+        "checked_in": engine.pool.checkedin(),
+        "overflow": engine.pool.overflow(),
+    })
+    return snapshot
+
+register_collector("db_pool", _pool_snapshot)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on asyncpg for routers listed in ASYNC_DB_ROUTERS
+async_database_url = f"postgresql+asyncpg://{settings.user}:{password}@{settings.host}:{settings.port}/{settings.dbname}"
+async_engine = create_async_engine(
+    async_database_url,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={
+        "ssl": "require",
+        "statement_cache_size": settings.ASYNC_DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {"timezone": "utc"}
+    }
+)
+install_query_instrumentation(async_engine.sync_engine)
+
+# Objects must stay readable after commit because lazy refreshes cannot run outside the session
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def _async_pool_snapshot() -> dict:
+    pool = async_engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+register_collector("async_db_pool", _async_pool_snapshot)
+
+def uses_async_db(router: str) -> bool:
+    """Whether a router is configured to run its queries on the async engine"""
+    return router in {name.strip() for name in settings.ASYNC_DB_ROUTERS.split(",") if name.strip()}
+
 # Create declarative base
 Base = declarative_base()
 
@@ -41,4 +184,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
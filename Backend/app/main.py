@@ -1,18 +1,28 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.user import router as user_router
 from app.api.v1.endpoints.summary import router as summary_router
 from app.api.v1.endpoints.translation import router as translation_router
 from app.models.user_model import Base
-from app.database import engine
+from app.database import engine, database_url, SessionLocal
+from app.core.cache_listener import start_invalidation_listener, stop_invalidation_listener
+from app.core.password_hasher import password_hasher
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.scheduler import scheduler
+from app.services.trending_service import TrendingService
+from app.services.toggle_flush_service import ToggleFlushService
+from app.core.config import settings
+from anyio import to_thread
 import logging
 from app.api.v1.api import api_router
 
 app = FastAPI(
     title="Gelatik API",
     version="1.0.0",
-    description="Gelatik API for Sign Language Translation Services"
+    description="Gelatik API for Sign Language Translation Services",
+    default_response_class=ORJSONResponse
 )
 
 # Configure logging
@@ -26,8 +36,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+# Per-request SQL statement count and DB time, reported in the Server-Timing header
+app.add_middleware(QueryStatsMiddleware)
+
 # Create database tables
 try:
     Base.metadata.create_all(bind=engine)
@@ -44,6 +58,38 @@ app.include_router(summary_router, prefix=API_V1_STR + "/summaries", tags=["Summ
 app.include_router(translation_router, prefix=API_V1_STR + "/translations", tags=["Translations"])
 app.include_router(api_router, prefix=API_V1_STR)
 
+@app.on_event("startup")
+async def size_threadpool():
+    # Sync handlers each hold a pooled connection, so more threads than connections only queue on the pool
+    to_thread.current_default_thread_limiter().total_tokens = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+@app.on_event("startup")
+def start_cache_listeners():
+    start_invalidation_listener(database_url)
+
+toggle_flush_service = ToggleFlushService(SessionLocal)
+
+@app.on_event("startup")
+def start_background_jobs():
+    if settings.TOGGLE_WRITE_BEHIND_ENABLED:
+        # Write-behind toggles depend on their flusher, so it runs even with SCHEDULER_ENABLED off
+        scheduler.add_job("toggle_flush", settings.TOGGLE_FLUSH_INTERVAL_MS / 1000, toggle_flush_service.flush)
+    if not settings.SCHEDULER_ENABLED:
+        return
+    scheduler.add_job("summary_trending", settings.TRENDING_REFRESH_SECONDS, TrendingService(SessionLocal).refresh)
+
+@app.on_event("shutdown")
+def stop_background_work():
+    scheduler.stop()
+    if settings.TOGGLE_WRITE_BEHIND_ENABLED:
+        # Persist toggles that were acknowledged but not yet written
+        try:
+            toggle_flush_service.flush()
+        except Exception as e:
+            logger.error(f"Final toggle flush failed: {str(e)}")
+    stop_invalidation_listener()
+    password_hasher.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Gelatik API"}
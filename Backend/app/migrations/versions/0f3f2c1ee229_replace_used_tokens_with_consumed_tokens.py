@@ -0,0 +1,44 @@
+"""replace_used_tokens_with_consumed_tokens
+
+Revision ID: 0f3f2c1ee229
+Revises: c01a2a4565d4
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f3f2c1ee229'
+down_revision: Union[str, None] = 'c01a2a4565d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store a fixed-size digest of each redeemed token id together with its expiry
+    op.create_table('consumed_tokens',
+        sa.Column('token_hash', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_consumed_tokens_expires_at'), 'consumed_tokens', ['expires_at'], unique=False)
+
+    # Verification tokens live for 5 minutes, so the old full-token rows are all expired
+    op.execute('DROP TABLE IF EXISTS used_tokens')
+
+
+def downgrade() -> None:
+    op.create_table('used_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(), nullable=True),
+        sa.Column('used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_used_tokens_id'), 'used_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_used_tokens_token'), 'used_tokens', ['token'], unique=True)
+    op.drop_index(op.f('ix_consumed_tokens_expires_at'), table_name='consumed_tokens')
+    op.drop_table('consumed_tokens')
@@ -0,0 +1,39 @@
+"""add_summary_counters
+
+Revision ID: 5b2d8e4f1a90
+Revises: 0f3f2c1ee229
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2d8e4f1a90'
+down_revision: Union[str, None] = '0f3f2c1ee229'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized counters so summary lists no longer join and group the child tables
+    op.add_column('summaries', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('summaries', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('summaries', sa.Column('bookmark_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing rows
+    op.execute('''
+        UPDATE summaries s SET
+            like_count = (SELECT count(*) FROM summary_likes l WHERE l.summary_id = s.id),
+            comment_count = (SELECT count(*) FROM summary_comments c WHERE c.summary_id = s.id),
+            bookmark_count = (SELECT count(*) FROM summary_bookmarks b WHERE b.summary_id = s.id)
+    ''')
+
+
+def downgrade() -> None:
+    op.drop_column('summaries', 'bookmark_count')
+    op.drop_column('summaries', 'comment_count')
+    op.drop_column('summaries', 'like_count')
@@ -0,0 +1,37 @@
+"""add_summary_feed_indexes
+
+Revision ID: 7c41a9d2e6b3
+Revises: 5b2d8e4f1a90
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41a9d2e6b3'
+down_revision: Union[str, None] = '5b2d8e4f1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes for keyset pagination of the summary feeds
+    op.create_index(
+        'ix_summaries_published_feed', 'summaries',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False, postgresql_where=sa.text('is_published')
+    )
+    op.create_index(
+        'ix_summaries_user_feed', 'summaries',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summaries_user_feed', table_name='summaries')
+    op.drop_index('ix_summaries_published_feed', table_name='summaries')
@@ -0,0 +1,50 @@
+"""add_summary_search_vectors
+
+Revision ID: 9a6e3f0c2d17
+Revises: 7c41a9d2e6b3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6e3f0c2d17'
+down_revision: Union[str, None] = '7c41a9d2e6b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_CONFIGS = ('indonesian', 'simple')
+
+
+def search_vector_expression(config: str) -> str:
+    return (
+        f"setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(subtitle, '') || ' ' || coalesce(topic, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', coalesce(content, '')), 'C')"
+    )
+
+
+def upgrade() -> None:
+    # Stored generated tsvectors (this rewrites summaries once) with a GIN index per dictionary
+    for config in SEARCH_CONFIGS:
+        op.add_column('summaries', sa.Column(
+            f'search_vector_{config}',
+            postgresql.TSVECTOR(),
+            sa.Computed(search_vector_expression(config), persisted=True)
+        ))
+        op.create_index(
+            f'ix_summaries_search_{config}', 'summaries',
+            [f'search_vector_{config}'],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    for config in SEARCH_CONFIGS:
+        op.drop_index(f'ix_summaries_search_{config}', table_name='summaries')
+        op.drop_column('summaries', f'search_vector_{config}')
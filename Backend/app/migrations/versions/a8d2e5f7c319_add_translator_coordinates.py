@@ -0,0 +1,30 @@
+"""add_translator_coordinates
+
+Revision ID: a8d2e5f7c319
+Revises: f4c7a1e3b208
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2e5f7c319'
+down_revision: Union[str, None] = 'f4c7a1e3b208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are geocoded with the bundled gazetteer by
+    # python -m app.commands.geocode_translators
+    op.add_column('translations', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('translations', sa.Column('longitude', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('translations', 'longitude')
+    op.drop_column('translations', 'latitude')
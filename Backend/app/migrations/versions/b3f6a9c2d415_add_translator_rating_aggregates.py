@@ -0,0 +1,70 @@
+"""add_translator_rating_aggregates
+
+Revision ID: b3f6a9c2d415
+Revises: a8d2e5f7c319
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6a9c2d415'
+down_revision: Union[str, None] = 'a8d2e5f7c319'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ['review_count', 'rating_sum'] + [f'rating_count_{rating}' for rating in range(1, 6)]
+
+
+def upgrade() -> None:
+    for name in COUNTER_COLUMNS:
+        op.add_column('translations', sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+    op.add_column('translations', sa.Column(
+        'rating_average',
+        sa.Float(),
+        sa.Computed('CASE WHEN review_count > 0 THEN CAST(rating_sum AS FLOAT) / review_count END', persisted=True)
+    ))
+
+    # Backfill from existing reviews (updated_at is left alone: no profile edit happened)
+    op.execute("""
+        UPDATE translations t
+        SET review_count = r.review_count,
+            rating_sum = r.rating_sum,
+            rating_count_1 = r.rating_count_1,
+            rating_count_2 = r.rating_count_2,
+            rating_count_3 = r.rating_count_3,
+            rating_count_4 = r.rating_count_4,
+            rating_count_5 = r.rating_count_5
+        FROM (
+            SELECT o.translator_id,
+                   count(*) AS review_count,
+                   sum(v.rating) AS rating_sum,
+                   count(*) FILTER (WHERE v.rating = 1) AS rating_count_1,
+                   count(*) FILTER (WHERE v.rating = 2) AS rating_count_2,
+                   count(*) FILTER (WHERE v.rating = 3) AS rating_count_3,
+                   count(*) FILTER (WHERE v.rating = 4) AS rating_count_4,
+                   count(*) FILTER (WHERE v.rating = 5) AS rating_count_5
+            FROM translation_reviews v
+            JOIN translation_orders o ON o.id = v.order_id
+            GROUP BY o.translator_id
+        ) r
+        WHERE t.id = r.translator_id
+    """)
+
+    # Translator list with sort=rating
+    op.create_index(
+        'ix_translations_rating', 'translations',
+        [sa.text('rating_average DESC NULLS LAST'), sa.text('review_count DESC'), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_translations_rating', table_name='translations')
+    op.drop_column('translations', 'rating_average')
+    for name in reversed(COUNTER_COLUMNS):
+        op.drop_column('translations', name)
@@ -0,0 +1,54 @@
+"""add_summary_topic_catalogue
+
+Revision ID: b3f87d1c5e42
+Revises: 9a6e3f0c2d17
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f87d1c5e42'
+down_revision: Union[str, None] = '9a6e3f0c2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Normalized topic key (lowercase, whitespace collapsed) for indexed topic filtering
+    op.add_column('summaries', sa.Column('topic_key', sa.String(100), nullable=True))
+    op.execute(r"""
+        UPDATE summaries
+        SET topic_key = NULLIF(lower(regexp_replace(btrim(topic), '\s+', ' ', 'g')), '')
+        WHERE is_published AND topic IS NOT NULL
+    """)
+    op.create_index(
+        'ix_summaries_topic_feed', 'summaries',
+        ['topic_key', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False, postgresql_where=sa.text('is_published')
+    )
+
+    # Topic catalogue with published counts, backfilled from existing summaries
+    op.create_table('summary_topics',
+        sa.Column('topic_key', sa.String(100), nullable=False),
+        sa.Column('label', sa.String(100), nullable=False),
+        sa.Column('published_count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('topic_key')
+    )
+    op.execute("""
+        INSERT INTO summary_topics (topic_key, label, published_count)
+        SELECT topic_key, min(btrim(topic)), count(*)
+        FROM summaries
+        WHERE is_published AND topic_key IS NOT NULL
+        GROUP BY topic_key
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('summary_topics')
+    op.drop_index('ix_summaries_topic_feed', table_name='summaries')
+    op.drop_column('summaries', 'topic_key')
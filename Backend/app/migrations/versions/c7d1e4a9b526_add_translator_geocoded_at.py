@@ -0,0 +1,29 @@
+"""add_translator_geocoded_at
+
+Revision ID: c7d1e4a9b526
+Revises: b3f6a9c2d415
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d1e4a9b526'
+down_revision: Union[str, None] = 'b3f6a9c2d415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('translations', sa.Column('geocoded_at', sa.DateTime(timezone=True), nullable=True))
+    # Rows with coordinates were geocoded already; the rest are left for
+    # python -m app.commands.geocode_translators
+    op.execute("UPDATE translations SET geocoded_at = now() WHERE latitude IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('translations', 'geocoded_at')
@@ -0,0 +1,48 @@
+"""add_summary_trending
+
+Revision ID: c8d2e5a1f374
+Revises: b3f87d1c5e42
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e5a1f374'
+down_revision: Union[str, None] = 'b3f87d1c5e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Precomputed trending scores, filled by the trending job
+    op.create_table('summary_trending',
+        sa.Column('summary_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('last_interaction_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('summary_id')
+    )
+    op.create_index(
+        'ix_summary_trending_rank', 'summary_trending',
+        [sa.text('score DESC'), sa.text('summary_id DESC')],
+        unique=False
+    )
+
+    # The job finds changed summaries by interaction time
+    op.create_index(op.f('ix_summary_likes_created_at'), 'summary_likes', ['created_at'], unique=False)
+    op.create_index(op.f('ix_summary_comments_created_at'), 'summary_comments', ['created_at'], unique=False)
+    op.create_index(op.f('ix_summary_bookmarks_created_at'), 'summary_bookmarks', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_summary_bookmarks_created_at'), table_name='summary_bookmarks')
+    op.drop_index(op.f('ix_summary_comments_created_at'), table_name='summary_comments')
+    op.drop_index(op.f('ix_summary_likes_created_at'), table_name='summary_likes')
+    op.drop_index('ix_summary_trending_rank', table_name='summary_trending')
+    op.drop_table('summary_trending')
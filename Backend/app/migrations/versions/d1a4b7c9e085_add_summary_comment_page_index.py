@@ -0,0 +1,31 @@
+"""add_summary_comment_page_index
+
+Revision ID: d1a4b7c9e085
+Revises: c8d2e5a1f374
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a4b7c9e085'
+down_revision: Union[str, None] = 'c8d2e5a1f374'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of a summary's comments
+    op.create_index(
+        'ix_summary_comments_summary_page', 'summary_comments',
+        ['summary_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summary_comments_summary_page', table_name='summary_comments')
@@ -0,0 +1,34 @@
+"""add_summary_trending_dirty
+
+Revision ID: d4a8f2c6e913
+Revises: c7d1e4a9b526
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f2c6e913'
+down_revision: Union[str, None] = 'c7d1e4a9b526'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Summaries whose interactions were removed, for the incremental trending refresh
+    op.create_table('summary_trending_dirty',
+        sa.Column('summary_id', sa.Integer(), nullable=False),
+        sa.Column('marked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['summary_id'], ['summaries.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('summary_id')
+    )
+    op.create_index(op.f('ix_summary_trending_dirty_marked_at'), 'summary_trending_dirty', ['marked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_summary_trending_dirty_marked_at'), table_name='summary_trending_dirty')
+    op.drop_table('summary_trending_dirty')
@@ -0,0 +1,27 @@
+"""add_translations_updated_at
+
+Revision ID: e2b5c8d0f196
+Revises: d1a4b7c9e085
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b5c8d0f196'
+down_revision: Union[str, None] = 'd1a4b7c9e085'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Validator for conditional GETs on translator profiles
+    op.add_column('translations', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('translations', 'updated_at')
@@ -0,0 +1,48 @@
+"""add_translation_order_slot_ranges
+
+Revision ID: f4c7a1e3b208
+Revises: e2b5c8d0f196
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c7a1e3b208'
+down_revision: Union[str, None] = 'e2b5c8d0f196'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('translation_orders', sa.Column('slot_start', sa.DateTime(), nullable=True))
+    op.add_column('translation_orders', sa.Column('slot_end', sa.DateTime(), nullable=True))
+
+    # Backfill local wall-clock ranges from tanggal + 'HH.MI - HH.MI'
+    op.execute("""
+        UPDATE translation_orders
+        SET slot_start = tanggal + to_timestamp(split_part(time_slot, ' - ', 1), 'HH24.MI')::time,
+            slot_end = tanggal + to_timestamp(split_part(time_slot, ' - ', 2), 'HH24.MI')::time
+    """)
+    op.alter_column('translation_orders', 'slot_start', nullable=False)
+    op.alter_column('translation_orders', 'slot_end', nullable=False)
+
+    # Overlapping active bookings that already exist make this fail, naming the
+    # conflicting keys; cancel or reschedule those orders and rerun
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute("""
+        ALTER TABLE translation_orders
+        ADD CONSTRAINT ex_translation_orders_translator_slot
+        EXCLUDE USING gist (translator_id WITH =, tsrange(slot_start, slot_end, '[)') WITH &&)
+        WHERE (status IN ('pending', 'confirmed'))
+    """)
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE translation_orders DROP CONSTRAINT ex_translation_orders_translator_slot')
+    op.drop_column('translation_orders', 'slot_end')
+    op.drop_column('translation_orders', 'slot_start')
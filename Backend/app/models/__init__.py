@@ -1,3 +1,3 @@
 from app.models.user_model import User, IdentityType
 from app.models.translation_model import Translation, TranslationOrder
-from app.models.summary_model import Summary, SummaryLike, SummaryBookmark, SummaryComment 
\ No newline at end of file
+from app.models.summary_model import Summary, SummaryLike, SummaryBookmark, SummaryComment, SummaryTopic, SummaryTrending, SummaryTrendingDirty 
\ No newline at end of file
@@ -1,6 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, func, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, func, UniqueConstraint, Index, text, Computed, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
+from datetime import datetime, timezone
+
+# Fixed reference point for trending decay; never change it without rescoring every row
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def search_vector_expression(config: str) -> str:
+    """Weighted tsvector over title (A), subtitle and topic (B) and content (C)"""
+    return (
+        f"setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(subtitle, '') || ' ' || coalesce(topic, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', coalesce(content, '')), 'C')"
+    )
 
 class Summary(Base):
     __tablename__ = "summaries"
@@ -10,25 +23,82 @@ class Summary(Base):
     title = Column(String(200), nullable=True)
     subtitle = Column(String(255), nullable=True)
     topic = Column(String(100), nullable=True)
+    topic_key = Column(String(100), nullable=True)  # normalize_topic(topic), set on publish
     image_url = Column(String(500), nullable=True)
     is_published = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
+    # Denormalized counters, kept in step by SummaryRepository and repaired by
+    # app.commands.reconcile_summary_counters
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+    bookmark_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Full-text search vectors maintained by Postgres; deferred so regular loads skip them
+    search_vector_indonesian = deferred(Column(TSVECTOR, Computed(search_vector_expression("indonesian"), persisted=True)))
+    search_vector_simple = deferred(Column(TSVECTOR, Computed(search_vector_expression("simple"), persisted=True)))
+
     # Relationships
     user = relationship("User", back_populates="summaries")
     likes = relationship("SummaryLike", back_populates="summary", cascade="all, delete-orphan")
     bookmarks = relationship("SummaryBookmark", back_populates="summary", cascade="all, delete-orphan")
     comments = relationship("SummaryComment", back_populates="summary", cascade="all, delete-orphan")
 
+    # Keyset pagination indexes matching ORDER BY created_at DESC, id DESC
+    __table_args__ = (
+        Index('ix_summaries_published_feed', created_at.desc(), id.desc(), postgresql_where=text('is_published')),
+        Index('ix_summaries_user_feed', user_id, created_at.desc(), id.desc()),
+        Index('ix_summaries_topic_feed', topic_key, created_at.desc(), id.desc(), postgresql_where=text('is_published')),
+        Index('ix_summaries_search_indonesian', search_vector_indonesian, postgresql_using='gin'),
+        Index('ix_summaries_search_simple', search_vector_simple, postgresql_using='gin'),
+    )
+
+class SummaryTopic(Base):
+    """Topic catalogue with the number of published summaries per normalized topic"""
+    __tablename__ = "summary_topics"
+
+    topic_key = Column(String(100), primary_key=True)
+    label = Column(String(100), nullable=False)
+    published_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+class SummaryTrending(Base):
+    """Precomputed trending score per summary, refreshed by the trending job.
+
+    score is log2 of the sum of interaction weights, each scaled by
+    2 ** ((created_at - TRENDING_EPOCH) / half_life). Measuring decay from a fixed
+    epoch keeps scores comparable across runs, so unchanged rows never need rewriting.
+    """
+    __tablename__ = "summary_trending"
+
+    summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    last_interaction_at = Column(DateTime(timezone=True), nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_summary_trending_rank', score.desc(), summary_id.desc()),
+    )
+
+class SummaryTrendingDirty(Base):
+    """Summaries that lost a like, bookmark or comment, queued for the trending job.
+
+    Removals leave no row with a fresh created_at behind, so without a mark the job
+    would never see that a ranked summary's score went down.
+    """
+    __tablename__ = "summary_trending_dirty"
+
+    summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    marked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
 class SummaryLike(Base):
     __tablename__ = "summary_likes"
 
     id = Column(Integer, primary_key=True, index=True)
     summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     summary = relationship("Summary", back_populates="likes")
@@ -46,20 +116,25 @@ class SummaryComment(Base):
     content = Column(Text, nullable=False)
     summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     summary = relationship("Summary", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
+    # Comment pages seek on (created_at, id) within a summary
+    __table_args__ = (
+        Index('ix_summary_comments_summary_page', summary_id, created_at, id),
+    )
+
 class SummaryBookmark(Base):
     __tablename__ = "summary_bookmarks"
 
     id = Column(Integer, primary_key=True, index=True)
     summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     summary = relationship("Summary", back_populates="bookmarks")
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, LargeBinary, DateTime
 from app.database import Base
 
-class UsedToken(Base):
-    __tablename__ = "used_tokens"
+class ConsumedToken(Base):
+    """Single-use verification tokens that have already been redeemed.
 
-    id = Column(Integer, primary_key=True, index=True)
-    token = Column(String, unique=True, index=True)
-    used_at = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    Only a fixed-size SHA-256 digest of the token id is stored, and rows are
+    purged once the token would have expired anyway.
+    """
+    __tablename__ = "consumed_tokens"
+
+    token_hash = Column(LargeBinary(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
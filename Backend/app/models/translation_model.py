@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Date, func, CheckConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Date, Float, func, CheckConstraint, Computed, Index, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -8,20 +9,57 @@ class Translation(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     alamat = Column(String(255), nullable=False)
+    # Geocoded from alamat with the bundled gazetteer; NULL when no region matched
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # When alamat was last geocoded, matched or not; NULL rows are backfilled by
+    # app.commands.geocode_translators
+    geocoded_at = Column(DateTime(timezone=True), nullable=True)
     availability = Column(Boolean, default=True)
     profile_pic = Column(String(500), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Denormalized review aggregates, kept in step by TranslationRepository and
+    # repaired by app.commands.reconcile_translator_ratings
+    review_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count_1 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count_2 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count_3 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count_4 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count_5 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_average = Column(
+        Float,
+        Computed("CASE WHEN review_count > 0 THEN CAST(rating_sum AS FLOAT) / review_count END", persisted=True)
+    )
 
     # Relationships
     user = relationship("User", backref="translations")
     orders = relationship("TranslationOrder", back_populates="translator", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # sort=rating on the translator list
+        Index(
+            'ix_translations_rating',
+            rating_average.desc().nulls_last(), review_count.desc(), id
+        ).ddl_if(dialect='postgresql'),
+    )
+
+    @property
+    def rating_histogram(self) -> dict:
+        """Number of reviews per star rating"""
+        return {rating: getattr(self, f"rating_count_{rating}") or 0 for rating in range(1, 6)}
+
 class TranslationOrder(Base):
     __tablename__ = "translation_orders"
 
     id = Column(Integer, primary_key=True, index=True)
     tanggal = Column(Date, nullable=False)
     time_slot = Column(String(20), nullable=False)
+    # Local wall-clock [slot_start, slot_end) parsed from tanggal + time_slot
+    slot_start = Column(DateTime, nullable=False)
+    slot_end = Column(DateTime, nullable=False)
     description = Column(Text, nullable=False)
     status = Column(String(20), nullable=False, default="pending")  # Use string column instead of enum
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -36,6 +74,18 @@ class TranslationOrder(Base):
     translator = relationship("Translation", back_populates="orders")
     review = relationship("TranslationReview", back_populates="order", uselist=False, cascade="all, delete-orphan")
 
+    # No two active bookings of a translator may overlap; the GiST index behind this
+    # constraint also serves the free-translator search
+    __table_args__ = (
+        ExcludeConstraint(
+            (translator_id, '='),
+            (func.tsrange(slot_start, slot_end, literal_column("'[)'")), '&&'),
+            name='ex_translation_orders_translator_slot',
+            using='gist',
+            where=text("status IN ('pending', 'confirmed')")
+        ).ddl_if(dialect='postgresql'),
+    )
+
 class TranslationReview(Base):
     __tablename__ = "translation_reviews"
 
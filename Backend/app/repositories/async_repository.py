@@ -0,0 +1,56 @@
+from typing import Any, Callable
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import get_db, get_async_db, uses_async_db
+
+RepositoryFactory = Callable[[Session], Any]
+
+class AsyncRepository:
+    """
+    Async variant of a repository (or service) built on an AsyncSession.
+
+    This is a run_sync shim, not a native select()-based async repository: every
+    method call runs the sync ORM implementation through AsyncSession.run_sync,
+    which drives asyncpg from a greenlet. Query code stays shared with the sync
+    variant, so switching a router compares asyncpg+greenlet against
+    psycopg2+threadpool rather than a rewritten async query layer.
+    """
+
+    def __init__(self, session: AsyncSession, factory: RepositoryFactory):
+        self._session = session
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        async def call(*args, **kwargs):
+            return await self._session.run_sync(
+                lambda sync_session: getattr(self._factory(sync_session), name)(*args, **kwargs)
+            )
+        return call
+
+class ThreadedRepository:
+    """Sync-engine variant with the same awaitable interface; each call runs on the threadpool"""
+
+    def __init__(self, session: Session, factory: RepositoryFactory):
+        self._session = session
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(getattr(self._factory(self._session), name), *args, **kwargs)
+        return call
+
+def repository_dependency(router: str, factory: RepositoryFactory):
+    """
+    Build a FastAPI dependency yielding the async or sync variant configured for a router.
+
+    Routers wired through here: summaries, translations, feedback and users.
+    """
+    if uses_async_db(router):
+        def get_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncRepository:
+            return AsyncRepository(db, factory)
+    else:
+        def get_repository(db: Session = Depends(get_db)) -> ThreadedRepository:
+            return ThreadedRepository(db, factory)
+    return get_repository
@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Optional
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app.core.page_counts import CountMode, count_cache, paginate
 from app.models.feedback_model import FeedbackSystem, FeedbackDosen
 from app.api.v1.schemas.feedback_schemas import (
     FeedbackCreate, FeedbackUpdate,
@@ -19,27 +22,28 @@ class FeedbackRepository:
     def get_feedback_dosen_by_user(self, user_id: int) -> FeedbackDosen:
         return self.session.query(FeedbackDosen).filter(FeedbackDosen.user_id == user_id).first()
 
-    def create_feedback(self, user_id: int, feedback_data: FeedbackCreate) -> FeedbackSystem:
-        feedback = FeedbackSystem(
-            user_id=user_id,
-            rating=feedback_data.rating,
-            description=feedback_data.description
+    def _insert_once(self, model, user_id: int, feedback_data):
+        """Insert the user's single feedback row; None when they already have one (no IntegrityError races)"""
+        statement = (
+            insert(model)
+            .values(user_id=user_id, rating=feedback_data.rating, description=feedback_data.description)
+            .on_conflict_do_nothing(index_elements=[model.user_id])
+            .returning(model)
         )
-        self.session.add(feedback)
+        feedback = self.session.scalars(statement).first()
+        if feedback is not None:
+            # Keep the RETURNING values; commit would otherwise expire them and force a reload
+            self.session.expunge(feedback)
         self.session.commit()
-        self.session.refresh(feedback)
+        if feedback is not None:
+            count_cache.invalidate(model.__tablename__)
         return feedback
 
-    def create_feedback_dosen(self, user_id: int, feedback_data: FeedbackDosenCreate) -> FeedbackDosen:
-        feedback = FeedbackDosen(
-            user_id=user_id,
-            rating=feedback_data.rating,
-            description=feedback_data.description
-        )
-        self.session.add(feedback)
-        self.session.commit()
-        self.session.refresh(feedback)
-        return feedback
+    def create_feedback(self, user_id: int, feedback_data: FeedbackCreate) -> Optional[FeedbackSystem]:
+        return self._insert_once(FeedbackSystem, user_id, feedback_data)
+
+    def create_feedback_dosen(self, user_id: int, feedback_data: FeedbackDosenCreate) -> Optional[FeedbackDosen]:
+        return self._insert_once(FeedbackDosen, user_id, feedback_data)
 
     def update_feedback(self, feedback_id: int, feedback_data: FeedbackUpdate) -> FeedbackSystem:
         feedback = self.session.query(FeedbackSystem).filter(FeedbackSystem.id == feedback_id).first()
@@ -71,15 +75,11 @@ class FeedbackRepository:
     def get_feedback_dosen(self, feedback_id: int) -> FeedbackDosen:
         return self.session.query(FeedbackDosen).filter(FeedbackDosen.id == feedback_id).first()
 
-    def get_all_feedback(self, skip: int = 0, limit: int = 10) -> tuple[list[FeedbackSystem], int]:
-        feedbacks = self.session.query(FeedbackSystem).offset(skip).limit(limit).all()
-        total = self.session.query(func.count(FeedbackSystem.id)).scalar()
-        return list(feedbacks), total
+    def get_all_feedback(self, skip: int = 0, limit: int = 10, count_mode: CountMode = "exact") -> tuple[list[FeedbackSystem], int]:
+        return paginate(self.session.query(FeedbackSystem), skip, limit, count_mode, scope=FeedbackSystem.__tablename__)
 
-    def get_all_feedback_dosen(self, skip: int = 0, limit: int = 10) -> tuple[list[FeedbackDosen], int]:
-        feedbacks = self.session.query(FeedbackDosen).offset(skip).limit(limit).all()
-        total = self.session.query(func.count(FeedbackDosen.id)).scalar()
-        return list(feedbacks), total
+    def get_all_feedback_dosen(self, skip: int = 0, limit: int = 10, count_mode: CountMode = "exact") -> tuple[list[FeedbackDosen], int]:
+        return paginate(self.session.query(FeedbackDosen), skip, limit, count_mode, scope=FeedbackDosen.__tablename__)
 
     def get_average_system_rating(self) -> float:
         result = self.session.query(func.avg(FeedbackSystem.rating)).scalar()
@@ -94,6 +94,7 @@ class FeedbackRepository:
         if feedback:
             self.session.delete(feedback)
             self.session.commit()
+            count_cache.invalidate(feedback.__tablename__)
             return True
         return False
 
@@ -102,5 +103,6 @@ class FeedbackRepository:
         if feedback:
             self.session.delete(feedback)
             self.session.commit()
+            count_cache.invalidate(feedback.__tablename__)
             return True
         return False
@@ -1,9 +1,227 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
-from app.models.summary_model import Summary, SummaryLike, SummaryComment, SummaryBookmark
+from sqlalchemy import func, or_, select, update, tuple_, cast, literal, text, false
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, REGCONFIG, insert
+from sqlalchemy.exc import DataError, IntegrityError
+from app.models.summary_model import (
+    Summary, SummaryLike, SummaryComment, SummaryBookmark, SummaryTopic, SummaryTrending, TRENDING_EPOCH
+)
 from app.models.user_model import User
 from app.api.v1.schemas.summary_schemas import SummaryCreate, SummaryUpdate, SummaryPublish, CommentCreate
+from app.core.topic_trie import topic_trie, normalize_topic
+from app.core.feed_cache import feed_cache
+from app.core.toggle_buffer import toggle_buffer
+from app.core.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from app.core.config import settings
 from fastapi import HTTPException, status
+from typing import Iterator, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRENDING_LOCK_KEY = 0x7472656E64  # Serializes the trending job across workers
+
+# Recompute scores for summaries with interactions (or removals, through
+# summary_trending_dirty) since :since, using only interactions inside the window.
+# Each score is a log-sum-exp over x = (created_at - epoch) / half_life, so the
+# 2 ** x terms never overflow.
+REFRESH_TRENDING_SQL = text("""
+    WITH changed AS (
+        SELECT summary_id FROM summary_likes WHERE created_at >= :since
+        UNION SELECT summary_id FROM summary_comments WHERE created_at >= :since
+        UNION SELECT summary_id FROM summary_bookmarks WHERE created_at >= :since
+        UNION SELECT summary_id FROM summary_trending_dirty WHERE marked_at >= :since
+    ),
+    events AS (
+        SELECT summary_id, created_at, CAST(:like_weight AS float8) AS weight
+        FROM summary_likes
+        WHERE created_at >= :window_start AND summary_id IN (SELECT summary_id FROM changed)
+        UNION ALL
+        SELECT summary_id, created_at, CAST(:comment_weight AS float8)
+        FROM summary_comments
+        WHERE created_at >= :window_start AND summary_id IN (SELECT summary_id FROM changed)
+        UNION ALL
+        SELECT summary_id, created_at, CAST(:bookmark_weight AS float8)
+        FROM summary_bookmarks
+        WHERE created_at >= :window_start AND summary_id IN (SELECT summary_id FROM changed)
+    ),
+    scaled AS (
+        SELECT summary_id, created_at, weight,
+               CAST(extract(epoch FROM created_at - :epoch) AS float8) / :half_life_seconds AS x
+        FROM events
+    ),
+    peaked AS (
+        SELECT summary_id, created_at, weight, x, max(x) OVER (PARTITION BY summary_id) AS x_max
+        FROM scaled
+    ),
+    scored AS (
+        SELECT summary_id,
+               max(x_max) + ln(sum(weight * power(2.0, x - x_max))) / ln(2.0) AS score,
+               max(created_at) AS last_interaction_at
+        FROM peaked
+        GROUP BY summary_id
+    ),
+    pruned AS (
+        -- Changed summaries with no interactions left in the window, and ranked ones
+        -- whose last interaction has aged out of it
+        DELETE FROM summary_trending
+        WHERE summary_id NOT IN (SELECT summary_id FROM scored)
+          AND (summary_id IN (SELECT summary_id FROM changed) OR last_interaction_at < :window_start)
+        RETURNING summary_id
+    ),
+    expired AS (
+        -- Marks older than the window can no longer be ahead of any watermark
+        DELETE FROM summary_trending_dirty WHERE marked_at < :window_start
+    ),
+    upserted AS (
+        INSERT INTO summary_trending (summary_id, score, last_interaction_at, computed_at)
+        SELECT summary_id, score, last_interaction_at, now()
+        FROM scored
+        ON CONFLICT (summary_id) DO UPDATE SET
+            score = EXCLUDED.score,
+            last_interaction_at = EXCLUDED.last_interaction_at,
+            computed_at = EXCLUDED.computed_at
+        WHERE summary_trending.score IS DISTINCT FROM EXCLUDED.score
+           OR summary_trending.last_interaction_at IS DISTINCT FROM EXCLUDED.last_interaction_at
+        RETURNING summary_id
+    )
+    SELECT (SELECT count(*) FROM upserted) AS rescored, (SELECT count(*) FROM pruned) AS pruned
+""")
+
+def _toggle_statement(table: str, counter: str):
+    """
+    Toggle one (user, summary) row of a like/bookmark table in a single statement:
+    delete it if present, otherwise insert it, and move the summary's counter by the
+    net change. Only published summaries are touched; the summary row is key-share
+    locked so a concurrent delete cannot break the insert's foreign key. Concurrent
+    inserts for the same pair resolve through ON CONFLICT instead of an IntegrityError.
+    A delete also marks the summary dirty for the trending job.
+    """
+    return text(f"""
+        WITH target AS (
+            SELECT id, is_published, created_at, topic_key
+            FROM summaries
+            WHERE id = :summary_id
+            FOR KEY SHARE
+        ),
+        removed AS (
+            DELETE FROM {table}
+            WHERE summary_id = :summary_id AND user_id = :user_id
+              AND EXISTS (SELECT 1 FROM target WHERE is_published)
+            RETURNING id
+        ),
+        added AS (
+            INSERT INTO {table} (summary_id, user_id)
+            SELECT id, :user_id FROM target
+            WHERE is_published AND NOT EXISTS (SELECT 1 FROM removed)
+            ON CONFLICT (user_id, summary_id) DO NOTHING
+            RETURNING id
+        ),
+        counted AS (
+            UPDATE summaries
+            SET {counter} = {counter} + (SELECT count(*) FROM added) - (SELECT count(*) FROM removed)
+            WHERE id = :summary_id
+              AND (EXISTS (SELECT 1 FROM added) OR EXISTS (SELECT 1 FROM removed))
+            RETURNING id
+        ),
+        marked AS (
+            -- A removal leaves nothing new behind; queue the summary for the trending job
+            INSERT INTO summary_trending_dirty (summary_id)
+            SELECT :summary_id FROM removed
+            ON CONFLICT (summary_id) DO UPDATE SET marked_at = EXCLUDED.marked_at
+        )
+        SELECT target.is_published, target.created_at, target.topic_key,
+               EXISTS (SELECT 1 FROM removed) AS removed,
+               EXISTS (SELECT 1 FROM counted) AS counted
+        FROM target
+    """)
+
+TOGGLE_LIKE_SQL = _toggle_statement("summary_likes", "like_count")
+TOGGLE_BOOKMARK_SQL = _toggle_statement("summary_bookmarks", "bookmark_count")
+
+def _apply_toggles_statement(table: str, counter: str):
+    """
+    Write-behind flush for one kind: bring every (user, summary) pair in the batch to
+    its desired state with one multi-row insert and one multi-row delete, then move
+    each summary's counter by the rows actually changed. Pairs for summaries that are
+    gone or unpublished are skipped, and summaries that lost rows are marked dirty for
+    the trending job. Returns the summaries whose counters moved.
+    """
+    return text(f"""
+        WITH wanted AS (
+            SELECT * FROM unnest(
+                CAST(:user_ids AS integer[]), CAST(:summary_ids AS integer[]), CAST(:states AS boolean[])
+            ) AS w(user_id, summary_id, state)
+        ),
+        removed AS (
+            DELETE FROM {table} t
+            USING wanted w
+            WHERE NOT w.state AND t.user_id = w.user_id AND t.summary_id = w.summary_id
+            RETURNING t.summary_id
+        ),
+        added AS (
+            INSERT INTO {table} (summary_id, user_id)
+            SELECT w.summary_id, w.user_id
+            FROM wanted w
+            JOIN summaries s ON s.id = w.summary_id AND s.is_published
+            WHERE w.state
+            ORDER BY w.summary_id, w.user_id
+            FOR KEY SHARE OF s
+            ON CONFLICT (user_id, summary_id) DO NOTHING
+            RETURNING summary_id
+        ),
+        marked AS (
+            INSERT INTO summary_trending_dirty (summary_id)
+            SELECT DISTINCT summary_id FROM removed
+            ON CONFLICT (summary_id) DO UPDATE SET marked_at = EXCLUDED.marked_at
+        ),
+        deltas AS (
+            SELECT summary_id, sum(delta) AS delta
+            FROM (
+                SELECT summary_id, 1 AS delta FROM added
+                UNION ALL
+                SELECT summary_id, -1 FROM removed
+            ) changes
+            GROUP BY summary_id
+        )
+        UPDATE summaries s
+        SET {counter} = s.{counter} + d.delta
+        FROM deltas d
+        WHERE s.id = d.summary_id AND d.delta <> 0
+        RETURNING s.id, s.created_at, s.topic_key
+    """)
+
+APPLY_TOGGLES_SQL = {
+    "like": _apply_toggles_statement("summary_likes", "like_count"),
+    "bookmark": _apply_toggles_statement("summary_bookmarks", "bookmark_count"),
+}
+
+# Queue everything a user interacted with in the window before their rows cascade away
+MARK_USER_INTERACTIONS_SQL = text("""
+    INSERT INTO summary_trending_dirty (summary_id)
+    SELECT summary_id FROM summary_likes WHERE user_id = :user_id AND created_at >= :window_start
+    UNION SELECT summary_id FROM summary_comments WHERE user_id = :user_id AND created_at >= :window_start
+    UNION SELECT summary_id FROM summary_bookmarks WHERE user_id = :user_id AND created_at >= :window_start
+    ON CONFLICT (summary_id) DO UPDATE SET marked_at = EXCLUDED.marked_at
+""")
+
+# Fields written by the NDJSON export, in output order
+EXPORT_COLUMNS = (
+    Summary.id, Summary.user_id, Summary.title, Summary.subtitle, Summary.topic,
+    Summary.content, Summary.image_url, Summary.is_published, Summary.created_at, Summary.updated_at
+)
+
+# Fields of a formatted summary that a feed page's ETag depends on: everything but the bodies
+PAGE_VERSION_FIELDS = (
+    "id", "created_at", "updated_at", "like_count", "comment_count", "bookmark_count", "user_name"
+)
+
+def feed_page_version(items: list[dict], next_cursor: Optional[str]) -> tuple:
+    """Version of a served feed page, so a 304 always refers to the body the client holds"""
+    return tuple(
+        tuple(item[field] for field in PAGE_VERSION_FIELDS) + (bool(item["has_liked"]), bool(item["has_bookmarked"]))
+        for item in items
+    ), next_cursor
 
 class SummaryRepository:
     def __init__(self, db: Session):
@@ -13,7 +231,7 @@ class SummaryRepository:
         if not summary_data:
             return None
         
-        summary, user_name, like_count, comment_count, bookmark_count, has_liked, has_bookmarked = summary_data
+        summary, user_name, has_liked, has_bookmarked = summary_data
         
         return {
             "id": summary.id,
@@ -27,43 +245,142 @@ class SummaryRepository:
             "updated_at": summary.updated_at,
             "user_id": summary.user_id,
             "user_name": user_name,
-            "like_count": like_count or 0,
-            "comment_count": comment_count or 0,
-            "bookmark_count": bookmark_count or 0,
+            "like_count": summary.like_count or 0,
+            "comment_count": summary.comment_count or 0,
+            "bookmark_count": summary.bookmark_count or 0,
             "has_liked": has_liked or False,
             "has_bookmarked": has_bookmarked or False,
-            "comments": []
+            "comments": [],
+            "comments_next_cursor": None
         }
 
-    def get_summary_with_stats(self, summary_id: int, current_user_id: int):
+    def _summary_stats_query(self, current_user_id: Optional[int]):
+        """
+        Summary rows (with their stored counters), author name and the caller's like/bookmark flags.
+        With current_user_id=None the flags are constant False (user-independent rows for the feed cache).
+        """
+        has_liked, has_bookmarked = self._flag_columns(current_user_id)
         return self.db.query(
             Summary,
             User.full_name.label('user_name'),
-            func.count(SummaryLike.id).label('like_count'),
-            func.count(SummaryComment.id).label('comment_count'),
-            func.count(SummaryBookmark.id).label('bookmark_count'),
-            func.bool_or(and_(
-                SummaryLike.user_id == current_user_id,
-                SummaryLike.summary_id == Summary.id
-            )).label('has_liked'),
-            func.bool_or(and_(
-                SummaryBookmark.user_id == current_user_id,
-                SummaryBookmark.summary_id == Summary.id
-            )).label('has_bookmarked')
+            has_liked,
+            has_bookmarked
         ).join(
             User, Summary.user_id == User.id
-        ).outerjoin(
-            SummaryLike, Summary.id == SummaryLike.summary_id
-        ).outerjoin(
-            SummaryComment, Summary.id == SummaryComment.summary_id
-        ).outerjoin(
-            SummaryBookmark, Summary.id == SummaryBookmark.summary_id
-        ).filter(
+        )
+
+    def _flag_columns(self, current_user_id: Optional[int]) -> tuple:
+        """has_liked / has_bookmarked EXISTS probes for the caller (constant False for None)"""
+        if current_user_id is None:
+            return false().label('has_liked'), false().label('has_bookmarked')
+        has_liked = self.db.query(SummaryLike.id).filter(
+            SummaryLike.summary_id == Summary.id,
+            SummaryLike.user_id == current_user_id
+        ).exists()
+        has_bookmarked = self.db.query(SummaryBookmark.id).filter(
+            SummaryBookmark.summary_id == Summary.id,
+            SummaryBookmark.user_id == current_user_id
+        ).exists()
+        return has_liked.label('has_liked'), has_bookmarked.label('has_bookmarked')
+
+    def _page_version_query(self, current_user_id: int):
+        """
+        The columns of a feed page that its ETag depends on (PAGE_VERSION_FIELDS and
+        the caller's flags), without the summary bodies
+        """
+        has_liked, has_bookmarked = self._flag_columns(current_user_id)
+        return self.db.query(
+            Summary.id,
+            Summary.created_at,
+            Summary.updated_at,
+            Summary.like_count,
+            Summary.comment_count,
+            Summary.bookmark_count,
+            User.full_name.label('user_name'),
+            has_liked,
+            has_bookmarked
+        ).join(
+            User, Summary.user_id == User.id
+        )
+
+    def _page_version(self, rows: list, current_user_id: int, next_cursor: Optional[str]) -> tuple:
+        """feed_page_version of the page the version rows describe, pending toggles included"""
+        items = [row._asdict() for row in rows]
+        return feed_page_version(self._with_pending(items, current_user_id), next_cursor)
+
+    def _user_flags(self, user_id: int, summary_ids: list[int]) -> Tuple[set, set]:
+        """(liked ids, bookmarked ids) among summary_ids, in one round trip"""
+        if not summary_ids:
+            return set(), set()
+        likes = select(SummaryLike.summary_id, literal('like').label('kind')).where(
+            SummaryLike.user_id == user_id,
+            SummaryLike.summary_id.in_(summary_ids)
+        )
+        bookmarks = select(SummaryBookmark.summary_id, literal('bookmark').label('kind')).where(
+            SummaryBookmark.user_id == user_id,
+            SummaryBookmark.summary_id.in_(summary_ids)
+        )
+        liked, bookmarked = set(), set()
+        for summary_id, kind in self.db.execute(likes.union_all(bookmarks)):
+            (liked if kind == 'like' else bookmarked).add(summary_id)
+        return liked, bookmarked
+
+    def _commit_feed_change(self, position: tuple):
+        """
+        Commit a change to a published summary, dropping cached feed pages that contain it
+        here and (through a notify sent with the commit) in other workers; position is
+        (created_at, id, topic_key)
+        """
+        feed_cache.publish_invalidation(self.db, [position])
+        self.db.commit()
+        feed_cache.invalidate_summary(*position)
+
+    def get_summary_with_stats(self, summary_id: int, current_user_id: int):
+        return self._summary_stats_query(current_user_id).filter(
             Summary.id == summary_id
-        ).group_by(
-            Summary.id, User.full_name
         ).first()
 
+    def _adjust_counter(self, summary_id: int, counter, delta: int):
+        """Apply a relative counter change in the caller's transaction"""
+        self.db.query(Summary).filter(Summary.id == summary_id).update(
+            # Counter changes are not content edits, so leave updated_at alone
+            {counter: func.greatest(counter + delta, 0), Summary.updated_at: Summary.updated_at},
+            synchronize_session=False
+        )
+
+    def _adjust_topic_count(self, topic_key: str, label: str, delta: int):
+        """Upsert a topic's published count in the caller's transaction"""
+        self.db.execute(
+            insert(SummaryTopic)
+            .values(topic_key=topic_key, label=label, published_count=max(delta, 0))
+            .on_conflict_do_update(
+                index_elements=[SummaryTopic.topic_key],
+                set_={"published_count": func.greatest(SummaryTopic.published_count + delta, 0)}
+            )
+        )
+
+    def _load_topics(self) -> list[tuple]:
+        return self.db.query(
+            SummaryTopic.topic_key, SummaryTopic.label, SummaryTopic.published_count
+        ).filter(SummaryTopic.published_count > 0).all()
+
+    def get_topics(self, limit: int = 50) -> list[dict]:
+        """Most-published topics"""
+        topics = self.db.query(SummaryTopic).filter(
+            SummaryTopic.published_count > 0
+        ).order_by(
+            SummaryTopic.published_count.desc(), SummaryTopic.topic_key
+        ).limit(limit).all()
+        return [
+            {"topic": topic.topic_key, "label": topic.label, "count": topic.published_count}
+            for topic in topics
+        ]
+
+    def suggest_topics(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Prefix autocomplete over published topics, served from the in-memory trie"""
+        topic_trie.ensure_loaded(self._load_topics)
+        return topic_trie.suggest(normalize_topic(prefix) or "", limit)
+
     def create_summary(self, summary: SummaryCreate, user_id: int) -> dict:
         db_summary = Summary(
             content=summary.content,
@@ -77,36 +394,49 @@ class SummaryRepository:
 
         return self.get_summary(db_summary.id, user_id)
 
-    def get_summary(self, summary_id: int, current_user_id: int) -> dict:
-        summary = self.db.query(Summary).filter(Summary.id == summary_id).first()
-        if not summary:
+    def _get_visible_summary_row(self, summary_id: int, current_user_id: int):
+        summary_data = self.get_summary_with_stats(summary_id, current_user_id)
+        if not summary_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Summary not found"
             )
 
         # Check if user has access to this summary
+        summary = summary_data.Summary
         if not summary.is_published and summary.user_id != current_user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have access to this summary"
             )
+        return summary_data
 
-        summary_data = self.get_summary_with_stats(summary_id, current_user_id)
-        response = self._format_summary_response(summary_data)
-
-        # Get comments with user names
-        comments = self.db.query(
+    def _comment_page(self, summary_id: int, limit: int, cursor: Optional[str] = None) -> Tuple[list[dict], Optional[str]]:
+        """Oldest-first page of comments with user names, seeking on (created_at, id)"""
+        query = self.db.query(
             SummaryComment,
             User.full_name.label('user_name')
         ).join(
             User, SummaryComment.user_id == User.id
         ).filter(
             SummaryComment.summary_id == summary_id
-        ).all()
+        )
+        if cursor:
+            created_at, comment_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(SummaryComment.created_at, SummaryComment.id) > tuple_(created_at, comment_id)
+            )
+        comments = query.order_by(
+            SummaryComment.created_at, SummaryComment.id
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(comments) > limit:
+            comments = comments[:limit]
+            last = comments[-1].SummaryComment
+            next_cursor = encode_cursor(last.created_at, last.id)
 
-        # Format comments
-        response["comments"] = [
+        return [
             {
                 "id": comment.SummaryComment.id,
                 "content": comment.SummaryComment.content,
@@ -117,35 +447,241 @@ class SummaryRepository:
                 "user_name": comment.user_name
             }
             for comment in comments
-        ]
+        ], next_cursor
+
+    def get_summary_version(self, summary_id: int, current_user_id: int) -> tuple:
+        """
+        Values that change whenever get_summary's response would: one primary-key row
+        plus two index probes, with no users join and no comments. Raises like get_summary.
+        """
+        has_liked = self.db.query(SummaryLike.id).filter(
+            SummaryLike.summary_id == Summary.id,
+            SummaryLike.user_id == current_user_id
+        ).exists()
+        has_bookmarked = self.db.query(SummaryBookmark.id).filter(
+            SummaryBookmark.summary_id == Summary.id,
+            SummaryBookmark.user_id == current_user_id
+        ).exists()
+        version = self.db.query(
+            Summary.is_published,
+            Summary.user_id,
+            Summary.created_at,
+            Summary.updated_at,
+            Summary.like_count,
+            Summary.comment_count,
+            Summary.bookmark_count,
+            has_liked,
+            has_bookmarked
+        ).filter(Summary.id == summary_id).first()
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Summary not found"
+            )
+        if not version.is_published and version.user_id != current_user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this summary"
+            )
+        if settings.TOGGLE_WRITE_BEHIND_ENABLED:
+            return tuple(version) + toggle_buffer.version(summary_id, current_user_id)
+        return tuple(version)
+
+    def iter_export(self, batch_size: int) -> Iterator[list[dict]]:
+        """
+        All summaries in id order, in batches of plain dicts. Rows come from a
+        server-side cursor and skip the ORM identity map, so memory stays flat
+        regardless of table size.
+        """
+        result = self.db.execute(
+            select(*EXPORT_COLUMNS).order_by(Summary.id).execution_options(yield_per=batch_size)
+        )
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    def import_summaries(self, rows: list[tuple[int, dict]]) -> list[tuple[int, str]]:
+        """
+        Insert one batch of validated import rows (line number, SummaryImportRow dump)
+        as a single multi-row INSERT. Rows naming unknown users are skipped; if the
+        database rejects the batch it is retried row by row under SAVEPOINTs so only the
+        offending lines fail. Skipped and rejected rows are returned as (line number, error).
+        """
+        known_users = set(self.db.scalars(
+            select(User.id).where(User.id.in_({row["user_id"] for _, row in rows}))
+        ))
+        now = datetime.now(timezone.utc)
+        errors, accepted = [], []
+        for line_no, row in rows:
+            if row["user_id"] not in known_users:
+                errors.append((line_no, f"User {row['user_id']} does not exist"))
+                continue
+            topic_key = normalize_topic(row["topic"]) if row["is_published"] else None
+            accepted.append((line_no, dict(row, topic_key=topic_key, created_at=row["created_at"] or now)))
+
+        inserted = accepted
+        if accepted:
+            try:
+                self.db.execute(Summary.__table__.insert(), [value for _, value in accepted])
+            except (IntegrityError, DataError):
+                self.db.rollback()
+                inserted = []
+                for line_no, value in accepted:
+                    try:
+                        with self.db.begin_nested():
+                            self.db.execute(Summary.__table__.insert(), [value])
+                    except (IntegrityError, DataError) as e:
+                        errors.append((line_no, str(e.orig).splitlines()[0]))
+                        continue
+                    inserted.append((line_no, value))
+                errors.sort()
+
+        topic_counts, topic_labels = {}, {}
+        for _, value in inserted:
+            topic_key = value["topic_key"]
+            if topic_key:
+                topic_counts[topic_key] = topic_counts.get(topic_key, 0) + 1
+                topic_labels.setdefault(topic_key, value["topic"].strip())
+        for topic_key, count in topic_counts.items():
+            self._adjust_topic_count(topic_key, topic_labels[topic_key], count)
+        # Imported rows can land anywhere in the feed's created_at order
+        published = any(value["is_published"] for _, value in inserted)
+        if published:
+            feed_cache.publish_invalidation(self.db)
+        self.db.commit()
+
+        for topic_key, count in topic_counts.items():
+            topic_trie.adjust(topic_key, topic_labels[topic_key], count)
+        if published:
+            feed_cache.clear()
+        return errors
 
+    def get_summary(self, summary_id: int, current_user_id: int) -> dict:
+        summary_data = self._get_visible_summary_row(summary_id, current_user_id)
+        response = self._format_summary_response(summary_data)
+        self._with_pending([response], current_user_id)
+
+        # Embed only the first comments; comment_count is the total and the rest
+        # are paged through get_comments starting at comments_next_cursor
+        response["comments"], response["comments_next_cursor"] = self._comment_page(
+            summary_id, settings.SUMMARY_DETAIL_COMMENT_LIMIT
+        )
         return response
 
-    def get_summaries(self, current_user_id: int, published_only: bool = False, private_only: bool = False) -> list[dict]:
-        base_query = self.db.query(
-            Summary,
-            User.full_name.label('user_name'),
-            func.count(SummaryLike.id).label('like_count'),
-            func.count(SummaryComment.id).label('comment_count'),
-            func.count(SummaryBookmark.id).label('bookmark_count'),
-            func.bool_or(and_(
-                SummaryLike.user_id == current_user_id,
-                SummaryLike.summary_id == Summary.id
-            )).label('has_liked'),
-            func.bool_or(and_(
-                SummaryBookmark.user_id == current_user_id,
-                SummaryBookmark.summary_id == Summary.id
-            )).label('has_bookmarked')
-        ).join(
-            User, Summary.user_id == User.id
-        ).outerjoin(
-            SummaryLike, Summary.id == SummaryLike.summary_id
-        ).outerjoin(
-            SummaryComment, Summary.id == SummaryComment.summary_id
-        ).outerjoin(
-            SummaryBookmark, Summary.id == SummaryBookmark.summary_id
+    def get_comments(
+        self,
+        summary_id: int,
+        current_user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[list[dict], Optional[str]]:
+        summary = self.db.query(Summary.is_published, Summary.user_id).filter(Summary.id == summary_id).first()
+        if not summary:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Summary not found"
+            )
+        if not summary.is_published and summary.user_id != current_user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this summary"
+            )
+        return self._comment_page(summary_id, limit, cursor)
+
+    def get_summaries(
+        self,
+        current_user_id: int,
+        published_only: bool = False,
+        private_only: bool = False,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        topic: Optional[str] = None
+    ) -> Tuple[list[dict], Optional[str]]:
+        """Newest-first page of summaries and the cursor for the next page (None on the last page)"""
+        if published_only and settings.FEED_CACHE_ENABLED:
+            items, next_cursor = self._get_cached_published_page(current_user_id, limit, cursor, topic)
+        else:
+            items, next_cursor = self._summary_page(current_user_id, published_only, private_only, limit, cursor, topic)
+        return self._with_pending(items, current_user_id), next_cursor
+
+    def _get_cached_published_page(
+        self,
+        current_user_id: int,
+        limit: int,
+        cursor: Optional[str],
+        topic: Optional[str]
+    ) -> Tuple[list[dict], Optional[str]]:
+        """Published feed page from the shared cache, with the caller's flags overlaid"""
+        topic_key = normalize_topic(topic) if topic is not None else None
+        key = (topic_key, cursor, limit)
+        page, token = feed_cache.get(key)
+        if page is not None:
+            items, next_cursor = page.items, page.next_cursor
+        else:
+            upper = decode_cursor(cursor) if cursor else None
+            items, next_cursor = self._summary_page(None, True, False, limit, cursor, topic)
+            lower = (items[-1]["created_at"], items[-1]["id"]) if next_cursor else None
+            feed_cache.put(key, items, next_cursor, upper, lower, token)
+
+        liked, bookmarked = self._user_flags(current_user_id, [item["id"] for item in items])
+        return [
+            dict(item, has_liked=item["id"] in liked, has_bookmarked=item["id"] in bookmarked)
+            for item in items
+        ], next_cursor
+
+    def _summary_page(
+        self,
+        current_user_id: Optional[int],
+        published_only: bool,
+        private_only: bool,
+        limit: int,
+        cursor: Optional[str],
+        topic: Optional[str]
+    ) -> Tuple[list[dict], Optional[str]]:
+        base_query = self._filter_feed(
+            self._summary_stats_query(current_user_id), current_user_id, published_only, private_only, cursor, topic
         )
+        summaries = base_query.order_by(
+            Summary.created_at.desc(), Summary.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(summaries) > limit:
+            summaries = summaries[:limit]
+            last = summaries[-1].Summary
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return [self._format_summary_response(summary_data) for summary_data in summaries], next_cursor
 
+    def get_summaries_version(
+        self,
+        current_user_id: int,
+        published_only: bool = False,
+        private_only: bool = False,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        topic: Optional[str] = None
+    ) -> tuple:
+        """Values that change whenever get_summaries' page would, read without the summary bodies"""
+        rows = self._filter_feed(
+            self._page_version_query(current_user_id), current_user_id, published_only, private_only, cursor, topic
+        ).order_by(
+            Summary.created_at.desc(), Summary.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return self._page_version(rows, current_user_id, next_cursor)
+
+    def _filter_feed(
+        self,
+        base_query,
+        current_user_id: Optional[int],
+        published_only: bool,
+        private_only: bool,
+        cursor: Optional[str],
+        topic: Optional[str]
+    ):
         if published_only:
             base_query = base_query.filter(Summary.is_published == True)
         elif private_only:
@@ -160,8 +696,69 @@ class SummaryRepository:
                 )
             )
 
-        summaries = base_query.group_by(Summary.id, User.full_name).all()
-        return [self._format_summary_response(summary_data) for summary_data in summaries]
+        if topic is not None:
+            base_query = base_query.filter(Summary.topic_key == normalize_topic(topic))
+
+        if cursor:
+            # Keyset seek: cost depends on the page size, not on how deep the cursor is
+            created_at, summary_id = decode_cursor(cursor)
+            base_query = base_query.filter(
+                tuple_(Summary.created_at, Summary.id) < tuple_(created_at, summary_id)
+            )
+        return base_query
+
+    def search_summaries(
+        self,
+        current_user_id: int,
+        q: str,
+        config: str = "indonesian",
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[list[dict], Optional[str]]:
+        """Ranked full-text search over published summaries with highlighted content snippets"""
+        regconfig = cast(literal(config), REGCONFIG)
+        ts_query = func.websearch_to_tsquery(regconfig, q)
+        vector = Summary.search_vector_simple if config == "simple" else Summary.search_vector_indonesian
+        # ts_rank_cd is float4; rank in float8 so the cursor round-trips the exact value
+        # it is compared against
+        rank = cast(func.ts_rank_cd(vector, ts_query), DOUBLE_PRECISION)
+
+        # Rank and page over ids first (GIN match), then build snippets for the page only
+        matches = select(Summary.id, rank.label("rank")).where(
+            Summary.is_published == True,
+            vector.op("@@")(ts_query)
+        )
+        if cursor:
+            last_rank, last_id = decode_rank_cursor(cursor)
+            matches = matches.where(tuple_(rank, Summary.id) < tuple_(cast(last_rank, DOUBLE_PRECISION), last_id))
+        page = matches.order_by(rank.desc(), Summary.id.desc()).limit(limit + 1).subquery()
+
+        rows = self._summary_stats_query(current_user_id).add_columns(
+            page.c.rank,
+            func.ts_headline(
+                regconfig,
+                Summary.content,
+                ts_query,
+                "MaxFragments=2, MaxWords=30, MinWords=10, StartSel=<mark>, StopSel=</mark>"
+            ).label("snippet")
+        ).join(
+            page, page.c.id == Summary.id
+        ).order_by(
+            page.c.rank.desc(), Summary.id.desc()
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].Summary.id)
+
+        results = []
+        for row in rows:
+            result = self._format_summary_response(tuple(row)[:4])
+            result["rank"] = row.rank
+            result["snippet"] = row.snippet
+            results.append(result)
+        return self._with_pending(results, current_user_id), next_cursor
 
     def update_summary(self, summary_id: int, summary_update: SummaryUpdate, user_id: int) -> dict:
         summary = self.db.query(Summary).filter(Summary.id == summary_id).first()
@@ -182,7 +779,10 @@ class SummaryRepository:
         for field, value in update_data.items():
             setattr(summary, field, value)
 
-        self.db.commit()
+        if summary.is_published:
+            self._commit_feed_change((summary.created_at, summary.id, summary.topic_key))
+        else:
+            self.db.commit()
         self.db.refresh(summary)
         return self.get_summary(summary_id, user_id)
 
@@ -211,7 +811,12 @@ class SummaryRepository:
             setattr(summary, field, value)
         
         summary.is_published = True
-        self.db.commit()
+        summary.topic_key = normalize_topic(summary.topic)
+        if summary.topic_key:
+            self._adjust_topic_count(summary.topic_key, summary.topic.strip(), 1)
+        self._commit_feed_change((summary.created_at, summary.id, summary.topic_key))
+        if summary.topic_key:
+            topic_trie.adjust(summary.topic_key, summary.topic.strip(), 1)
         self.db.refresh(summary)
         return self.get_summary(summary_id, user_id)
 
@@ -229,8 +834,16 @@ class SummaryRepository:
                 detail="You can only delete your own summaries"
             )
 
+        topic_key = summary.topic_key if summary.is_published else None
+        if topic_key:
+            self._adjust_topic_count(topic_key, summary.topic, -1)
         self.db.delete(summary)
-        self.db.commit()
+        if summary.is_published:
+            self._commit_feed_change((summary.created_at, summary.id, topic_key))
+        else:
+            self.db.commit()
+        if topic_key:
+            topic_trie.adjust(topic_key, summary.topic, -1)
         return True
 
     def create_comment(self, summary_id: int, comment: CommentCreate, user_id: int) -> dict:
@@ -253,7 +866,8 @@ class SummaryRepository:
             user_id=user_id
         )
         self.db.add(db_comment)
-        self.db.commit()
+        self._adjust_counter(summary_id, Summary.comment_count, 1)
+        self._commit_feed_change((summary.created_at, summary.id, summary.topic_key))
         self.db.refresh(db_comment)
 
         # Get user name for the comment
@@ -269,60 +883,195 @@ class SummaryRepository:
             "user_name": user_name
         }
 
-    def toggle_like(self, summary_id: int, user_id: int) -> bool:
-        summary = self.db.query(Summary).filter(Summary.id == summary_id).first()
-        if not summary:
+    def _toggle(self, statement, summary_id: int, user_id: int, action: str) -> bool:
+        """Run a toggle statement; returns True when the row exists afterwards"""
+        if settings.TOGGLE_WRITE_BEHIND_ENABLED and toggle_buffer.accepting(action, user_id, summary_id):
+            return self._buffer_toggle(summary_id, user_id, action)
+
+        row = self.db.execute(statement, {"summary_id": summary_id, "user_id": user_id}).first()
+        if row is None:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Summary not found"
             )
-
-        if not summary.is_published:
+        if not row.is_published:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot like unpublished summaries"
+                detail=f"Cannot {action} unpublished summaries"
             )
-
-        existing_like = self.db.query(SummaryLike).filter(
-            SummaryLike.summary_id == summary_id,
-            SummaryLike.user_id == user_id
-        ).first()
-
-        if existing_like:
-            self.db.delete(existing_like)
-            self.db.commit()
-            return False
+        if row.counted:
+            self._commit_feed_change((row.created_at, summary_id, row.topic_key))
         else:
-            new_like = SummaryLike(summary_id=summary_id, user_id=user_id)
-            self.db.add(new_like)
             self.db.commit()
-            return True
+        # Not removed means we inserted it, or a concurrent request of the same user just did
+        return not row.removed
 
-    def toggle_bookmark(self, summary_id: int, user_id: int) -> bool:
-        summary = self.db.query(Summary).filter(Summary.id == summary_id).first()
-        if not summary:
+    def _buffer_toggle(self, summary_id: int, user_id: int, action: str) -> bool:
+        """Write-behind toggle: one read for the publish check and stored state, no write transaction"""
+        model = SummaryLike if action == "like" else SummaryBookmark
+        persisted = self.db.query(model.id).filter(
+            model.summary_id == Summary.id,
+            model.user_id == user_id
+        ).exists()
+        row = self.db.query(Summary.is_published, persisted).filter(Summary.id == summary_id).first()
+        self.db.rollback()
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Summary not found"
             )
-
-        if not summary.is_published:
+        if not row[0]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot bookmark unpublished summaries"
+                detail=f"Cannot {action} unpublished summaries"
             )
+        return toggle_buffer.record(action, user_id, summary_id, row[1])
 
-        existing_bookmark = self.db.query(SummaryBookmark).filter(
-            SummaryBookmark.summary_id == summary_id,
-            SummaryBookmark.user_id == user_id
-        ).first()
+    def apply_toggles(self, batch: dict) -> list[tuple]:
+        """
+        Persist a drained write-behind batch ({kind: [(user_id, summary_id, desired)]})
+        in one transaction; returns (created_at, id, topic_key) of summaries whose counters moved
+        """
+        changed = []
+        for kind, entries in batch.items():
+            user_ids, summary_ids, states = (list(column) for column in zip(*entries))
+            rows = self.db.execute(
+                APPLY_TOGGLES_SQL[kind],
+                {"user_ids": user_ids, "summary_ids": summary_ids, "states": states}
+            ).all()
+            changed.extend((row.created_at, row.id, row.topic_key) for row in rows)
+        # Other workers drop their pages once this commits; ToggleFlushService drops ours
+        feed_cache.publish_invalidation(self.db, changed)
+        self.db.commit()
+        return changed
 
-        if existing_bookmark:
-            self.db.delete(existing_bookmark)
-            self.db.commit()
-            return False
-        else:
-            new_bookmark = SummaryBookmark(summary_id=summary_id, user_id=user_id)
-            self.db.add(new_bookmark)
+    def _with_pending(self, items: list[dict], current_user_id: int) -> list[dict]:
+        """Overlay unflushed write-behind toggles on formatted summaries"""
+        if settings.TOGGLE_WRITE_BEHIND_ENABLED:
+            for item in items:
+                toggle_buffer.overlay(item, current_user_id)
+        return items
+
+    def toggle_like(self, summary_id: int, user_id: int) -> bool:
+        return self._toggle(TOGGLE_LIKE_SQL, summary_id, user_id, "like")
+
+    def toggle_bookmark(self, summary_id: int, user_id: int) -> bool:
+        return self._toggle(TOGGLE_BOOKMARK_SQL, summary_id, user_id, "bookmark")
+
+    def reconcile_counters(self, batch_size: int = 1000) -> int:
+        """Recompute stored counters from the child tables; returns the number of summaries fixed"""
+        like_count = select(func.count(SummaryLike.id)).where(
+            SummaryLike.summary_id == Summary.id
+        ).scalar_subquery()
+        comment_count = select(func.count(SummaryComment.id)).where(
+            SummaryComment.summary_id == Summary.id
+        ).scalar_subquery()
+        bookmark_count = select(func.count(SummaryBookmark.id)).where(
+            SummaryBookmark.summary_id == Summary.id
+        ).scalar_subquery()
+
+        max_id = self.db.query(func.max(Summary.id)).scalar() or 0
+        fixed = 0
+        # Walk id ranges in short transactions so row locks are held briefly
+        for start in range(0, max_id + 1, batch_size):
+            result = self.db.execute(
+                update(Summary)
+                .where(Summary.id >= start, Summary.id < start + batch_size)
+                .where(or_(
+                    Summary.like_count != like_count,
+                    Summary.comment_count != comment_count,
+                    Summary.bookmark_count != bookmark_count
+                ))
+                .values(
+                    like_count=like_count,
+                    comment_count=comment_count,
+                    bookmark_count=bookmark_count,
+                    updated_at=Summary.updated_at
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                feed_cache.publish_invalidation(self.db)
             self.db.commit()
-            return True 
\ No newline at end of file
+            fixed += result.rowcount
+        if fixed:
+            feed_cache.clear()
+        return fixed
+
+    def get_trending(
+        self,
+        current_user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[list[dict], Optional[str]]:
+        """Page of published summaries by precomputed trending score"""
+        rows = self._trending_page(self._summary_stats_query(current_user_id), limit, cursor)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].score, rows[-1].Summary.id)
+        return self._with_pending(
+            [self._format_summary_response(tuple(row)[:4]) for row in rows], current_user_id
+        ), next_cursor
+
+    def get_trending_version(self, current_user_id: int, limit: int = 20, cursor: Optional[str] = None) -> tuple:
+        """Values that change whenever get_trending's page would, read without the summary bodies"""
+        rows = self._trending_page(self._page_version_query(current_user_id), limit, cursor)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].score, rows[-1].id)
+        return self._page_version(rows, current_user_id, next_cursor)
+
+    def _trending_page(self, query, limit: int, cursor: Optional[str]) -> list:
+        """Up to limit + 1 rows of query (plus the score) in trending order after cursor"""
+        query = query.add_columns(
+            SummaryTrending.score
+        ).join(
+            SummaryTrending, SummaryTrending.summary_id == Summary.id
+        ).filter(
+            Summary.is_published == True
+        )
+        if cursor:
+            last_score, last_id = decode_rank_cursor(cursor)
+            query = query.filter(
+                tuple_(SummaryTrending.score, SummaryTrending.summary_id) < tuple_(last_score, last_id)
+            )
+        return query.order_by(
+            SummaryTrending.score.desc(), SummaryTrending.summary_id.desc()
+        ).limit(limit + 1).all()
+
+    def mark_user_interactions(self, user_id: int):
+        """Mark what a user liked, bookmarked or commented on in the window dirty, in the caller's transaction"""
+        window_start = datetime.now(timezone.utc) - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        self.db.execute(MARK_USER_INTERACTIONS_SQL, {"user_id": user_id, "window_start": window_start})
+
+    def refresh_trending(self, since: Optional[datetime]) -> Optional[datetime]:
+        """
+        Rescore summaries with interactions since `since` (or the whole window when None),
+        including those marked dirty by removed likes, bookmarks and comments, and drop
+        rows left without interactions in the window. Returns the database time the run
+        started at, or None if another worker is already refreshing.
+        """
+        if not self.db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": TRENDING_LOCK_KEY}).scalar():
+            self.db.rollback()
+            return None
+
+        started_at = self.db.execute(text("SELECT now()")).scalar()
+        window_start = started_at - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+        counts = self.db.execute(REFRESH_TRENDING_SQL, {
+            "since": max(since, window_start) if since else window_start,
+            "window_start": window_start,
+            "epoch": TRENDING_EPOCH,
+            "half_life_seconds": settings.TRENDING_HALF_LIFE_HOURS * 3600,
+            "like_weight": settings.TRENDING_LIKE_WEIGHT,
+            "comment_weight": settings.TRENDING_COMMENT_WEIGHT,
+            "bookmark_weight": settings.TRENDING_BOOKMARK_WEIGHT,
+        }).one()
+        self.db.commit()
+        logger.info(f"Trending refresh rescored {counts.rescored} summaries, pruned {counts.pruned}")
+        return started_at
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.token_model import ConsumedToken
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class RecentTokenSet:
+    """Bounded in-memory set of recently consumed token digests.
+
+    Lets replays of a token redeemed by this worker be rejected without a DB query.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, datetime]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, token_hash: bytes) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(token_hash)
+            if expires_at is None:
+                return False
+            if expires_at <= datetime.now(timezone.utc):
+                del self._entries[token_hash]
+                return False
+            return True
+
+    def add(self, token_hash: bytes, expires_at: datetime):
+        with self._lock:
+            self._entries[token_hash] = expires_at
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+recent_tokens = RecentTokenSet(settings.CONSUMED_TOKEN_RECENT_SIZE)
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+def hash_token_id(token_id: str) -> bytes:
+    return hashlib.sha256(token_id.encode("utf-8")).digest()
+
+def recently_consumed(token_id: str) -> bool:
+    """Whether this worker has seen the token redeemed; a memory lookup, no query"""
+    return hash_token_id(token_id) in recent_tokens
+
+class TokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def consume(self, token_id: str, expires_at: datetime) -> bool:
+        """
+        Record a single-use token as redeemed in the current transaction.
+        Returns False if it was already redeemed. Call remember() after commit.
+        """
+        token_hash = hash_token_id(token_id)
+        if token_hash in recent_tokens:
+            return False
+
+        # Check and record in one statement; a concurrent redeem loses on the primary key
+        inserted = self.db.execute(
+            insert(ConsumedToken)
+            .values(token_hash=token_hash, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[ConsumedToken.token_hash])
+            .returning(ConsumedToken.token_hash)
+        ).first()
+        if inserted is None:
+            recent_tokens.add(token_hash, expires_at)
+            return False
+        return True
+
+    def remember(self, token_id: str, expires_at: datetime):
+        """Add a committed redemption to the in-memory recent set and purge if due"""
+        recent_tokens.add(hash_token_id(token_id), expires_at)
+        try:
+            self.purge_expired_if_due()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Failed to purge expired tokens: {str(e)}")
+
+    def purge_expired(self, batch_size: int = None) -> int:
+        """Delete expired redemptions in small batches so the table stays bounded"""
+        batch_size = batch_size or settings.CONSUMED_TOKEN_PURGE_BATCH
+        purged = 0
+        while True:
+            expired = (
+                select(ConsumedToken.token_hash)
+                .where(ConsumedToken.expires_at < datetime.now(timezone.utc))
+                .limit(batch_size)
+            )
+            result = self.db.execute(
+                delete(ConsumedToken).where(ConsumedToken.token_hash.in_(expired))
+            )
+            self.db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
+
+    def purge_expired_if_due(self) -> int:
+        global _last_purge
+        with _purge_lock:
+            now = time.monotonic()
+            if now - _last_purge < settings.CONSUMED_TOKEN_PURGE_INTERVAL_SECONDS:
+                return 0
+            _last_purge = now
+        return self.purge_expired()
@@ -1,9 +1,62 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, selectinload, raiseload
+from sqlalchemy import and_, or_, select, update, cast, func, literal_column, Integer, Text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 from app.models.translation_model import Translation, TranslationOrder, TranslationReview
+from app.core.gazetteer import geocode
+from app.core.geo_index import translator_index
+from app.core.page_counts import CountMode, count_cache, paginate
 from app.api.v1.schemas.translation_schemas import TranslatorCreate, TranslatorUpdate, TranslationOrderCreate, TranslationReviewCreate, TranslationReviewUpdate
 from fastapi import HTTPException, status
 from typing import List, Tuple, Optional
+from datetime import datetime, timezone
+
+# Loader strategy per use case. Pages of orders select-in the many-to-one translator
+# and user (each distinct row once per page, instead of repeated on every joined
+# order row) and join the one-to-one review; raiseload makes any relationship left
+# out here fail loudly instead of lazy-loading once per order. A single order joins
+# everything in one round trip.
+ORDER_PAGE_OPTIONS = (
+    selectinload(TranslationOrder.translator),
+    selectinload(TranslationOrder.user),
+    joinedload(TranslationOrder.review),
+    raiseload("*")
+)
+ORDER_DETAIL_OPTIONS = (
+    joinedload(TranslationOrder.translator),
+    joinedload(TranslationOrder.user),
+    joinedload(TranslationOrder.review)
+)
+
+# Orders holding their slot; cancelled and completed ones free it
+ACTIVE_ORDER_STATUSES = ("pending", "confirmed")
+SLOT_CONFLICT_CONSTRAINT = "ex_translation_orders_translator_slot"
+
+def slot_overlaps(slot_start: datetime, slot_end: datetime):
+    """Active orders whose [slot_start, slot_end) overlaps the given range (served by the exclusion constraint's GiST index)"""
+    return and_(
+        TranslationOrder.status.in_(ACTIVE_ORDER_STATUSES),
+        func.tsrange(TranslationOrder.slot_start, TranslationOrder.slot_end, literal_column("'[)'")).op("&&")(
+            func.tsrange(slot_start, slot_end, literal_column("'[)'"))
+        )
+    )
+
+# Column-only projection behind the compact order view (no nested objects)
+COMPACT_ORDER_COLUMNS = (
+    TranslationOrder.id, TranslationOrder.tanggal, TranslationOrder.time_slot,
+    TranslationOrder.description, TranslationOrder.status, TranslationOrder.created_at,
+    TranslationOrder.updated_at, TranslationOrder.user_id, TranslationOrder.translator_id
+)
+
+# What a translator list entry's ETag depends on; review aggregates change without touching updated_at
+TRANSLATOR_VERSION_COLUMNS = (Translation.id, Translation.updated_at, Translation.review_count, Translation.rating_sum)
+
+def translator_page_version(translators: List[Translation], total: int) -> tuple:
+    """Version of a loaded translator page; get_translators_version reads the same values"""
+    return total, tuple(
+        tuple(getattr(translator, column.key) for column in TRANSLATOR_VERSION_COLUMNS)
+        for translator in translators
+    )
 
 class TranslationRepository:
     def __init__(self, db: Session):
@@ -17,75 +70,207 @@ class TranslationRepository:
             profile_pic=str(translator.profile_pic) if translator.profile_pic else None,
             user_id=user_id
         )
+        self._locate(db_translator)
         self.db.add(db_translator)
         self.db.commit()
         self.db.refresh(db_translator)
+        self._index(db_translator)
+        count_cache.invalidate("translations")
         return db_translator
 
+    def _locate(self, translator: Translation):
+        """Geocode alamat once, when it is set or changed; misses are recorded too"""
+        translator.latitude, translator.longitude = geocode(translator.alamat) or (None, None)
+        translator.geocoded_at = func.now()
+
+    def _index(self, translator: Translation):
+        """Keep the nearby index in step with one translator's committed state"""
+        if translator.availability and translator.latitude is not None:
+            translator_index.upsert(translator.id, translator.latitude, translator.longitude)
+        else:
+            translator_index.remove(translator.id)
+
+    def _load_locations(self) -> List[Tuple[int, float, float]]:
+        """(id, lat, lon) of every available translator with coordinates"""
+        rows = (
+            self.db.query(Translation.id, Translation.latitude, Translation.longitude)
+            .filter(Translation.availability == True, Translation.latitude.isnot(None))
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
+    def geocode_pending(self, batch_size: int = 500) -> int:
+        """
+        Geocode translators never geocoded (rows written before geocoding existed or by
+        other tools), in short transactions; returns how many were located
+        """
+        located = 0
+        while True:
+            rows = (
+                self.db.query(Translation.id, Translation.alamat)
+                .filter(Translation.geocoded_at.is_(None))
+                .order_by(Translation.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return located
+            mappings = []
+            for row in rows:
+                latitude, longitude = geocode(row.alamat) or (None, None)
+                located += latitude is not None
+                mappings.append({
+                    "id": row.id, "latitude": latitude, "longitude": longitude,
+                    "geocoded_at": datetime.now(timezone.utc)
+                })
+            self.db.bulk_update_mappings(Translation, mappings)
+            self.db.commit()
+
+    def get_nearby_translators(self, lat: float, lon: float, radius_km: float, limit: int) -> List[Tuple[Translation, float]]:
+        """Available translators within radius_km, nearest first, with their distance"""
+        translator_index.ensure_loaded(self._load_locations)
+        hits = translator_index.nearby(lat, lon, radius_km, limit)
+        if not hits:
+            return []
+        translators = {
+            translator.id: translator
+            for translator in self.db.query(Translation).filter(
+                Translation.id.in_([translator_id for translator_id, _ in hits]),
+                Translation.availability == True
+            )
+        }
+        return [(translators[translator_id], distance) for translator_id, distance in hits if translator_id in translators]
+
     def get_translator(self, translator_id: int) -> Translation:
         return self.db.query(Translation).filter(Translation.id == translator_id).first()
 
     def get_translator_by_user_id(self, user_id: int) -> Translation:
         return self.db.query(Translation).filter(Translation.user_id == user_id).first()
 
-    def get_translators(self, skip: int = 0, limit: int = 10) -> Tuple[List[Translation], int]:
-        total = self.db.query(Translation).count()
-        translators = self.db.query(Translation).offset(skip).limit(limit).all()
-        return translators, total
+    def _sort_translators(self, query, sort: str):
+        if sort == "rating":
+            # Served by ix_translations_rating; unrated translators come last
+            return query.order_by(
+                Translation.rating_average.desc().nulls_last(), Translation.review_count.desc(), Translation.id
+            )
+        # A total order, so the version query and the page select the same rows
+        return query.order_by(Translation.id)
+
+    def get_translators(
+        self, skip: int = 0, limit: int = 10, sort: str = "default", count_mode: CountMode = "exact"
+    ) -> Tuple[List[Translation], int]:
+        query = self._sort_translators(self.db.query(Translation), sort)
+        return paginate(query, skip, limit, count_mode, scope="translations")
+
+    def get_translators_version(
+        self, skip: int = 0, limit: int = 10, sort: str = "default", count_mode: CountMode = "exact"
+    ) -> tuple:
+        """
+        Values that change whenever the get_translators page would: the total plus each
+        listed translator's id, updated_at and review aggregates, without loading profiles
+        """
+        query = self._sort_translators(self.db.query(*TRANSLATOR_VERSION_COLUMNS), sort)
+        rows, total = paginate(query, skip, limit, count_mode, scope="translations")
+        return total, tuple(tuple(row.values()) for row in rows)
 
     def update_translator(self, translator_id: int, translator_update: TranslatorUpdate) -> Translation:
         db_translator = self.get_translator(translator_id)
         if not db_translator:
             raise HTTPException(status_code=404, detail="Translator not found")
 
+        previous_alamat = db_translator.alamat
         for field, value in translator_update.model_dump().items():
             if field == "profile_pic" and value:
                 value = str(value)
             setattr(db_translator, field, value)
+        if db_translator.alamat != previous_alamat:
+            self._locate(db_translator)
 
         self.db.commit()
         self.db.refresh(db_translator)
+        self._index(db_translator)
         return db_translator
 
-    def create_order(self, order: TranslationOrderCreate, translator_id: int, user_id: int) -> TranslationOrder:
+    def _order_query(self):
+        # Orders are serialized with their translator, user and review; load them up front
+        # so serialization never lazy-loads (which also cannot happen on an async session)
+        return self.db.query(TranslationOrder).options(*ORDER_DETAIL_OPTIONS)
+
+    def _order_page(self, criterion, skip: int, limit: int, compact: bool, count_mode: CountMode, key) -> Tuple[list, int]:
+        """A page of orders plus the total: full ORM rows, or plain dicts when compact"""
+        if compact:
+            query = self.db.query(*COMPACT_ORDER_COLUMNS)
+        else:
+            query = self.db.query(TranslationOrder).options(*ORDER_PAGE_OPTIONS)
+        return paginate(query.filter(criterion), skip, limit, count_mode, scope="translation_orders", key=key)
+
+    def _commit_booking(self):
+        """Commit an order change; an overlapping active booking becomes a 409"""
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if SLOT_CONFLICT_CONSTRAINT in str(e.orig):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Translator is already booked for an overlapping time slot"
+                )
+            raise
+
+    def create_order(
+        self,
+        order: TranslationOrderCreate,
+        translator_id: int,
+        user_id: int,
+        slot_start: datetime,
+        slot_end: datetime
+    ) -> TranslationOrder:
         # Create order with time_slot value directly from request
         db_order = TranslationOrder(
             translator_id=translator_id,
             user_id=user_id,
             tanggal=order.tanggal,
             time_slot=order.time_slot,  # Use the time_slot value directly
+            slot_start=slot_start,
+            slot_end=slot_end,
             description=order.description,
             status="pending"  # Use string directly without enum conversion
         )
         self.db.add(db_order)
-        self.db.commit()
-        self.db.refresh(db_order)
-        return db_order
+        # The exclusion constraint is the conflict check: one index probe, race-free
+        self._commit_booking()
+        count_cache.invalidate("translation_orders")
+        return self.get_order(db_order.id)
 
-    def get_user_orders(self, user_id: int, skip: int = 0, limit: int = 10) -> Tuple[List[TranslationOrder], int]:
-        total = self.db.query(TranslationOrder).filter(TranslationOrder.user_id == user_id).count()
-        orders = (
-            self.db.query(TranslationOrder)
-            .filter(TranslationOrder.user_id == user_id)
+    def get_available_translators(self, slot_start: datetime, slot_end: datetime, skip: int = 0, limit: int = 50) -> List[Translation]:
+        """Available translators with no active booking overlapping the range, in one query"""
+        booked = select(TranslationOrder.id).where(
+            TranslationOrder.translator_id == Translation.id,
+            slot_overlaps(slot_start, slot_end)
+        ).exists()
+        return (
+            self.db.query(Translation)
+            .filter(Translation.availability == True, ~booked)
+            .order_by(Translation.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
-        return orders, total
 
-    def get_translator_orders(self, translator_id: int, skip: int = 0, limit: int = 10) -> Tuple[List[TranslationOrder], int]:
-        total = self.db.query(TranslationOrder).filter(TranslationOrder.translator_id == translator_id).count()
-        orders = (
-            self.db.query(TranslationOrder)
-            .filter(TranslationOrder.translator_id == translator_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def get_user_orders(
+        self, user_id: int, skip: int = 0, limit: int = 10, compact: bool = False, count_mode: CountMode = "exact"
+    ) -> Tuple[list, int]:
+        return self._order_page(TranslationOrder.user_id == user_id, skip, limit, compact, count_mode, ("user", user_id))
+
+    def get_translator_orders(
+        self, translator_id: int, skip: int = 0, limit: int = 10, compact: bool = False, count_mode: CountMode = "exact"
+    ) -> Tuple[list, int]:
+        return self._order_page(
+            TranslationOrder.translator_id == translator_id, skip, limit, compact, count_mode, ("translator", translator_id)
         )
-        return orders, total
 
     def get_order(self, order_id: int) -> TranslationOrder:
-        return self.db.query(TranslationOrder).filter(TranslationOrder.id == order_id).first()
+        return self._order_query().filter(TranslationOrder.id == order_id).first()
 
     def update_order_status(self, order_id: int, status: str, user_id: int) -> TranslationOrder:
         order = self.get_order(order_id)
@@ -98,9 +283,9 @@ class TranslationRepository:
             raise HTTPException(status_code=403, detail="Not authorized to update this order")
 
         order.status = status
-        self.db.commit()
-        self.db.refresh(order)
-        return order
+        # Reactivating a cancelled order can collide with a booking made since
+        self._commit_booking()
+        return self.get_order(order_id)
 
     def get_active_orders_count(self, translator_id: int) -> int:
         """Get count of active orders (pending or confirmed) for a translator"""
@@ -108,7 +293,7 @@ class TranslationRepository:
             self.db.query(TranslationOrder)
             .filter(
                 TranslationOrder.translator_id == translator_id,
-                TranslationOrder.status.in_(["pending", "confirmed"])
+                TranslationOrder.status.in_(ACTIVE_ORDER_STATUSES)
             )
             .count()
         )
@@ -121,28 +306,101 @@ class TranslationRepository:
         
         self.db.delete(translator)
         self.db.commit()
+        translator_index.remove(translator_id)
+        count_cache.invalidate("translations")
+        count_cache.invalidate("translation_orders")
 
-    def create_review(self, order_id: int, user_id: int, review: TranslationReviewCreate) -> TranslationReview:
-        """Create a new review"""
-        db_review = TranslationReview(
-            order_id=order_id,
-            user_id=user_id,
-            rating=review.rating,
-            description=review.description
+    def _shift_ratings(self, translator_id, removed: List[int], added: List[int]):
+        """Move one translator's aggregates by the given ratings with one relative UPDATE"""
+        values = {
+            Translation.review_count: Translation.review_count + (len(added) - len(removed)),
+            Translation.rating_sum: Translation.rating_sum + (sum(added) - sum(removed)),
+            # Aggregate changes are not profile edits, so leave updated_at alone
+            Translation.updated_at: Translation.updated_at
+        }
+        for rating in set(removed) | set(added):
+            column = getattr(Translation, f"rating_count_{rating}")
+            values[column] = column + (added.count(rating) - removed.count(rating))
+        self.db.execute(
+            update(Translation)
+            .where(Translation.id == translator_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _adjust_rating(self, order_id: int, removed: Optional[int], added: Optional[int]):
+        """
+        Move the reviewed translator's aggregates from one rating to another (None for
+        no review) in the caller's transaction
+        """
+        if removed == added:
+            return
+        translator_id = select(TranslationOrder.translator_id).where(TranslationOrder.id == order_id).scalar_subquery()
+        self._shift_ratings(
+            translator_id,
+            [removed] if removed is not None else [],
+            [added] if added is not None else []
+        )
+
+    def discount_user_reviews(self, user_id: int):
+        """
+        Take the reviews that deleting user_id cascades away (written by them or on
+        their orders) out of the translators' aggregates, in the caller's transaction
+        """
+        rows = (
+            self.db.query(TranslationOrder.translator_id, TranslationReview.rating)
+            .join(TranslationReview.order)
+            .filter(or_(TranslationReview.user_id == user_id, TranslationOrder.user_id == user_id))
+            .with_for_update(of=TranslationReview)
+            .all()
+        )
+        removed = {}
+        for translator_id, rating in rows:
+            removed.setdefault(translator_id, []).append(rating)
+        for translator_id, ratings in removed.items():
+            self._shift_ratings(translator_id, ratings, [])
+
+    def create_review(self, order_id: int, user_id: int, review: TranslationReviewCreate) -> Optional[TranslationReview]:
+        """
+        Create the review in one statement, only for a completed order owned by user_id.
+        Returns None when nothing was inserted (order missing, not owned, not completed,
+        or already reviewed) so the caller can work out which.
+        """
+        eligible_order = select(
+            TranslationOrder.id,
+            TranslationOrder.user_id,
+            cast(review.rating, Integer),
+            cast(review.description, Text)
+        ).where(
+            TranslationOrder.id == order_id,
+            TranslationOrder.user_id == user_id,
+            TranslationOrder.status == "completed"
+        )
+        statement = (
+            insert(TranslationReview)
+            .from_select(["order_id", "user_id", "rating", "description"], eligible_order)
+            .on_conflict_do_nothing(index_elements=[TranslationReview.order_id])
+            .returning(TranslationReview)
         )
-        self.db.add(db_review)
+        db_review = self.db.scalars(statement).first()
+        if db_review is not None:
+            # Keep the RETURNING values; commit would otherwise expire them and force a reload
+            self.db.expunge(db_review)
+            self._adjust_rating(order_id, None, db_review.rating)
         self.db.commit()
-        self.db.refresh(db_review)
         return db_review
 
     def update_review(self, review_id: int, review_update: TranslationReviewUpdate) -> TranslationReview:
         """Update an existing review"""
-        db_review = self.db.query(TranslationReview).filter(TranslationReview.id == review_id).first()
+        # Lock the review so concurrent edits move the aggregates from the right rating
+        db_review = self.db.query(TranslationReview).filter(TranslationReview.id == review_id).with_for_update().first()
         if not db_review:
             raise HTTPException(status_code=404, detail="Review not found")
 
+        previous_rating = db_review.rating
         for field, value in review_update.model_dump().items():
             setattr(db_review, field, value)
+        self._adjust_rating(db_review.order_id, previous_rating, db_review.rating)
 
         self.db.commit()
         self.db.refresh(db_review)
@@ -154,13 +412,8 @@ class TranslationRepository:
 
     def get_translator_reviews(self, translator_id: int, skip: int = 0, limit: int = 10) -> Tuple[List[TranslationReview], int]:
         """Get all reviews for a translator's orders"""
-        total = (
-            self.db.query(TranslationReview)
-            .join(TranslationOrder)
-            .filter(TranslationOrder.translator_id == translator_id)
-            .count()
-        )
-        
+        total = self.db.query(Translation.review_count).filter(Translation.id == translator_id).scalar() or 0
+
         reviews = (
             self.db.query(TranslationReview)
             .join(TranslationOrder)
@@ -178,9 +431,42 @@ class TranslationRepository:
 
     def delete_review(self, review_id: int):
         """Delete a review"""
-        review = self.get_review(review_id)
+        review = self.db.query(TranslationReview).filter(TranslationReview.id == review_id).with_for_update().first()
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
         
+        self._adjust_rating(review.order_id, review.rating, None)
         self.db.delete(review)
         self.db.commit()
+
+    def reconcile_rating_aggregates(self, batch_size: int = 1000) -> int:
+        """Recompute stored review aggregates from the reviews; returns the number of translators fixed"""
+        def reviews_of_translator(aggregate, rating: Optional[int] = None):
+            query = select(aggregate).select_from(TranslationReview).join(TranslationOrder).where(
+                TranslationOrder.translator_id == Translation.id
+            )
+            if rating is not None:
+                query = query.where(TranslationReview.rating == rating)
+            return query.scalar_subquery()
+
+        expected = {
+            "review_count": reviews_of_translator(func.count(TranslationReview.id)),
+            "rating_sum": reviews_of_translator(func.coalesce(func.sum(TranslationReview.rating), 0)),
+        }
+        for rating in range(1, 6):
+            expected[f"rating_count_{rating}"] = reviews_of_translator(func.count(TranslationReview.id), rating)
+
+        max_id = self.db.query(func.max(Translation.id)).scalar() or 0
+        fixed = 0
+        # Walk id ranges in short transactions so row locks are held briefly
+        for start in range(0, max_id + 1, batch_size):
+            result = self.db.execute(
+                update(Translation)
+                .where(Translation.id >= start, Translation.id < start + batch_size)
+                .where(or_(*(getattr(Translation, name) != value for name, value in expected.items())))
+                .values(updated_at=Translation.updated_at, **expected)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            fixed += result.rowcount
+        return fixed
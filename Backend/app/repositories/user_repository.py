@@ -1,10 +1,17 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.models.user_model import User, IdentityType
-from app.models.token_model import UsedToken
+from app.models.summary_model import Summary
+from app.repositories.token_repository import TokenRepository
+from app.repositories.summary_repository import SummaryRepository
+from app.repositories.translation_repository import TranslationRepository
 from app.api.v1.schemas.user_schemas import UserProfileUpdate
-from app.core.security import verify_password, get_password_hash
-from app.core.exceptions import InvalidPasswordError
+from app.core.feed_cache import feed_cache
+from app.core.principal_cache import principal_cache
 from fastapi import HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+TOKEN_USED_DETAIL = "This verification token has already been used"
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -16,9 +23,49 @@ class UserRepository:
     def get_user_by_id(self, user_id: int) -> User | None:
         return self.db.query(User).filter(User.id == user_id).first()
 
+    def get_principal(self, email: str) -> User | None:
+        """Get the authenticated user by token subject, served from the principal cache when possible"""
+        snapshot, version = principal_cache.get(email)
+        if snapshot is not None:
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return self.db.merge(user, load=False)
+
+        user = self.get_user_by_email(email)
+        if user is not None:
+            principal_cache.put(
+                email,
+                {column.key: getattr(user, column.key) for column in User.__table__.columns},
+                version
+            )
+        return user
+
+    def _commit_user_change(self, email: str, feed_positions: Optional[list] = None):
+        """
+        Commit a change to a user row and drop its cached principal everywhere, along
+        with cached feed pages holding feed_positions (summaries showing the user's name)
+        """
+        principal_cache.publish_invalidation(self.db, email)
+        if feed_positions:
+            feed_cache.publish_invalidation(self.db, feed_positions)
+        self.db.commit()
+        principal_cache.invalidate(email)
+        for position in feed_positions or ():
+            feed_cache.invalidate_summary(*position)
+
+    def _authored_feed_positions(self, user_id: int) -> list:
+        """(created_at, id, topic_key) of a user's published summaries"""
+        return [
+            tuple(row) for row in self.db.query(Summary.created_at, Summary.id, Summary.topic_key).filter(
+                Summary.user_id == user_id,
+                Summary.is_published == True
+            )
+        ]
+
     def update_profile(self, user: User, profile_update: UserProfileUpdate) -> User:
         # Get only the fields that were actually provided in the update request
         update_data = profile_update.model_dump(exclude_unset=True)
+        previous_name = user.full_name
         
         # Update only the fields that were provided
         for key, value in update_data.items():
@@ -28,47 +75,37 @@ class UserRepository:
                     value = IdentityType(value)
                 setattr(user, key, value)
         
-        self.db.commit()
+        # Cached feed pages embed the author's name
+        feed_positions = self._authored_feed_positions(user.id) if user.full_name != previous_name else None
+        self._commit_user_change(user.email, feed_positions)
         self.db.refresh(user)
         return user
 
-    def verify_password(self, user: User, current_password: str) -> bool:
-        if not verify_password(current_password, user.hashed_password):
-            raise InvalidPasswordError()
-        return True
-
-    def is_token_used(self, token: str) -> bool:
-        """Check if a token has been used before"""
-        return self.db.query(UsedToken).filter(UsedToken.token == token).first() is not None
-
-    def invalidate_token(self, token: str):
-        """Mark a token as used"""
-        used_token = UsedToken(token=token)
-        self.db.add(used_token)
-        self.db.commit()
-
-    def change_password(self, user: User, new_password: str, verification_token: str) -> User:
-        # Check if token has been used
-        if self.is_token_used(verification_token):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="This verification token has already been used"
-            )
-
-        # Mark the token as used
-        self.invalidate_token(verification_token)
-
-        # Change the password
-        user.hashed_password = get_password_hash(new_password)
-        self.db.commit()
+    def change_password(self, user_id: int, hashed_password: str, token_id: str, token_expires_at: datetime) -> User:
+        """
+        Redeem the verification token and set a password already hashed by
+        core.password_hasher, in one short transaction
+        """
+        tokens = TokenRepository(self.db)
+        if not tokens.consume(token_id, token_expires_at):
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=TOKEN_USED_DETAIL)
+        user = self.get_user_by_id(user_id)
+        user.hashed_password = hashed_password
+        self._commit_user_change(user.email)
+        tokens.remember(token_id, token_expires_at)
         self.db.refresh(user)
         return user
 
-    def delete_user(self, user: User, password: str) -> bool:
-        """Delete a user after verifying their password"""
-        if not verify_password(password, user.hashed_password):
-            raise InvalidPasswordError()
-            
+    def delete_user(self, user: User) -> bool:
+        """Delete a user; the caller has already verified their password"""
+        email = user.email
+        # Reviews go with the user; keep their translators' rating aggregates in step
+        TranslationRepository(self.db).discount_user_reviews(user.id)
+        # Likes, bookmarks and comments cascade too; have the trending job rescore what they touched
+        SummaryRepository(self.db).mark_user_interactions(user.id)
+        # Their summaries go too
+        feed_positions = self._authored_feed_positions(user.id)
         self.db.delete(user)
-        self.db.commit()
+        self._commit_user_change(email, feed_positions)
         return True
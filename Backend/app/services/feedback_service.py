@@ -1,5 +1,6 @@
 from fastapi import HTTPException, status
-from app.models.user_model import User
+from app.core.dependencies import Principal
+from app.core.page_counts import CountMode
 from app.repositories.feedback_repository import FeedbackRepository
 from app.api.v1.schemas.feedback_schemas import (
     FeedbackCreate,
@@ -16,29 +17,27 @@ class FeedbackService:
     def __init__(self, feedback_repository: FeedbackRepository):
         self.feedback_repository = feedback_repository
 
-    def create_feedback(self, user: User, feedback_data: FeedbackCreate) -> Feedback:
-        # Check if user already gave feedback
-        existing_feedback = self.feedback_repository.get_feedback_by_user(user.id)
-        if existing_feedback:
+    def create_feedback(self, user: Principal, feedback_data: FeedbackCreate) -> Feedback:
+        # One feedback per user, enforced by the insert itself
+        feedback = self.feedback_repository.create_feedback(user.id, feedback_data)
+        if feedback is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User has already submitted feedback"
             )
-        
-        return self.feedback_repository.create_feedback(user.id, feedback_data)
+        return feedback
 
-    def create_feedback_dosen(self, user: User, feedback_data: FeedbackDosenCreate) -> FeedbackDosen:
-        # Check if user already gave feedback
-        existing_feedback = self.feedback_repository.get_feedback_dosen_by_user(user.id)
-        if existing_feedback:
+    def create_feedback_dosen(self, user: Principal, feedback_data: FeedbackDosenCreate) -> FeedbackDosen:
+        # One feedback per user, enforced by the insert itself
+        feedback = self.feedback_repository.create_feedback_dosen(user.id, feedback_data)
+        if feedback is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User has already submitted feedback for dosen"
             )
-        
-        return self.feedback_repository.create_feedback_dosen(user.id, feedback_data)
+        return feedback
 
-    def update_feedback(self, feedback_id: int, user: User, feedback_data: FeedbackUpdate) -> Feedback:
+    def update_feedback(self, feedback_id: int, user: Principal, feedback_data: FeedbackUpdate) -> Feedback:
         feedback = self.feedback_repository.get_feedback(feedback_id)
         if not feedback:
             raise HTTPException(
@@ -54,7 +53,7 @@ class FeedbackService:
         
         return self.feedback_repository.update_feedback(feedback_id, feedback_data)
 
-    def update_feedback_dosen(self, feedback_id: int, user: User, feedback_data: FeedbackDosenUpdate) -> FeedbackDosen:
+    def update_feedback_dosen(self, feedback_id: int, user: Principal, feedback_data: FeedbackDosenUpdate) -> FeedbackDosen:
         feedback = self.feedback_repository.get_feedback_dosen(feedback_id)
         if not feedback:
             raise HTTPException(
@@ -70,23 +69,23 @@ class FeedbackService:
         
         return self.feedback_repository.update_feedback_dosen(feedback_id, feedback_data)
 
-    def get_all_feedback(self, user: User, skip: int = 0, limit: int = 10) -> tuple[list[Feedback], int]:
+    def get_all_feedback(self, user: Principal, skip: int = 0, limit: int = 10, count_mode: CountMode = "exact") -> tuple[list[Feedback], int]:
         if not user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only admins can view all feedback"
             )
-        return self.feedback_repository.get_all_feedback(skip, limit)
+        return self.feedback_repository.get_all_feedback(skip, limit, count_mode)
 
-    def get_all_feedback_dosen(self, user: User, skip: int = 0, limit: int = 10) -> tuple[list[FeedbackDosen], int]:
+    def get_all_feedback_dosen(self, user: Principal, skip: int = 0, limit: int = 10, count_mode: CountMode = "exact") -> tuple[list[FeedbackDosen], int]:
         if not user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only admins can view all feedback"
             )
-        return self.feedback_repository.get_all_feedback_dosen(skip, limit)
+        return self.feedback_repository.get_all_feedback_dosen(skip, limit, count_mode)
 
-    def get_overall_feedback_stats(self, user: User, skip: int = 0, limit: int = 10) -> OverallFeedbackStats:
+    def get_overall_feedback_stats(self, user: Principal, skip: int = 0, limit: int = 10) -> OverallFeedbackStats:
         if not user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -107,7 +106,7 @@ class FeedbackService:
             total_dosen_feedback=total_dosen
         )
 
-    def delete_feedback(self, feedback_id: int, user: User) -> bool:
+    def delete_feedback(self, feedback_id: int, user: Principal) -> bool:
         feedback = self.feedback_repository.get_feedback(feedback_id)
         if not feedback:
             raise HTTPException(
@@ -123,7 +122,7 @@ class FeedbackService:
         
         return self.feedback_repository.delete_feedback(feedback_id)
 
-    def delete_feedback_dosen(self, feedback_id: int, user: User) -> bool:
+    def delete_feedback_dosen(self, feedback_id: int, user: Principal) -> bool:
         feedback = self.feedback_repository.get_feedback_dosen(feedback_id)
         if not feedback:
             raise HTTPException(
@@ -0,0 +1,33 @@
+from typing import Callable
+from sqlalchemy.orm import Session
+from app.core.feed_cache import feed_cache
+from app.core.toggle_buffer import toggle_buffer
+from app.repositories.summary_repository import SummaryRepository
+import threading
+
+class ToggleFlushService:
+    """Persists buffered like/bookmark toggles (write-behind mode) in batched statements"""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        # The periodic job and the shutdown flush must not drain concurrently
+        self._lock = threading.Lock()
+
+    def flush(self):
+        with self._lock:
+            batch = toggle_buffer.drain()
+            if not batch:
+                return
+            db = self.session_factory()
+            try:
+                changed = SummaryRepository(db).apply_toggles(batch)
+            except Exception:
+                toggle_buffer.complete(success=False)
+                raise
+            finally:
+                db.close()
+            # Drop the pending overlay before invalidating, so a page rebuilt from the
+            # new counters is never served with the same toggles added on top again
+            toggle_buffer.complete(success=True)
+            for created_at, summary_id, topic_key in changed:
+                feed_cache.invalidate_summary(created_at, summary_id, topic_key)
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional, Tuple
-from datetime import date
+from typing import List, Optional, Tuple, Union
+from datetime import date, datetime
 
 from app.models.translation_model import Translation, TranslationOrder, TranslationReview
 from app.api.v1.schemas.translation_schemas import (
@@ -9,9 +9,11 @@ from app.api.v1.schemas.translation_schemas import (
     TranslationOrderUpdate, TranslatorCreate, TranslatorUpdate, 
     PaginatedTranslatorResponse, PaginatedOrderResponse, 
     TranslationReviewCreate, TranslationReviewUpdate,
-    PaginatedReviewResponse
+    PaginatedReviewResponse, PaginatedCompactOrderResponse, NearbyTranslator
 )
-from app.repositories.translation_repository import TranslationRepository
+from app.repositories.translation_repository import TranslationRepository, translator_page_version
+from app.core.time_slots import slot_range
+from app.core.page_counts import CountMode
 
 class TranslationService:
     def __init__(self, translation_repository: TranslationRepository):
@@ -89,12 +91,28 @@ class TranslationService:
             )
         return translator
 
-    def get_translators(self, skip: int = 0, limit: int = 10) -> PaginatedTranslatorResponse:
-        translators, total = self.translation_repository.get_translators(skip, limit)
+    def get_translators_version(
+        self, skip: int = 0, limit: int = 10, sort: str = "default", count_mode: CountMode = "exact"
+    ) -> tuple:
+        return self.translation_repository.get_translators_version(skip, limit, sort, count_mode)
+
+    def get_translators(
+        self, skip: int = 0, limit: int = 10, sort: str = "default", count_mode: CountMode = "exact"
+    ) -> Tuple[PaginatedTranslatorResponse, tuple]:
+        """A page of translators plus its version, matching get_translators_version"""
+        translators, total = self.translation_repository.get_translators(skip, limit, sort, count_mode)
         return PaginatedTranslatorResponse(
             items=translators,
             total=total
-        )
+        ), translator_page_version(translators, total)
+
+    def get_nearby_translators(self, lat: float, lon: float, radius_km: float, limit: int = 20) -> List[NearbyTranslator]:
+        """Available translators near a point, nearest first"""
+        fields = [field for field in NearbyTranslator.model_fields if field != "distance_km"]
+        return [
+            NearbyTranslator(**{field: getattr(translator, field) for field in fields}, distance_km=round(distance, 3))
+            for translator, distance in self.translation_repository.get_nearby_translators(lat, lon, radius_km, limit)
+        ]
 
     def update_translator(self, translator_id: int, translator_update: TranslatorUpdate, user_id: int) -> Translation:
         translator = self.translation_repository.get_translator(translator_id)
@@ -133,33 +151,36 @@ class TranslationService:
                 detail="Translator is not available"
             )
 
-        # Valid time slots from database
-        valid_time_slots = [
-            "08.00 - 09.00", "08.00 - 10.00", "09.00 - 10.00", "09.00 - 11.00",
-            "10.00 - 12.00", "10.00 - 11.00", "11.00 - 12.00", "11.00 - 13.00",
-            "12.00 - 13.00", "12.00 - 14.00", "13.00 - 14.00", "13.00 - 15.00",
-            "14.00 - 15.00", "14.00 - 16.00", "15.00 - 16.00", "15.00 - 17.00",
-            "16.00 - 17.00", "16.00 - 18.00", "17.00 - 18.00", "17.00 - 19.00",
-            "18.00 - 19.00"
-        ]
+        slot_start, slot_end = self._parse_slot(order.tanggal, order.time_slot)
+        return self.translation_repository.create_order(order, translator_id, user_id, slot_start, slot_end)
 
-        # Validate time slot format
-        if order.time_slot not in valid_time_slots:
+    def _parse_slot(self, day: date, time_slot: str) -> Tuple[datetime, datetime]:
+        try:
+            return slot_range(day, time_slot)
+        except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid time slot. Valid options are: {valid_time_slots}"
+                detail=f"Invalid time slot: {str(e)}"
             )
 
-        return self.translation_repository.create_order(order, translator_id, user_id)
-
-    def get_user_orders(self, user_id: int, skip: int = 0, limit: int = 10) -> PaginatedOrderResponse:
-        orders, total = self.translation_repository.get_user_orders(user_id, skip, limit)
-        return PaginatedOrderResponse(
+    def get_available_translators(self, day: date, time_slot: str, skip: int = 0, limit: int = 50) -> List[Translation]:
+        """Translators that can take a booking for this slot"""
+        slot_start, slot_end = self._parse_slot(day, time_slot)
+        return self.translation_repository.get_available_translators(slot_start, slot_end, skip, limit)
+
+    def get_user_orders(
+        self, user_id: int, skip: int = 0, limit: int = 10, compact: bool = False, count_mode: CountMode = "exact"
+    ) -> Union[PaginatedOrderResponse, PaginatedCompactOrderResponse]:
+        orders, total = self.translation_repository.get_user_orders(user_id, skip, limit, compact, count_mode)
+        response_model = PaginatedCompactOrderResponse if compact else PaginatedOrderResponse
+        return response_model(
             items=orders,
             total=total
         )
 
-    def get_translator_orders(self, user_id: int, skip: int = 0, limit: int = 10) -> PaginatedOrderResponse:
+    def get_translator_orders(
+        self, user_id: int, skip: int = 0, limit: int = 10, compact: bool = False, count_mode: CountMode = "exact"
+    ) -> Union[PaginatedOrderResponse, PaginatedCompactOrderResponse]:
         # Get translator profile for the user
         translator = self.translation_repository.get_translator_by_user_id(user_id)
         if not translator:
@@ -167,8 +188,9 @@ class TranslationService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Translator profile not found"
             )
-        orders, total = self.translation_repository.get_translator_orders(translator.id, skip, limit)
-        return PaginatedOrderResponse(
+        orders, total = self.translation_repository.get_translator_orders(translator.id, skip, limit, compact, count_mode)
+        response_model = PaginatedCompactOrderResponse if compact else PaginatedOrderResponse
+        return response_model(
             items=orders,
             total=total
         )
@@ -256,7 +278,11 @@ class TranslationService:
 
     def create_review(self, order_id: int, review: TranslationReviewCreate, user_id: int) -> TranslationReview:
         """Create a review for a completed order"""
-        # Get the order
+        db_review = self.translation_repository.create_review(order_id, user_id, review)
+        if db_review is not None:
+            return db_review
+
+        # Nothing inserted: look the order up only to report why
         order = self.translation_repository.get_order(order_id)
         if not order:
             raise HTTPException(
@@ -278,15 +304,10 @@ class TranslationService:
                 detail="Can only review completed orders"
             )
 
-        # Check if review already exists
-        existing_review = self.translation_repository.get_review_by_order(order_id)
-        if existing_review:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Review already exists for this order"
-            )
-
-        return self.translation_repository.create_review(order_id, user_id, review)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Review already exists for this order"
+        )
 
     def update_review(self, order_id: int, review: TranslationReviewUpdate, user_id: int) -> TranslationReview:
         """Update an existing review"""
@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.repositories.summary_repository import SummaryRepository
+
+# Interactions committed shortly after the previous run started may carry an
+# earlier created_at, so each run re-reads a little before its watermark
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+class TrendingService:
+    """Periodic job that keeps summary_trending up to date incrementally"""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._watermark: Optional[datetime] = None
+
+    def refresh(self):
+        db = self.session_factory()
+        try:
+            started_at = SummaryRepository(db).refresh_trending(self._watermark)
+        finally:
+            db.close()
+        # Only advance when this worker did the work; otherwise the next run covers the gap
+        if started_at is not None:
+            self._watermark = started_at - WATERMARK_OVERLAP
@@ -1,22 +1,21 @@
 from app.repositories.user_repository import UserRepository
 from app.api.v1.schemas.user_schemas import UserProfileUpdate, UserProfile
 from fastapi import HTTPException, status
-from app.core.exceptions import InvalidPasswordError
 from app.models.user_model import IdentityType
 
 class UserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    def get_user_profile(self, user_id: int) -> UserProfile:
+    def get_user_profile(self, user_id: int) -> dict:
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        # Convert enum to string for response
-        user_dict = {
+        # Already in UserProfile's shape; the endpoint serializes it without a second model pass
+        return {
             "id": user.id,
             "email": user.email,
             "full_name": user.full_name,
@@ -26,7 +25,6 @@ class UserService:
             "profile_picture_url": user.profile_picture_url,
             "points": user.points
         }
-        return UserProfile(**user_dict)
 
     def update_user_profile(self, user_id: int, profile_update: UserProfileUpdate) -> UserProfile:
         user = self.user_repository.get_user_by_id(user_id)
@@ -55,8 +53,8 @@ class UserService:
                 detail="Failed to update profile"
             )
 
-    def delete_user(self, user_id: int, password: str) -> bool:
-        """Delete a user account after verifying their password"""
+    def delete_user(self, user_id: int) -> bool:
+        """Delete a user account; the caller verifies the password first"""
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
             raise HTTPException(
@@ -64,12 +62,7 @@ class UserService:
                 detail="User not found"
             )
         try:
-            return self.user_repository.delete_user(user, password)
-        except InvalidPasswordError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid password"
-            )
+            return self.user_repository.delete_user(user)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,61 @@
+import os
+
+os.environ.setdefault("user", "test")
+os.environ.setdefault("password", "test")
+os.environ.setdefault("host", "localhost")
+os.environ.setdefault("port", "5432")
+os.environ.setdefault("dbname", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["PRINCIPAL_CACHE_NOTIFY"] = "false"
+
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.api import api_router  # noqa: F401 - registers every model's mapper
+from app.api.v1.schemas.feedback_schemas import FeedbackCreate, FeedbackDosenCreate
+from app.core.dependencies import Principal
+from app.models.feedback_model import FeedbackSystem, FeedbackDosen
+from app.models.user_model import User, IdentityType
+from app.repositories.feedback_repository import FeedbackRepository
+from app.services.feedback_service import FeedbackService
+
+test_engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+for table in (User.__table__, FeedbackSystem.__table__, FeedbackDosen.__table__):
+    table.create(test_engine)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+def test_duplicate_feedback_is_rejected_without_an_integrity_error():
+    db = TestSessionLocal()
+    try:
+        user = User(
+            email="reviewer@example.com", full_name="Reviewer", birth_date=date(2000, 1, 1),
+            hashed_password="x", identity_type=IdentityType.TULI
+        )
+        db.add(user)
+        db.commit()
+        principal = Principal(id=user.id, email=user.email, identity_type="tuli", role="user")
+        service = FeedbackService(FeedbackRepository(db))
+
+        first = service.create_feedback(principal, FeedbackCreate(rating=5, description="Great"))
+        assert first.rating == 5
+        with pytest.raises(HTTPException) as rejected:
+            service.create_feedback(principal, FeedbackCreate(rating=1, description="Again"))
+        assert rejected.value.status_code == 400
+
+        service.create_feedback_dosen(principal, FeedbackDosenCreate(rating=4, description="Helpful"))
+        with pytest.raises(HTTPException) as rejected:
+            service.create_feedback_dosen(principal, FeedbackDosenCreate(rating=2, description="Again"))
+        assert rejected.value.status_code == 400
+
+        assert db.query(FeedbackSystem).filter(FeedbackSystem.user_id == user.id).one().rating == 5
+        assert db.query(FeedbackDosen).filter(FeedbackDosen.user_id == user.id).one().rating == 4
+    finally:
+        db.close()
@@ -0,0 +1,221 @@
+import os
+
+os.environ.setdefault("user", "test")
+os.environ.setdefault("password", "test")
+os.environ.setdefault("host", "localhost")
+os.environ.setdefault("port", "5432")
+os.environ.setdefault("dbname", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["PRINCIPAL_CACHE_NOTIFY"] = "false"
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+import threading
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.api import api_router  # noqa: F401 - registers every model's mapper
+from app.api.v1.schemas.user_schemas import UserProfileUpdate
+from app.core.feed_cache import FeedCache, INVALIDATION_CHANNEL, feed_cache
+from app.core.toggle_buffer import ToggleBuffer
+from app.models.summary_model import (
+    Summary, SummaryLike, SummaryComment, SummaryBookmark, SummaryTrending, SummaryTrendingDirty
+)
+from app.models.user_model import User, IdentityType
+from app.repositories.summary_repository import SummaryRepository, feed_page_version
+from app.repositories.user_repository import UserRepository
+
+# The trending refresh is Postgres SQL; point this at a scratch database to run it
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+@pytest.fixture
+def postgres_sessions():
+    engine = create_engine(TEST_POSTGRES_URL)
+    tables = [
+        User.__table__, Summary.__table__, SummaryLike.__table__,
+        SummaryComment.__table__, SummaryBookmark.__table__, SummaryTrending.__table__,
+        SummaryTrendingDirty.__table__
+    ]
+    User.metadata.create_all(engine, tables=tables)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        User.metadata.drop_all(engine, tables=tables)
+        engine.dispose()
+
+@pytest.fixture
+def postgres_session(postgres_sessions):
+    db = postgres_sessions()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def add_author(db) -> User:
+    author = User(
+        email=f"author{db.query(User).count()}@example.com", full_name="Author", birth_date=date(2000, 1, 1),
+        hashed_password="x", identity_type=IdentityType.TULI
+    )
+    db.add(author)
+    db.commit()
+    return author
+
+def test_full_toggle_buffer_keeps_unflushed_keys_buffered():
+    buffer = ToggleBuffer(max_pending=1)
+
+    # Like summary 1 and hand it to the flusher, then fill the pending set with summary 2
+    assert buffer.record("like", 7, 1, persisted=False) is True
+    assert buffer.drain() == {"like": [(7, 1, True)]}
+    assert buffer.record("like", 7, 2, persisted=False) is True
+
+    # Untouched keys write through; keys with an unflushed entry must not
+    assert not buffer.accepting("like", 7, 3)
+    assert buffer.accepting("like", 7, 1)
+    assert buffer.accepting("like", 7, 2)
+
+    # Unliking the in-flight key starts from its desired state, not the stale row
+    assert buffer.record("like", 7, 1, persisted=False) is False
+    buffer.complete(success=True)
+    assert buffer.drain() == {"like": [(7, 2, True), (7, 1, False)]}
+    buffer.complete(success=True)
+
+    item = {"id": 1, "like_count": 0, "has_liked": False, "bookmark_count": 0, "has_bookmarked": False}
+    assert buffer.overlay(item, 7) == item
+
+def test_feed_invalidations_reach_other_workers():
+    # sqlite stands in for Postgres; pg_notify just records what would be delivered
+    engine = create_engine("sqlite://")
+    notifications = []
+
+    @event.listens_for(engine, "connect")
+    def register_pg_notify(connection, record):
+        connection.create_function("pg_notify", 2, lambda channel, payload: notifications.append((channel, payload)))
+
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    here, there = FeedCache(ttl_seconds=30, max_pages=10), FeedCache(ttl_seconds=30, max_pages=10)
+    for cache in (here, there):
+        cache.put(("news", None, 2), [{"id": 7}], "next", None, (created_at, 5), token=0)
+        cache.put(("sport", None, 2), [{"id": 9}], None, None, None, token=0)
+
+    db = sessionmaker(bind=engine)()
+    here.publish_invalidation(db, [(created_at, 7, "news")])
+    db.commit()
+    here.publish_invalidation(db, [])
+    db.close()
+
+    assert [channel for channel, _ in notifications] == [INVALIDATION_CHANNEL]
+    there.apply_remote(notifications[0][1])
+    assert there.get(("news", None, 2))[0] is None
+    assert there.get(("sport", None, 2))[0] is not None
+    there.apply_remote("*")
+    assert there.snapshot()["pages"] == 0
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_unlike_lowers_trending_score(postgres_session):
+    db = postgres_session
+    users = [
+        User(
+            email=f"fan{i}@example.com", full_name=f"Fan {i}", birth_date=date(2000, 1, 1),
+            hashed_password="x", identity_type=IdentityType.TULI
+        )
+        for i in range(2)
+    ]
+    db.add_all(users)
+    db.flush()
+    summary = Summary(content="Body", title="Title", is_published=True, user_id=users[0].id)
+    db.add(summary)
+    db.flush()
+    db.add_all([SummaryLike(summary_id=summary.id, user_id=user.id) for user in users])
+    db.commit()
+
+    def score():
+        return db.query(SummaryTrending.score).filter(SummaryTrending.summary_id == summary.id).scalar()
+
+    repository = SummaryRepository(db)
+    watermark = repository.refresh_trending(None)
+    liked_twice = score()
+
+    # Unlikes leave nothing newer than the watermark; their dirty mark gets the row rescored
+    assert repository.toggle_like(summary.id, users[1].id) is False
+    watermark = repository.refresh_trending(watermark)
+    assert score() < liked_twice
+
+    assert repository.toggle_like(summary.id, users[0].id) is False
+    repository.refresh_trending(watermark)
+    assert score() is None
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_import_batch_rejected_by_the_database_fails_only_bad_lines(postgres_session):
+    db = postgres_session
+    author = add_author(db)
+
+    def row(title: str) -> dict:
+        return {
+            "user_id": author.id, "content": "Body", "title": title, "subtitle": None, "topic": None,
+            "image_url": None, "is_published": False, "created_at": None, "updated_at": None
+        }
+
+    # Rows are validated before they reach the repository; an over-long title stands in
+    # for anything the database still rejects
+    errors = SummaryRepository(db).import_summaries([(1, row("Fine")), (2, row("x" * 201)), (3, row("Also fine"))])
+
+    assert [line_no for line_no, _ in errors] == [2]
+    assert sorted(title for (title,) in db.query(Summary.title)) == ["Also fine", "Fine"]
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_double_tap_toggles_never_hit_the_unique_constraint(postgres_sessions):
+    db = postgres_sessions()
+    try:
+        author = add_author(db)
+        summary = Summary(content="Body", title="Title", is_published=True, user_id=author.id)
+        db.add(summary)
+        db.commit()
+        summary_id, user_id = summary.id, author.id
+    finally:
+        db.close()
+
+    for taps in (2, 3):
+        start = threading.Barrier(taps)
+
+        def tap(_):
+            session = postgres_sessions()
+            try:
+                start.wait()
+                return SummaryRepository(session).toggle_like(summary_id, user_id)
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(taps) as pool:
+            list(pool.map(tap, range(taps)))
+
+        db = postgres_sessions()
+        try:
+            likes = db.query(SummaryLike).filter(SummaryLike.summary_id == summary_id).count()
+            assert likes in (0, 1)
+            assert db.query(Summary.like_count).filter(Summary.id == summary_id).scalar() == likes
+        finally:
+            db.close()
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_feed_version_matches_the_served_page(postgres_session):
+    db = postgres_session
+    author = add_author(db)
+    db.add_all([
+        Summary(content="Body", title=f"Title {i}", is_published=True, user_id=author.id) for i in range(3)
+    ])
+    db.commit()
+    repository = SummaryRepository(db)
+    feed_cache.clear()
+
+    def served(**feed):
+        return feed_page_version(*repository.get_summaries(author.id, limit=2, **feed))
+
+    for feed in ({}, {"published_only": True}, {"private_only": True}):
+        assert repository.get_summaries_version(author.id, limit=2, **feed) == served(**feed)
+
+    # The published feed is now cached with the author's name; renaming must not leave
+    # the cached body behind the version query
+    UserRepository(db).update_profile(author, UserProfileUpdate(full_name="Renamed"))
+    assert repository.get_summaries_version(author.id, published_only=True, limit=2) == served(published_only=True)
+    assert {item["user_name"] for item in repository.get_summaries(author.id, published_only=True)[0]} == {"Renamed"}
@@ -0,0 +1,324 @@
+import os
+
+os.environ.setdefault("user", "test")
+os.environ.setdefault("password", "test")
+os.environ.setdefault("host", "localhost")
+os.environ.setdefault("port", "5432")
+os.environ.setdefault("dbname", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["PRINCIPAL_CACHE_NOTIFY"] = "false"
+
+from datetime import date, datetime
+import itertools
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.api import api_router  # noqa: F401 - registers every model's mapper
+from app.api.v1.schemas.translation_schemas import (
+    TranslatorCreate, TranslatorUpdate, TranslationOrderCreate, TranslationReviewCreate, TranslationReviewUpdate
+)
+from app.core.gazetteer import geocode
+from app.core.geo_index import GeoIndex
+from app.core.page_counts import count_cache
+from app.models.translation_model import Translation, TranslationOrder, TranslationReview
+from app.models.user_model import User, IdentityType
+from app.repositories.translation_repository import TranslationRepository, SLOT_CONFLICT_CONSTRAINT
+from app.services.translation_service import TranslationService
+
+test_engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+for table in (User.__table__, Translation.__table__, TranslationOrder.__table__, TranslationReview.__table__):
+    table.create(test_engine)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+statements = []
+seed_runs = itertools.count()
+
+@event.listens_for(test_engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+def seed(orders: int) -> int:
+    """A client with `orders` orders spread over three translators, every other one reviewed"""
+    run = next(seed_runs)
+    db = TestSessionLocal()
+    try:
+        users = [
+            User(
+                email=f"user{i}-{run}@example.com", full_name=f"User {i}", birth_date=date(2000, 1, 1),
+                hashed_password="x", identity_type=IdentityType.TULI if i == 0 else IdentityType.JBI
+            )
+            for i in range(4)
+        ]
+        db.add_all(users)
+        db.flush()
+        translators = [
+            Translation(name=f"Translator {i}", alamat="Jakarta", user_id=users[i + 1].id)
+            for i in range(3)
+        ]
+        db.add_all(translators)
+        db.flush()
+        for i in range(orders):
+            order = TranslationOrder(
+                tanggal=date(2026, 1, 1), time_slot="08.00 - 09.00", description=f"Order {i}",
+                slot_start=datetime(2026, 1, 1, 8), slot_end=datetime(2026, 1, 1, 9),
+                status="completed", user_id=users[0].id, translator_id=translators[i % 3].id
+            )
+            if i % 2 == 0:
+                order.review = TranslationReview(user_id=users[0].id, rating=5)
+            db.add(order)
+        db.commit()
+        return users[0].id
+    finally:
+        db.close()
+
+def count_page_queries(fetch) -> int:
+    """Statements issued while loading and serializing one page on a fresh session"""
+    db = TestSessionLocal()
+    try:
+        statements.clear()
+        fetch(TranslationService(TranslationRepository(db))).model_dump()
+        return len(statements)
+    finally:
+        db.close()
+
+@pytest.mark.parametrize("compact, expected", [(False, 3), (True, 1)])
+def test_order_pages_use_a_fixed_number_of_queries(compact, expected):
+    small_client = seed(3)
+    large_client = seed(60)
+
+    # page with its count(*) OVER () total (+ one select-in each for translators and users when not compact)
+    small = count_page_queries(lambda service: service.get_user_orders(small_client, 0, 100, compact))
+    large = count_page_queries(lambda service: service.get_user_orders(large_client, 0, 100, compact))
+    assert small == large == expected
+
+def test_full_order_page_includes_nested_objects():
+    client_id = seed(4)
+    db = TestSessionLocal()
+    try:
+        page = TranslationService(TranslationRepository(db)).get_user_orders(client_id, 0, 10).model_dump()
+    finally:
+        db.close()
+
+    assert page["total"] == 4
+    reviewed = [item for item in page["items"] if item["review"] is not None]
+    assert len(reviewed) == 2
+    assert all(item["translator"]["name"].startswith("Translator") for item in page["items"])
+    assert all(item["user"]["identity_type"] == "tuli" for item in page["items"])
+
+def test_nearby_translators_by_geocoded_address():
+    client_id = seed(0)
+    db = TestSessionLocal()
+    try:
+        repository = TranslationRepository(db)
+        service = TranslationService(repository)
+        surabaya = repository.create_translator(TranslatorCreate(name="Surabaya", alamat="Jl. Bandung No. 5, Surabaya"), client_id)
+        sidoarjo = repository.create_translator(TranslatorCreate(name="Sidoarjo", alamat="Sidoarjo, Jawa Timur"), client_id)
+        repository.create_translator(TranslatorCreate(name="Bandung", alamat="Jl. Braga, Bandung"), client_id)
+
+        assert (surabaya.latitude, surabaya.longitude) == geocode("Surabaya")
+        nearby = service.get_nearby_translators(-7.26, 112.75, 40)
+        assert [item.id for item in nearby] == [surabaya.id, sidoarjo.id]
+        assert nearby[0].distance_km < nearby[1].distance_km
+
+        repository.update_translator(surabaya.id, TranslatorUpdate(name="Surabaya", alamat="Surabaya", availability=False))
+        assert [item.id for item in service.get_nearby_translators(-7.26, 112.75, 40)] == [sidoarjo.id]
+    finally:
+        db.close()
+
+def test_nearby_reads_never_geocode_and_backfill_marks_misses():
+    client_id = seed(0)
+    db = TestSessionLocal()
+    try:
+        repository = TranslationRepository(db)
+        repository.geocode_pending()  # other tests' seeded translators
+        legacy = Translation(name="Legacy", alamat="Malang", user_id=client_id)
+        unknown = Translation(name="Unknown", alamat="Atlantis", user_id=client_id)
+        db.add_all([legacy, unknown])
+        db.commit()
+
+        statements.clear()
+        repository._load_locations()
+        assert not [statement for statement in statements if not statement.lstrip().startswith("SELECT")]
+
+        assert repository.geocode_pending() == 1
+        db.expire_all()
+        assert (legacy.latitude, legacy.longitude) == geocode("Malang")
+        assert unknown.latitude is None and unknown.geocoded_at is not None
+        assert repository.geocode_pending() == 0
+    finally:
+        db.close()
+
+def test_geo_index_keeps_changes_made_during_a_reload():
+    index = GeoIndex(cell_degrees=0.1, refresh_seconds=0)
+
+    def load():
+        # Written after the load read its rows: 1 moved, 2 was removed, 3 was added
+        index.upsert(1, -6.9, 107.6)
+        index.remove(2)
+        index.upsert(3, -7.25, 112.75)
+        return [(1, -7.26, 112.75), (2, -7.27, 112.76)]
+
+    index.ensure_loaded(load)
+    assert [point_id for point_id, _ in index.nearby(-7.26, 112.75, 10, 10)] == [3]
+    assert [point_id for point_id, _ in index.nearby(-6.9, 107.6, 10, 10)] == [1]
+
+def test_review_changes_maintain_rating_aggregates():
+    client_id = seed(3)
+    db = TestSessionLocal()
+    try:
+        repository = TranslationRepository(db)
+        orders = db.query(TranslationOrder).filter(TranslationOrder.user_id == client_id).order_by(TranslationOrder.id).all()
+        translator_id = orders[1].translator_id
+        # seed() writes reviews directly, so its translators start out unaggregated
+        assert repository.reconcile_rating_aggregates() > 0
+
+        review = repository.create_review(orders[1].id, client_id, TranslationReviewCreate(rating=4))
+        repository.update_review(review.id, TranslationReviewUpdate(rating=2))
+        db.expire_all()
+        translator = repository.get_translator(translator_id)
+        assert (translator.review_count, translator.rating_sum, translator.rating_average) == (1, 2, 2.0)
+        assert translator.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 0}
+
+        ranked, _ = repository.get_translators(0, 100, sort="rating")
+        positions = {item.id: index for index, item in enumerate(ranked)}
+        assert positions[orders[0].translator_id] < positions[translator_id]
+        averages = [item.rating_average for item in ranked]
+        rated = [average for average in averages if average is not None]
+        assert rated == sorted(rated, reverse=True) and averages[len(rated):] == [None] * (len(averages) - len(rated))
+
+        repository.delete_review(review.id)
+        db.expire_all()
+        translator = repository.get_translator(translator_id)
+        assert (translator.review_count, translator.rating_sum, translator.rating_average) == (0, 0, None)
+        assert repository.reconcile_rating_aggregates() == 0
+    finally:
+        db.close()
+
+def test_deleting_a_client_discounts_their_reviews():
+    client_id = seed(3)
+    db = TestSessionLocal()
+    try:
+        repository = TranslationRepository(db)
+        repository.reconcile_rating_aggregates()
+        orders = db.query(TranslationOrder).filter(TranslationOrder.user_id == client_id).all()
+        translator_ids = {order.translator_id for order in orders if order.review is not None}
+        assert translator_ids
+
+        # What UserRepository.delete_user runs before the database cascades the rows away
+        repository.discount_user_reviews(client_id)
+        order_ids = [order.id for order in orders]
+        db.query(TranslationReview).filter(TranslationReview.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(TranslationOrder).filter(TranslationOrder.id.in_(order_ids)).delete(synchronize_session=False)
+        db.commit()
+
+        for translator_id in translator_ids:
+            translator = repository.get_translator(translator_id)
+            assert (translator.review_count, translator.rating_sum, translator.rating_count_5) == (0, 0, 0)
+        assert repository.reconcile_rating_aggregates() == 0
+    finally:
+        db.close()
+
+def test_translator_list_version_tracks_the_page():
+    client_id = seed(2)
+    db = TestSessionLocal()
+    try:
+        repository = TranslationRepository(db)
+        repository.reconcile_rating_aggregates()
+        orders = db.query(TranslationOrder).filter(TranslationOrder.user_id == client_id).order_by(TranslationOrder.id).all()
+
+        def version():
+            statements.clear()
+            result = repository.get_translators_version(0, 100, sort="rating")
+            assert len(statements) == 1 and "alamat" not in statements[0]
+            return result
+
+        before = version()
+        assert before[0] == len(before[1]) == repository.get_translators(0, 100, sort="rating")[1]
+        assert version() == before
+        # A 304 answered from the version query must match the ETag of a loaded page
+        assert TranslationService(repository).get_translators(0, 100, sort="rating")[1] == before
+
+        # Review aggregates move without touching updated_at
+        repository.create_review(orders[1].id, client_id, TranslationReviewCreate(rating=3))
+        assert version() != before
+    finally:
+        db.close()
+
+def test_duplicate_review_is_rejected_without_an_integrity_error():
+    client_id = seed(1)
+    db = TestSessionLocal()
+    try:
+        service = TranslationService(TranslationRepository(db))
+        order = db.query(TranslationOrder).filter(TranslationOrder.user_id == client_id).one()
+        assert order.review is not None  # seed() reviews every other order, starting with the first
+
+        with pytest.raises(HTTPException) as rejected:
+            service.create_review(order.id, TranslationReviewCreate(rating=1), client_id)
+        assert (rejected.value.status_code, rejected.value.detail) == (400, "Review already exists for this order")
+        assert db.query(TranslationReview).filter(TranslationReview.order_id == order.id).count() == 1
+    finally:
+        db.close()
+
+def test_overlapping_booking_is_a_conflict():
+    client_id = seed(0)
+    db = TestSessionLocal()
+    # sqlite has no exclusion constraints; a trigger raising under the constraint's name stands in
+    db.execute(text(f"""
+        CREATE TRIGGER {SLOT_CONFLICT_CONSTRAINT} BEFORE INSERT ON translation_orders
+        WHEN EXISTS (
+            SELECT 1 FROM translation_orders
+            WHERE translator_id = NEW.translator_id AND status IN ('pending', 'confirmed')
+              AND slot_start < NEW.slot_end AND NEW.slot_start < slot_end
+        )
+        BEGIN SELECT RAISE(ABORT, '{SLOT_CONFLICT_CONSTRAINT}'); END
+    """))
+    db.commit()
+    try:
+        repository = TranslationRepository(db)
+        service = TranslationService(repository)
+        translator = repository.create_translator(TranslatorCreate(name="Booked", alamat="Jakarta"), client_id)
+
+        def book(time_slot: str):
+            order = TranslationOrderCreate(tanggal=date(2026, 3, 2), time_slot=time_slot, description="Sidang")
+            return service.create_order(order, translator.id, client_id, "tuli")
+
+        book("08.00 - 10.00")
+        with pytest.raises(HTTPException) as conflict:
+            book("09.00 - 11.00")
+        assert conflict.value.status_code == 409
+        book("10.00 - 11.00")  # adjacent slots do not overlap
+    finally:
+        db.execute(text(f"DROP TRIGGER {SLOT_CONFLICT_CONSTRAINT}"))
+        db.commit()
+        db.close()
+
+def test_order_page_totals_by_count_mode():
+    client_id = seed(5)
+    db = TestSessionLocal()
+    try:
+        service = TranslationService(TranslationRepository(db))
+
+        def page(skip: int, count_mode: str):
+            statements.clear()
+            result = service.get_user_orders(client_id, skip, 2, compact=True, count_mode=count_mode)
+            return result.total, len(result.items), any("OVER" in statement for statement in statements)
+
+        assert page(0, "exact") == (5, 2, True)
+        assert page(4, "exact") == (5, 1, True)
+        assert page(10, "exact") == (5, 0, True)  # past the end falls back to a plain count
+        assert page(0, "cached") == (5, 2, True)
+        assert page(2, "cached") == (5, 2, False)
+        count_cache.invalidate("translation_orders")
+        assert page(2, "cached") == (5, 2, True)
+        # sqlite has no planner estimate, so estimated counts are exact
+        assert page(0, "estimated") == (5, 2, True)
+    finally:
+        db.close()
+
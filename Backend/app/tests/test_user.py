@@ -0,0 +1,161 @@
+import os
+
+os.environ.setdefault("user", "test")
+os.environ.setdefault("password", "test")
+os.environ.setdefault("host", "localhost")
+os.environ.setdefault("port", "5432")
+os.environ.setdefault("dbname", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["PRINCIPAL_CACHE_NOTIFY"] = "false"
+
+import asyncio
+import json
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.api import api_router  # noqa: F401 - registers every model's mapper
+from app.api.v1.endpoints.auth import router as auth_router
+from app.api.v1.endpoints.user import router as user_router
+from app.core.config import settings
+from app.core.exceptions import EventLoopBlockedError
+from app.core.password_hasher import password_hasher
+from app.database import get_db, install_loop_guard, pool_metrics
+from app.models.token_model import ConsumedToken
+from app.models.user_model import User
+
+test_engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+install_loop_guard(test_engine)
+User.__table__.create(test_engine)
+ConsumedToken.__table__.create(test_engine)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+def override_get_db():
+    db = TestSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/api/v1/auth")
+    app.include_router(user_router, prefix="/api/v1/users")
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+def request(app: FastAPI, method: str, path: str, body: dict = None, token: str = None):
+    """Drive one request through the ASGI app and return (status, json body)"""
+    async def run():
+        headers = [(b"content-type", b"application/json")]
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        messages = [{
+            "type": "http.request",
+            "body": json.dumps(body).encode() if body is not None else b"",
+            "more_body": False
+        }]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": headers,
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        await app(scope, receive, send)
+        status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+        content = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+        return status, json.loads(content) if content else None
+    return asyncio.run(run())
+
+@pytest.fixture(autouse=True)
+def raise_on_loop_blocking(monkeypatch):
+    monkeypatch.setattr(settings, "DB_LOOP_GUARD", "raise")
+
+def test_user_and_auth_endpoints_never_query_on_event_loop():
+    app = build_app()
+    blocked_before = pool_metrics.loop_blocking_queries
+
+    status, body = request(app, "POST", "/api/v1/auth/signup", {
+        "email": "loop@example.com",
+        "full_name": "Loop Guard",
+        "birth_date": "2000-01-01",
+        "identity_type": "tuli",
+        "password": "Password123!",
+        "password_confirm": "Password123!"
+    })
+    assert status == 200, body
+
+    status, body = request(app, "POST", "/api/v1/auth/login", {
+        "email": "loop@example.com",
+        "password": "Password123!"
+    })
+    assert status == 200, body
+    token = body["access_token"]
+
+    status, body = request(app, "GET", "/api/v1/users/profile", token=token)
+    assert status == 200, body
+    assert body["email"] == "loop@example.com"
+
+    status, body = request(app, "PUT", "/api/v1/users/profile", {"institution": "Gelatik"}, token=token)
+    assert status == 200, body
+    assert body["institution"] == "Gelatik"
+
+    status, body = request(app, "POST", "/api/v1/users/verify-password", {
+        "current_password": "Password123!"
+    }, token=token)
+    assert status == 200, body
+
+    change = {
+        "verification_token": body["verification_token"],
+        "new_password": "Password456!",
+        "new_password_confirm": "Password456!"
+    }
+    status, body = request(app, "POST", "/api/v1/users/change-password", change, token=token)
+    assert status == 200, body
+
+    # A replayed token is turned away before the new password is hashed
+    hashes_before = password_hasher.completed
+    status, body = request(app, "POST", "/api/v1/users/change-password", change, token=token)
+    assert status == 400, body
+    assert password_hasher.completed == hashes_before
+
+    status, body = request(app, "DELETE", "/api/v1/users/account", {
+        "password": "Password123!",
+        "confirm_text": "DELETE MY ACCOUNT"
+    }, token=token)
+    assert status == 400, body
+    assert body["message"] == "Invalid password"
+
+    assert pool_metrics.loop_blocking_queries == blocked_before
+
+def test_loop_guard_rejects_sync_query_in_async_handler():
+    app = build_app()
+
+    @app.get("/blocking")
+    async def blocking(db: Session = Depends(get_db)):
+        return {"count": db.query(User).count()}
+
+    with pytest.raises(EventLoopBlockedError):
+        request(app, "GET", "/blocking")
@@ -6,7 +6,7 @@ class UserUseCases:
     def __init__(self, user_service: UserService):
         self.user_service = user_service
 
-    def get_user_profile(self, user_id: int) -> UserProfile:
+    def get_user_profile(self, user_id: int) -> dict:
         """
         Get user profile information
         """
@@ -18,8 +18,8 @@ class UserUseCases:
         """
         return self.user_service.update_user_profile(user_id, profile_update)
 
-    def delete_user(self, user_id: int, password: str) -> bool:
+    def delete_user(self, user_id: int) -> bool:
         """
-        Delete user account after verifying password
+        Delete user account (password already verified by the caller)
         """
-        return self.user_service.delete_user(user_id, password)
+        return self.user_service.delete_user(user_id)
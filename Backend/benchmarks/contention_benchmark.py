@@ -0,0 +1,49 @@
+"""
+Hammer the write paths that used to check-then-insert with concurrent requests from
+the same user: like/bookmark toggles on one summary, feedback creation and review
+creation. Run it against a build before and after the single-statement rewrite and
+compare latency and the count of 500 responses (expected: none).
+
+    python benchmarks/contention_benchmark.py --base-url http://localhost:8000 \\
+        --token <jwt> --summary-id 42 [--order-id 7] --label after
+
+Feedback and review creation succeed once per user/order; every other concurrent
+attempt should come back as 400, never 500. Delete the created feedback/review
+between runs to repeat them.
+"""
+import argparse
+from loadgen import request, run
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--summary-id", type=int, required=True, help="a published summary")
+    parser.add_argument("--order-id", type=int, help="a completed, unreviewed order owned by the token's user")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    api = args.base_url + "/api/v1"
+    for action in ("like", "bookmark"):
+        url = f"{api}/summaries/{args.summary_id}/{action}"
+        run(f"{args.label}:toggle_{action}", lambda i: request("POST", url, args.token), args.requests, args.concurrency)
+
+    # Burst of duplicate creates: exactly one success, the rest 400
+    feedback = {"rating": 5, "description": "contention benchmark"}
+    run(
+        f"{args.label}:create_feedback",
+        lambda i: request("POST", f"{api}/feedback/system", args.token, feedback),
+        args.concurrency * 4, args.concurrency
+    )
+    if args.order_id is not None:
+        review = {"rating": 5, "description": "contention benchmark"}
+        run(
+            f"{args.label}:create_review",
+            lambda i: request("POST", f"{api}/translations/orders/{args.order_id}/reviews", args.token, review),
+            args.concurrency * 4, args.concurrency
+        )
+
+if __name__ == "__main__":
+    main()
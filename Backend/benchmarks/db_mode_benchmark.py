@@ -0,0 +1,36 @@
+"""
+Compare sync vs async (asyncpg) database throughput on the summary feed and order list.
+
+Start the API twice against the same database, once per mode, and run this script
+against each instance. The async mode runs the same ORM code through
+AsyncSession.run_sync, so this measures asyncpg+greenlet against psycopg2+threadpool:
+
+    ASYNC_DB_ROUTERS=""                                      uvicorn app.main:app --port 8000
+    ASYNC_DB_ROUTERS="summaries,translations,feedback,users" uvicorn app.main:app --port 8001
+
+    python benchmarks/db_mode_benchmark.py --base-url http://localhost:8000 --token <jwt> --label sync
+    python benchmarks/db_mode_benchmark.py --base-url http://localhost:8001 --token <jwt> --label async
+"""
+import argparse
+from loadgen import request, run
+
+ENDPOINTS = {
+    "summary_feed": "/api/v1/summaries/published",
+    "order_list": "/api/v1/translations/orders/my-orders?limit=50",
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    for name, path in ENDPOINTS.items():
+        url = args.base_url + path
+        run(f"{args.label}:{name}", lambda i: request("GET", url, args.token), args.requests, args.concurrency)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Minimal stdlib HTTP load generator shared by the benchmark scripts.
+
+Runs a fixed number of requests against a live server from a thread pool and
+reports throughput, latency percentiles and status code counts.
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import json
+import time
+import urllib.error
+import urllib.request
+
+def request(method: str, url: str, token: Optional[str] = None, body: Optional[dict] = None) -> int:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def run(name: str, call: Callable[[int], int], requests: int, concurrency: int) -> dict:
+    """Issue `requests` calls of call(i) with `concurrency` workers and print a summary line"""
+    latencies = []
+    statuses = Counter()
+
+    def timed(i: int):
+        start = time.perf_counter()
+        status = call(i)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    result = {
+        "name": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "statuses": dict(statuses),
+    }
+    print(json.dumps(result))
+    return result
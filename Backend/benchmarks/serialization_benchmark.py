@@ -0,0 +1,86 @@
+"""
+Compare the cost of turning a 500-item summary feed page into response bytes:
+
+  response_model: what FastAPI does for a returned list with response_model set
+                  (validate into List[SummaryResponse], serialize, json.dumps)
+  trusted_orjson: app.core.responses.trusted_json (orjson straight from the dicts)
+
+No server or database needed; run from Backend/:
+
+    python benchmarks/serialization_benchmark.py --items 500 --rounds 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.api.v1.schemas.summary_schemas import SummaryResponse
+from app.core.responses import trusted_json
+
+def feed_page(items: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "content": "Ringkasan materi bahasa isyarat " * 40,
+            "title": f"Judul ringkasan {i}",
+            "subtitle": "Subjudul",
+            "topic": "Bahasa Isyarat",
+            "image_url": f"https://example.com/images/{i}.png",
+            "is_published": True,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            "user_id": i % 50,
+            "user_name": f"Pengguna {i % 50}",
+            "like_count": i * 3,
+            "comment_count": i,
+            "bookmark_count": i // 2,
+            "has_liked": i % 2 == 0,
+            "has_bookmarked": i % 3 == 0,
+            "comments": [],
+            "comments_next_cursor": None,
+        }
+        for i in range(items)
+    ]
+
+def timed(name: str, fn, rounds: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        body = fn()
+    per_call_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(json.dumps({"name": name, "ms_per_page": round(per_call_ms, 3), "bytes": len(body)}))
+    return per_call_ms
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    page = feed_page(args.items)
+    field = create_response_field(name="feed", type_=List[SummaryResponse])
+    loop = asyncio.new_event_loop()
+
+    def response_model_path() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=page))
+        return JSONResponse(content).body
+
+    def trusted_path() -> bytes:
+        return trusted_json(page).body
+
+    baseline = timed("response_model", response_model_path, args.rounds)
+    fast = timed("trusted_orjson", trusted_path, args.rounds)
+    print(json.dumps({"speedup": round(baseline / fast, 1)}))
+
+if __name__ == "__main__":
+    main()